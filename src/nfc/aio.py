@@ -0,0 +1,169 @@
+# -*- coding: latin-1 -*-
+# -----------------------------------------------------------------------------
+# Copyright 2009, 2017 Stephen Tiedemann <stephen.tiedemann@gmail.com>
+#
+# Licensed under the EUPL, Version 1.1 or - as soon they
+# will be approved by the European Commission - subsequent
+# versions of the EUPL (the "Licence");
+# You may not use this work except in compliance with the
+# Licence.
+# You may obtain a copy of the Licence at:
+#
+# https://joinup.ec.europa.eu/software/page/eupl
+#
+# Unless required by applicable law or agreed to in
+# writing, software distributed under the Licence is
+# distributed on an "AS IS" basis,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied.
+# See the Licence for the specific language governing
+# permissions and limitations under the Licence.
+# -----------------------------------------------------------------------------
+"""The :mod:`nfc.aio` module provides an :mod:`asyncio` interface to a
+contactless device. All methods of :class:`ContactlessFrontend` are
+coroutines that run the blocking device operations in an executor
+thread dedicated to the device, so that a single event loop can serve
+several devices and other protocols at the same time. Waiting times
+between sense iterations and presence checks are spent in the event
+loop and not in the executor thread. ::
+
+    import asyncio
+    import nfc.aio
+
+    async def main():
+        clf = nfc.aio.ContactlessFrontend()
+        if await clf.open('usb'):
+            tag = await clf.connect(rdwr={'on-connect': lambda tag: False})
+            if tag is not None:
+                print(tag)
+                await clf.wait_for_removal(tag)
+            await clf.close()
+
+    asyncio.run(main())
+
+"""
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import nfc.clf
+
+import logging
+log = logging.getLogger(__name__)
+
+
+class ContactlessFrontend(object):
+    """Asynchronous interface to a contactless device.
+
+    The *clf* argument may be an existing
+    :class:`nfc.clf.ContactlessFrontend` instance, otherwise a new
+    instance is created that must then be opened with :meth:`open`.
+    The device is accessed only from a single executor thread that is
+    created with the :class:`ContactlessFrontend` object and shut down
+    by :meth:`close`.
+
+    """
+    def __init__(self, clf=None):
+        self.clf = clf if clf is not None else nfc.clf.ContactlessFrontend()
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+    def _run(self, func, *args, **kwargs):
+        # Run a blocking function in the device executor thread and
+        # return an awaitable for the result.
+        loop = asyncio.get_running_loop()
+        call = functools.partial(func, *args, **kwargs)
+        return loop.run_in_executor(self.executor, call)
+
+    async def open(self, path):
+        """Open a contactless reader identified by the search
+        *path*. Returns True if a device was found and opened. See
+        :meth:`nfc.clf.ContactlessFrontend.open` for details.
+
+        """
+        return await self._run(self.clf.open, path)
+
+    async def close(self):
+        """Close the contactless reader device and shut down the device
+        executor thread. The object can not be used afterwards.
+
+        """
+        await self._run(self.clf.close)
+        self.executor.shutdown(wait=False)
+
+    async def sense(self, *targets, **options):
+        """Discover a contactless card or listening device. Arguments and
+        return value are the same as for
+        :meth:`nfc.clf.ContactlessFrontend.sense`, but each iteration is
+        a separate executor call and the ``interval`` between
+        iterations is awaited in the event loop. A ``scheduler`` is
+        passed on to each executor call.
+
+        """
+        iterations = max(1, options.get('iterations', 1))
+        interval = options.get('interval', 0.1)
+        sense_options = dict()
+        if 'scheduler' in options:
+            sense_options['scheduler'] = options['scheduler']
+        loop = asyncio.get_running_loop()
+        for i in range(iterations):
+            started = loop.time()
+            target = await self._run(self.clf.sense, *targets,
+                                     **sense_options)
+            if target is not None:
+                return target
+            if i < iterations - 1:
+                elapsed = loop.time() - started
+                await asyncio.sleep(max(0, interval - elapsed))
+
+    async def listen(self, target, timeout):
+        """Wait *timeout* seconds for activation as *target*. See
+        :meth:`nfc.clf.ContactlessFrontend.listen` for details.
+
+        """
+        return await self._run(self.clf.listen, target, timeout)
+
+    async def exchange(self, send_data, timeout):
+        """Exchange data with an activated target or as an activated
+        target. See :meth:`nfc.clf.ContactlessFrontend.exchange` for
+        details.
+
+        """
+        return await self._run(self.clf.exchange, send_data, timeout)
+
+    async def connect(self, **options):
+        """Connect with a Target or Initiator. The *options* and the
+        return value are the same as for
+        :meth:`nfc.clf.ContactlessFrontend.connect`. The callback
+        functions given with the options are called from the device
+        executor thread, not from the event loop.
+
+        If the awaiting task is cancelled, the 'terminate' function
+        passed to the blocking connect method returns True and the
+        cancellation takes effect after the current sense iterations
+        or presence check have completed.
+
+        """
+        cancelled = threading.Event()
+        terminate = options.get('terminate', lambda: False)
+        options['terminate'] = lambda: cancelled.is_set() or terminate()
+        future = self._run(self.clf.connect, **options)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def wait_for_removal(self, tag, interval=0.1):
+        """Wait until the *tag* is no longer present. A presence check is
+        run in the device executor every *interval* seconds.
+
+        """
+        while await self._run(lambda: tag.is_present):
+            await asyncio.sleep(interval)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
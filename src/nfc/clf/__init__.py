@@ -22,6 +22,7 @@
 import errno
 import logging
 import os
+import queue
 import re
 import threading
 import time
@@ -79,6 +80,7 @@ class ContactlessFrontend(object):
     def __init__(self, path=None):
         self.device = None
         self.target = None
+        self.removal_latency = None
         self.lock = threading.Lock()
         if path and not self.open(path):
             raise IOError(errno.ENODEV, os.strerror(errno.ENODEV))
@@ -237,7 +239,22 @@ class ContactlessFrontend(object):
            determined that communication with the *tag* has become
            impossible, or when the 'terminate' function returned a
            true value. The *tag* object may be used for cleanup
-           actions but not for communication.
+           actions but not for communication. If the tag was found
+           removed, the :attr:`removal_latency` attribute holds the
+           number of seconds since the last presence check that found
+           the tag, an upper bound for the time the removal went
+           unnoticed. Otherwise it is :const:`None`.
+
+        'presence-interval' : float or tuple
+           This determines the waiting time between presence checks
+           after the 'on-connect' function returned a true value. The
+           default value is 0.1 seconds. If a tuple of a minimum and
+           maximum interval is given, the first presence check runs
+           after the minimum interval and the interval doubles after
+           each check until the maximum is reached. This allows a
+           short detection time for quick taps without running
+           presence checks at a high rate when a tag is left on the
+           reader.
 
         'iterations' : integer
            This determines the number of sense cycles performed
@@ -262,6 +279,13 @@ class ContactlessFrontend(object):
             successfully detected AND the 'on-connect' function
             returns a true value. Defaults to True.
 
+        'scheduler': SenseScheduler
+           An optional :class:`SenseScheduler` instance that orders
+           and filters the 'targets' by their recent hit statistics.
+           The scheduler is notified when a tag was found removed to
+           start its fast re-sense mode. The default is :const:`None`
+           and all targets are searched in the given order.
+
         .. sourcecode:: python
 
            import nfc
@@ -550,6 +574,8 @@ class ContactlessFrontend(object):
             rdwr_options.setdefault('iterations', 5)
             rdwr_options.setdefault('interval', 0.5)
             rdwr_options.setdefault('beep-on-connect', True)
+            rdwr_options.setdefault('presence-interval', 0.1)
+            rdwr_options.setdefault('scheduler', None)
 
             targets = [RemoteTarget(brty) for brty in rdwr_options['targets']]
             targets = rdwr_options['on-startup'](targets)
@@ -610,7 +636,8 @@ class ContactlessFrontend(object):
     def _rdwr_connect(self, options, terminate):
         target = self.sense(*options['targets'],
                             iterations=options['iterations'],
-                            interval=options['interval'])
+                            interval=options['interval'],
+                            scheduler=options['scheduler'])
         if target is not None:
             log.debug("discovered target {0}".format(target))
             if options['on-discover'](target):
@@ -620,13 +647,34 @@ class ContactlessFrontend(object):
                     if options['on-connect'](tag):
                         if options['beep-on-connect']:
                             self.device.turn_on_led_and_buzzer()
-                        while not terminate() and tag.is_present:
-                            time.sleep(0.1)
+                        self._rdwr_wait_for_removal(options, terminate, tag)
+                        if (options['scheduler'] is not None
+                                and self.removal_latency is not None):
+                            options['scheduler'].removed()
                         self.device.turn_off_led_and_buzzer()
                         return options['on-release'](tag)
                     else:
                         return tag
 
+    def _rdwr_wait_for_removal(self, options, terminate, tag):
+        interval = options['presence-interval']
+        if isinstance(interval, (tuple, list)):
+            interval, max_interval = interval
+        else:
+            max_interval = interval
+
+        self.removal_latency = None
+        present_time = time.time()
+        while not terminate():
+            if not tag.is_present:
+                self.removal_latency = time.time() - present_time
+                log.debug("tag removal detected within {0:.3f} sec"
+                          .format(self.removal_latency))
+                break
+            present_time = time.time()
+            time.sleep(interval)
+            interval = min(2 * interval, max_interval)
+
     def _llcp_connect(self, options, terminate):
         llc = options['llc']
         for role in ('target', 'initiator'):
@@ -681,8 +729,10 @@ class ContactlessFrontend(object):
         to discover and must be of type :class:`RemoteTarget`. Keyword
         argument *options* may be the number of ``iterations`` of the
         sense loop set by *targets* and the ``interval`` between
-        iterations. The return value is either a :class:`RemoteTarget`
-        instance or :const:`None`.
+        iterations, and a :class:`SenseScheduler` as ``scheduler`` to
+        order the *targets* by their recent hit statistics. The return
+        value is either a :class:`RemoteTarget` instance or
+        :const:`None`.
 
         >>> import nfc, nfc.clf
         >>> clf = nfc.ContactlessFrontend("usb")
@@ -801,28 +851,7 @@ class ContactlessFrontend(object):
             if target is None:
                 return None
             log.debug("found %s", target)
-            if len(target.sens_res) != 2:
-                error = "SENS Response Format Error (wrong length)"
-                log.debug(error)
-                raise ProtocolError(error)
-            if target.sens_res[0] & 0b00011111 == 0:
-                if target.sens_res[1] & 0b00001111 != 0b1100:
-                    error = "SENS Response Data Error (T1T config)"
-                    log.debug(error)
-                    raise ProtocolError(error)
-                if not target.rid_res:
-                    error = "RID Response Error (no response received)"
-                    log.debug(error)
-                    raise ProtocolError(error)
-                if len(target.rid_res) != 6:
-                    error = "RID Response Format Error (wrong length)"
-                    log.debug(error)
-                    raise ProtocolError(error)
-                if target.rid_res[0] >> 4 != 0b0001:
-                    error = "RID Response Data Error (invalid HR0)"
-                    log.debug(error)
-                    raise ProtocolError(error)
-            return target
+            return self._check_tta_target(target)
 
         def sense_ttb(target):
             return self.device.sense_ttb(target)
@@ -848,9 +877,14 @@ class ContactlessFrontend(object):
             self.target = None  # forget captured target
             self.device.mute()  # deactivate the rf field
 
+            scheduler = options.get('scheduler')
             for i in range(max(1, options.get('iterations', 1))):
                 started = time.time()
-                for target in targets:
+                if scheduler is not None:
+                    scheduled = scheduler.schedule(targets)
+                else:
+                    scheduled = targets
+                for target in scheduled:
                     log.log(logging.DEBUG-1, "sense {0}".format(target))
                     try:
                         if target.atr_req is not None:
@@ -871,15 +905,125 @@ class ContactlessFrontend(object):
                             log.debug(error)
                     except CommunicationError as error:
                         log.debug(error)
+                        if scheduler is not None:
+                            scheduler.update(target, False)
                     else:
+                        if scheduler is not None:
+                            scheduler.update(target, self.target)
                         if self.target is not None:
                             log.debug("found {0}".format(self.target))
                             return self.target
                 if len(targets) > 0:
                     self.device.mute()  # deactivate the rf field
+                if i < options.get('iterations', 1) - 1:
+                    interval = options.get('interval', 0.1)
+                    if scheduler is not None:
+                        interval = scheduler.interval(interval)
+                    elapsed = time.time() - started
+                    time.sleep(max(0, interval - elapsed))
+
+    def _check_tta_target(self, target):
+        if len(target.sens_res) != 2:
+            error = "SENS Response Format Error (wrong length)"
+            log.debug(error)
+            raise ProtocolError(error)
+        if target.sens_res[0] & 0b00011111 == 0:
+            if target.sens_res[1] & 0b00001111 != 0b1100:
+                error = "SENS Response Data Error (T1T config)"
+                log.debug(error)
+                raise ProtocolError(error)
+            if not target.rid_res:
+                error = "RID Response Error (no response received)"
+                log.debug(error)
+                raise ProtocolError(error)
+            if len(target.rid_res) != 6:
+                error = "RID Response Format Error (wrong length)"
+                log.debug(error)
+                raise ProtocolError(error)
+            if target.rid_res[0] >> 4 != 0b0001:
+                error = "RID Response Data Error (invalid HR0)"
+                log.debug(error)
+                raise ProtocolError(error)
+        return target
+
+    def sense_all(self, target, **options):
+        """Discover all contactless cards of the *target* technology.
+
+        This works like :meth:`sense` for a single *target* but
+        returns a list of all the targets found in the first sense
+        iteration that found any, or an empty list. For a Type A
+        *target* all cards in the field are activated in a single
+        discovery cycle if the local device supports it (currently
+        PN531, PN532, and ACR122 with up to two cards), otherwise at
+        most one target is returned. The first target in the list is
+        the current target for data exchange, :meth:`select` switches
+        to another one.
+
+        >>> import nfc, nfc.clf, nfc.tag
+        >>> clf = nfc.ContactlessFrontend("tty:USB0:pn532")
+        >>> targets = clf.sense_all(nfc.clf.RemoteTarget("106A"))
+        >>> tags = []
+        >>> for target in targets:
+        ...     clf.select(target)
+        ...     tags.append(nfc.tag.activate(clf, target))
+        >>> for tag in tags:
+        ...     tag.select()
+        ...     print(tag.ndef.records if tag.ndef else None)
+
+        """
+        if not isinstance(target, RemoteTarget):
+            raise ValueError("invalid target argument type: %r" % target)
+
+        if target.atr_req is not None or not target.brty.endswith('A'):
+            target = self.sense(target, **options)
+            return [target] if target is not None else []
+
+        if target.sel_req and len(target.sel_req) not in (4, 7, 10):
+            raise ValueError("sel_req must be 4, 7, or 10 byte")
+
+        with self.lock:
+            if self.device is None:
+                raise IOError(errno.ENODEV, os.strerror(errno.ENODEV))
+
+            self.target = None  # forget captured target
+            self.device.mute()  # deactivate the rf field
+
+            for i in range(max(1, options.get('iterations', 1))):
+                started = time.time()
+                found = []
+                try:
+                    for res in self.device.sense_tta_all(target):
+                        log.debug("found %s", res)
+                        try:
+                            found.append(self._check_tta_target(res))
+                        except ProtocolError:
+                            pass
+                except CommunicationError as error:
+                    log.debug(error)
+                if found:
+                    if len(found) > 1:
+                        self.device.select_target(found[0])
+                    self.target = found[0]
+                    return found
+                self.device.mute()  # deactivate the rf field
                 if i < options.get('iterations', 1) - 1:
                     elapsed = time.time() - started
                     time.sleep(max(0, options.get('interval', 0.1)-elapsed))
+            return []
+
+    def select(self, target):
+        """Make *target* the current target for data exchange. The
+        *target* must be one of the targets returned by the last
+        :meth:`sense_all`. A :exc:`CommunicationError` is raised if
+        the target could not be selected.
+
+        """
+        with self.lock:
+            if self.device is None:
+                raise IOError(errno.ENODEV, os.strerror(errno.ENODEV))
+            if target is not self.target:
+                self.device.select_target(target)
+                self.target = target
 
     def listen(self, target, timeout):
         """Listen *timeout* seconds to become activated as *target*.
@@ -1103,6 +1247,246 @@ class ContactlessFrontend(object):
             return self.__repr__()
 
 
+class FrontendPool(object):
+    """Drive all contactless devices that match a search *path* from a
+    single process. Each device is opened with its own
+    :class:`ContactlessFrontend` and served by a separate thread that
+    runs :meth:`ContactlessFrontend.connect`, so that a slow or failing
+    device does not stall the others.
+
+    The pool searches for devices on *path* when :meth:`start` is
+    called and then every *rescan_interval* seconds. New devices,
+    including a device that was unplugged and has come back, are
+    opened automatically. When communication with a device fails, for
+    example with :exc:`~exceptions.IOError` :data:`errno.ENODEV`
+    because it was unplugged, the device is closed and its thread
+    ends until the device is found again.
+
+    Activated tags are delivered together with the path of the device
+    that found them. If the *on_connect* function is given, it is
+    called as ``on_connect(path, tag)`` from the device thread and
+    its return value has the same meaning as for the reader/writer
+    'on-connect' option of :meth:`ContactlessFrontend.connect`.
+    Otherwise a ``(path, tag)`` tuple is put into the :attr:`events`
+    queue and the device thread waits until the tag is removed.
+
+    >>> import nfc.clf
+    >>> pool = nfc.clf.FrontendPool('usb')
+    >>> pool.start(rdwr={'targets': ['106A']})
+    >>> path, tag = pool.events.get()
+    >>> print(path, tag)
+    usb:001:011 Type2Tag 'NXP NTAG215' ID=04E1B66AC85780
+    >>> pool.stop()
+
+    """
+    def __init__(self, path, on_connect=None, rescan_interval=1.0):
+        self.path = path
+        self.on_connect = on_connect
+        self.rescan_interval = rescan_interval
+        self.events = queue.Queue()
+        self.lock = threading.Lock()
+        self._options = dict()
+        self._workers = dict()
+        self._monitor = None
+        self._terminate = threading.Event()
+
+    @property
+    def paths(self):
+        """The sorted list of device paths currently served."""
+        with self.lock:
+            return sorted(self._workers)
+
+    def start(self, **options):
+        """Start serving all devices found on the search path.
+
+        The *options* are the same keyword arguments as for
+        :meth:`ContactlessFrontend.connect`, except 'terminate' which
+        is provided by the pool. If reader/writer options are given
+        without an 'on-connect' function, tags are delivered as
+        described for the :class:`FrontendPool`.
+
+        """
+        if self._monitor is not None:
+            raise RuntimeError("the frontend pool is already started")
+
+        options.pop('terminate', None)
+        self._options = options
+        self._terminate.clear()
+        self._monitor = threading.Thread(
+            target=self._monitor_loop, name="FrontendPool monitor")
+        self._monitor.daemon = True
+        self._monitor.start()
+
+    def stop(self):
+        """Stop serving devices and wait until all devices are closed.
+        Note that a device thread only returns after the current sense
+        iterations have completed and a tag has been released.
+
+        """
+        self._terminate.set()
+        if self._monitor is not None:
+            self._monitor.join()
+            self._monitor = None
+        with self.lock:
+            workers = list(self._workers.values())
+        for worker in workers:
+            worker.join()
+
+    def scan(self):
+        """Search devices on the search path and start serving those that
+        are not yet served. This is called periodically while the pool
+        is started, but may also be called from a hot-plug notification
+        to serve a new device without delay.
+
+        """
+        try:
+            paths = device.search(self.path)
+        except IOError as error:
+            log.debug("search on {0} failed: {1}".format(self.path, error))
+            return
+
+        for path in paths:
+            with self.lock:
+                if path in self._workers or self._terminate.is_set():
+                    continue
+                worker = threading.Thread(target=self._device_loop,
+                                          args=(path,), name=path)
+                worker.daemon = True
+                self._workers[path] = worker
+            worker.start()
+
+    def _monitor_loop(self):
+        while not self._terminate.is_set():
+            self.scan()
+            self._terminate.wait(self.rescan_interval)
+
+    def _device_loop(self, path):
+        def on_connect(tag):
+            if self.on_connect is not None:
+                return self.on_connect(path, tag)
+            self.events.put((path, tag))
+            return True
+
+        try:
+            clf = ContactlessFrontend(path)
+        except IOError as error:
+            log.debug("can not open {0}: {1}".format(path, error))
+        else:
+            log.info("serving {0}".format(clf))
+            options = dict(self._options)
+            if options.get('rdwr') is not None:
+                options['rdwr'] = dict(options['rdwr'])
+                options['rdwr'].setdefault('on-connect', on_connect)
+            terminate = self._terminate.is_set
+            with clf:
+                while not terminate():
+                    # The connect method returns False after an
+                    # IOError and None if all options were removed.
+                    if not clf.connect(terminate=terminate, **options):
+                        break
+            log.info("stopped serving {0}".format(path))
+        finally:
+            with self.lock:
+                del self._workers[path]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+class SenseScheduler(object):
+    """Adaptive ordering of the targets searched by
+    :meth:`ContactlessFrontend.sense`. A scheduler is given to
+    :meth:`~ContactlessFrontend.sense` with the ``scheduler`` keyword
+    argument, or to :meth:`~ContactlessFrontend.connect` with the
+    reader/writer 'scheduler' option, and then keeps statistics for
+    each technology across sense iterations and calls.
+
+    In each sense iteration the targets are searched in the order of
+    their recent hit rate. The hit rate is an exponential moving
+    average over roughly the last *history* polls, so a technology
+    that found targets recently moves ahead of one that found them
+    long ago. With equal hit rates the targets are searched in the
+    given order.
+
+    If *skip_after* is set, a technology that has been polled that
+    many times without ever finding a target is skipped as long as
+    any other technology did find a target, except for every
+    *skip_after*'th sense iteration where it is polled once more. This
+    avoids spending most of the poll cycle on technologies that are
+    not used in a deployment while still finding them eventually.
+
+    After :meth:`removed` was called, for example when the
+    :meth:`~ContactlessFrontend.connect` method found a tag removed,
+    the next *fast_iterations* sense iterations wait at most
+    *fast_interval* seconds, so that a tag presented again right
+    away is found quickly.
+
+    >>> import nfc, nfc.clf
+    >>> scheduler = nfc.clf.SenseScheduler(skip_after=20)
+    >>> clf = nfc.ContactlessFrontend('usb')
+    >>> tag = clf.connect(rdwr={'scheduler': scheduler})
+    >>> print(scheduler.statistics['106A'])
+    {'polls': 12, 'hits': 1, 'hit-rate': 0.1}
+
+    """
+    def __init__(self, history=10, skip_after=None,
+                 fast_iterations=0, fast_interval=0.05):
+        self.history = history
+        self.skip_after = skip_after
+        self.fast_iterations = fast_iterations
+        self.fast_interval = fast_interval
+        self.statistics = dict()
+        self._cycle = 0
+        self._fast = 0
+
+    def _stats(self, target):
+        return self.statistics.setdefault(target.brty, {
+            'polls': 0, 'hits': 0, 'hit-rate': 0.0})
+
+    def schedule(self, targets):
+        """Return the list of *targets* to search in the next sense
+        iteration, ordered by recent hit rate.
+
+        """
+        self._cycle += 1
+        stats = [self._stats(target) for target in targets]
+        skip = (bool(self.skip_after) and any(s['hits'] for s in stats)
+                and self._cycle % self.skip_after != 0)
+        scheduled = [target for target, s in zip(targets, stats)
+                     if not (skip and s['hits'] == 0
+                             and s['polls'] >= self.skip_after)]
+        return sorted(scheduled, key=lambda t: -self._stats(t)['hit-rate'])
+
+    def update(self, target, found):
+        """Count a poll of *target* and whether a target was *found*."""
+        stats = self._stats(target)
+        stats['polls'] += 1
+        stats['hits'] += int(bool(found))
+        stats['hit-rate'] += (int(bool(found)) - stats['hit-rate']) \
+            / self.history
+
+    def removed(self):
+        """Signal that a tag was removed from the reader. This starts the
+        fast re-sense mode for the next *fast_iterations* sense
+        iterations.
+
+        """
+        self._fast = self.fast_iterations
+
+    def interval(self, interval):
+        """Return the waiting time to use instead of *interval* before the
+        next sense iteration.
+
+        """
+        if self._fast > 0:
+            self._fast -= 1
+            return min(interval, self.fast_interval)
+        return interval
+
+
 ###############################################################################
 #
 # Targets
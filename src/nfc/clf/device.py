@@ -32,6 +32,7 @@ without notice at any time.
 from . import transport
 
 import os
+import re
 import sys
 import errno
 import importlib
@@ -53,6 +54,55 @@ usb_device_map = {
 
 tty_driver_list = ["arygon", "pn532"]
 
+# If set to True, connect() remembers the driver and the transport
+# address of the device found for a path and tries them first when
+# the same path is opened again.
+use_discovery_cache = False
+discovery_cache = dict()
+
+
+def invalidate_discovery_cache(path=None):
+    """Remove the cached discovery result for *path*, or all results if
+    *path* is None. This should be called when devices are plugged or
+    unplugged, for example from a udev monitor, so that the next
+    :func:`connect` enumerates devices again.
+
+    """
+    if path is None:
+        discovery_cache.clear()
+    else:
+        discovery_cache.pop(path, None)
+
+
+def _connect_cached(path):
+    # Open the device that was last found for *path* without device
+    # enumeration and driver probing. Return None if there is no
+    # cached result or the device could not be opened, in which case
+    # the cache entry is removed.
+    try:
+        transport_type, module, address = discovery_cache[path]
+    except KeyError:
+        return None
+
+    log.debug("try cached {0} driver for {1}".format(module, path))
+    driver = importlib.import_module("nfc.clf." + module)
+    try:
+        if transport_type == "USB":
+            device = driver.init(transport.USB(*address))
+            device._path = "usb:{0:03}:{1:03}".format(*address)
+        else:
+            tty = transport.TTY(address)
+            try:
+                device = driver.init(tty)
+            except IOError:
+                tty.close()
+                raise
+            device._path = address
+        return device
+    except IOError as error:
+        log.debug(error)
+        invalidate_discovery_cache(path)
+
 
 def connect(path):
     """Connect to a local device identified by *path* and load the
@@ -60,11 +110,18 @@ def connect(path):
     :meth:`nfc.clf.ContactlessFrontend.open`. The return value is
     either a :class:`Device` instance or :const:`None`. Note that not
     all drivers can be autodetected, specifically for serial devices
-    *path* must usually also specify the driver.
+    *path* must usually also specify the driver. If
+    :data:`use_discovery_cache` is True, the device that was last found
+    for *path* is opened first without enumeration.
 
     """
     assert isinstance(path, str) and len(path) > 0
 
+    if use_discovery_cache:
+        device = _connect_cached(path)
+        if device is not None:
+            return device
+
     found = transport.USB.find(path)
     if found is not None:
         for vid, pid, bus, dev in found:
@@ -95,6 +152,9 @@ def connect(path):
                     raise error
 
             device._path = "usb:{0:03}:{1:03}".format(int(bus), int(dev))
+            if use_discovery_cache:
+                address = (int(bus), int(dev))
+                discovery_cache[path] = ("USB", module, address)
             return device
 
     found = transport.TTY.find(path)
@@ -110,6 +170,8 @@ def connect(path):
                     tty = transport.TTY(dev)
                     device = driver.init(tty)
                     device._path = dev
+                    if use_discovery_cache:
+                        discovery_cache[path] = ("TTY", drv, dev)
                     return device
                 except IOError as error:
                     log.debug(error)
@@ -127,6 +189,38 @@ def connect(path):
         return device
 
 
+def search(path):
+    """Search all local devices that match *path* and return a list of
+    fully qualified paths, each of which identifies exactly one device
+    when given to :func:`connect`. The *path* argument is documented
+    at :meth:`nfc.clf.ContactlessFrontend.open`. Devices are not
+    opened, thus a path returned may still fail to connect if, for
+    example, a serial port is not attached to a supported device.
+
+    """
+    assert isinstance(path, str) and len(path) > 0
+
+    found = transport.USB.find(path)
+    if found is not None:
+        return ["usb:{0:03}:{1:03}".format(int(bus), int(dev))
+                for vid, pid, bus, dev in found
+                if (vid, pid) in usb_device_map]
+
+    found = transport.TTY.find(path)
+    if found is not None:
+        devices, driver = found[0], (":" + found[1] if found[1] else "")
+        if path.startswith("com"):
+            return ["com:" + dev + driver for dev in devices]
+        return ["tty:" + re.sub(r'^/dev/(tty(?=(S|ACM|AMA|USB)\d+$)|'
+                                r'cu\.(?=usbserial))?', '', dev) + driver
+                for dev in devices]
+
+    if path.startswith("udp"):
+        return [path]
+
+    return []
+
+
 class Device(object):
     """All device drivers inherit from the :class:`Device` class and must
     implement it's methods.
@@ -214,6 +308,41 @@ class Device(object):
         cname = self.__class__.__module__ + '.' + self.__class__.__name__
         raise NotImplementedError("%s.%s() is required" % (cname, fname))
 
+    def sense_tta_all(self, target):
+        """Discover all Type A Targets in the field.
+
+        Works like :meth:`sense_tta` but returns all targets that
+        were found and activated in one discovery cycle. Drivers for
+        devices that can keep more than one target activated return
+        targets that may be made the current target for data exchange
+        with :meth:`select_target`. The default implementation returns
+        the result of :meth:`sense_tta` as a list of at most one
+        target.
+
+        Arguments:
+
+          target (nfc.clf.RemoteTarget): Supplies bitrate and optional
+            command data for the target discovery.
+
+        Returns:
+
+          list: The :class:`nfc.clf.RemoteTarget` objects found, an
+            empty list if no target was found.
+
+        """
+        target = self.sense_tta(target)
+        return [target] if target else []
+
+    def select_target(self, target):
+        """Make *target* the current target for data exchange.
+
+        The *target* must be one of the targets returned by the last
+        :meth:`sense_tta_all`. The default implementation does nothing
+        because only a single target is activated by :meth:`sense_tta`.
+
+        """
+        pass
+
     def sense_ttb(self, target):
         """Discover a Type B Target.
 
@@ -648,11 +777,25 @@ class Device(object):
         return (data[-2], data[-1]) == (crc & 0xff, crc >> 8)
 
 
+def _make_crc_table():
+    # Precompute the CRC register update for each possible value of
+    # the low register byte xor'ed with the next data byte. This is
+    # the CRC-16/CCITT polynomial in its reflected form (0x8408) as
+    # used for ISO/IEC 14443 CRC_A and CRC_B.
+    table = []
+    for index in range(256):
+        reg = index
+        for pos in range(8):
+            reg = (reg >> 1) ^ 0x8408 if reg & 1 else reg >> 1
+        table.append(reg)
+    return tuple(table)
+
+
+crc_table = _make_crc_table()
+
+
 def calculate_crc(data, size, reg):
+    table = crc_table
     for octet in data[:size]:
-        for pos in range(8):
-            bit = (reg ^ ((octet >> pos) & 1)) & 1
-            reg = reg >> 1
-            if bit:
-                reg = reg ^ 0x8408
+        reg = (reg >> 8) ^ table[(reg ^ octet) & 0xFF]
     return reg
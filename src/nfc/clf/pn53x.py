@@ -34,8 +34,9 @@ import six
 import os
 import time
 import errno
+from math import ceil
 from binascii import hexlify
-from struct import pack, unpack
+from struct import pack, unpack_from
 
 import logging
 log = logging.getLogger(__name__)
@@ -125,9 +126,34 @@ class Chipset(object):
         strerr = self.ERR.get(errno, "Unknown error code")
         raise Chipset.Error(errno, strerr)
 
+    # Upper bounds, in milliseconds, of the buckets that command
+    # latencies are counted in. Latencies above the last bound are
+    # counted in an additional overflow bucket.
+    LATENCY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+    # Milliseconds to wait for the command acknowledgement.
+    ACK_TIMEOUT = 100
+
     def __init__(self, transport, logger):
         self.transport = transport
         self.log = logger
+        self.latency = dict()
+
+    def _count_latency(self, cmd_code, latency):
+        # Count the *latency* seconds of a *cmd_code* command in the
+        # latency histogram for that command.
+        name = self.CMD.get(cmd_code, "0x{0:02X}".format(cmd_code))
+        histogram = self.latency.get(name)
+        if histogram is None:
+            histogram = [0] * (len(self.LATENCY_BUCKETS) + 1)
+            self.latency[name] = histogram
+        latency = latency * 1000
+        for index, bound in enumerate(self.LATENCY_BUCKETS):
+            if latency <= bound:
+                break
+        else:
+            index = len(self.LATENCY_BUCKETS)
+        histogram[index] += 1
 
     def close(self):
         self.transport.close()
@@ -141,12 +167,16 @@ class Chipset(object):
         is sent with :meth:`write_frame` and the chip acknowledgement
         and response is received with :meth:`read_frame`, those
         methods are used by some drivers for additional framing. The
-        implementation waits 100 ms for the command acknowledgement
-        and then polls every 100 ms for a response frame until
-        *timeout* seconds have elapsed. If the response frame is
-        correct and the response code matches *cmd_code* the data
-        bytes that follow the response code are returned as a
-        bytearray (without the trailing checksum and postamble).
+        implementation waits :attr:`ACK_TIMEOUT` milliseconds for the
+        command acknowledgement and then for a response frame until
+        *timeout* seconds after the acknowledgement have elapsed. If
+        the response frame is correct and the response code matches
+        *cmd_code* the data bytes that follow the response code are
+        returned as a bytearray (without the trailing checksum and
+        postamble). The time from command to response is counted in
+        the :attr:`latency` histogram of the command name, a list of
+        counts for the :attr:`LATENCY_BUCKETS` upper bounds in
+        milliseconds followed by the count of slower responses.
 
         **Exceptions**
 
@@ -165,18 +195,30 @@ class Chipset(object):
             self.log.log(logging.DEBUG-1, "%s %s %.3fs", self.CMD[cmd_code],
                          hexlify(cmd_data), timeout)
 
-            if len(cmd_data) < 254:
-                head = self.SOF + chr(len(cmd_data)+2) + chr(254-len(cmd_data))
+            # The command frame is assembled in a single buffer, the
+            # frame data checksum is computed over a memoryview and the
+            # zero postamble byte is already set by allocation.
+            size = len(cmd_data) + 2
+            if size < 256:
+                frame = bytearray(size + 7)
+                frame[3:5] = (size, (256 - size) & 0xFF)
+                offset = 5
             else:
-                head = self.SOF + b'\xFF\xFF' + pack(">H", len(cmd_data)+2)
-                head.append((256 - sum(head[-2:])) & 0xFF)
-
-            data = bytearray([0xD4, cmd_code]) + cmd_data
-            tail = bytearray([(256 - sum(data)) & 0xFF, 0])
-
+                frame = bytearray(size + 10)
+                frame[3:8] = (0xFF, 0xFF, size >> 8, size & 0xFF,
+                              (256 - (size >> 8) - (size & 0xFF)) & 0xFF)
+                offset = 8
+            frame[0:3] = self.SOF
+            frame[offset:offset+2] = (0xD4, cmd_code)
+            frame[offset+2:offset+size] = cmd_data
+            data = memoryview(frame)[offset:offset+size]
+            frame[offset+size] = (256 - sum(data)) & 0xFF
+            data.release()
+
+            started = time.time()
             try:
-                self.write_frame(head + data + tail)
-                frame = self.read_frame(timeout=100)
+                self.write_frame(frame)
+                frame = self.read_frame(timeout=self.ACK_TIMEOUT)
             except IOError as error:
                 self.log.error("input/output error while waiting for ack")
                 raise IOError(errno.EIO, os.strerror(errno.EIO))
@@ -188,58 +230,75 @@ class Chipset(object):
             if frame[0:len(self.ACK)] != self.ACK:
                 self.log.warning("missing ack frame")
         else:
+            started = time.time()
             frame = self.ACK
 
         if timeout is not None and timeout <= 0:
             return
 
+        # The response must arrive within timeout seconds after the
+        # acknowledgement, further ACK frames do not extend the
+        # deadline. The read timeout is rounded up to full milliseconds
+        # because zero would mean to wait forever.
+        deadline = time.time() + timeout
         while frame == self.ACK:
             try:
-                frame = self.read_frame(int(1000 * timeout))
+                remaining = deadline - time.time()
+                frame = self.read_frame(max(int(ceil(1000 * remaining)), 1))
             except IOError as error:
                 if error.errno == errno.ETIMEDOUT:
                     self.write_frame(self.ACK)  # cancel command
                     time.sleep(0.001)
                 raise error
 
-        if frame.startswith(self.SOF + b'\xFF\xFF'):
-            # extended frame
-            if sum(frame[5:8]) & 0xFF != 0:
-                self.log.error("frame lenght checksum error")
-                raise IOError(errno.EIO, os.strerror(errno.EIO))
-            if unpack(">H", buffer(frame[5:7]))[0] != len(frame) - 10:
-                self.log.error("frame lenght value mismatch")
-                raise IOError(errno.EIO, os.strerror(errno.EIO))
-            del frame[0:8]
-        elif frame.startswith(self.SOF):
-            # normal frame
-            if sum(frame[3:5]) & 0xFF != 0:
-                self.log.error("frame lenght checksum error")
-                raise IOError(errno.EIO, os.strerror(errno.EIO))
-            if frame[3] != len(frame) - 7:
-                self.log.error("frame lenght value mismatch")
-                raise IOError(errno.EIO, os.strerror(errno.EIO))
-            del frame[0:5]
-        else:
+        if not frame.startswith(self.SOF):
             self.log.debug("invalid frame start sequence")
             raise IOError(errno.EIO, os.strerror(errno.EIO))
 
-        if not sum(frame) & 0xFF == 0:
-            self.log.error("frame data checksum error")
-            raise IOError(errno.EIO, os.strerror(errno.EIO))
+        view = memoryview(frame)
+        try:
+            if frame[3:5] == b'\xFF\xFF':
+                # extended frame
+                if sum(view[5:8]) & 0xFF != 0:
+                    self.log.error("frame lenght checksum error")
+                    raise IOError(errno.EIO, os.strerror(errno.EIO))
+                if unpack_from(">H", frame, 5)[0] != len(frame) - 10:
+                    self.log.error("frame lenght value mismatch")
+                    raise IOError(errno.EIO, os.strerror(errno.EIO))
+                offset = 8
+            else:
+                # normal frame
+                if sum(view[3:5]) & 0xFF != 0:
+                    self.log.error("frame lenght checksum error")
+                    raise IOError(errno.EIO, os.strerror(errno.EIO))
+                if frame[3] != len(frame) - 7:
+                    self.log.error("frame lenght value mismatch")
+                    raise IOError(errno.EIO, os.strerror(errno.EIO))
+                offset = 5
+
+            if not sum(view[offset:]) & 0xFF == 0:
+                self.log.error("frame data checksum error")
+                raise IOError(errno.EIO, os.strerror(errno.EIO))
+        finally:
+            view.release()
 
-        if frame[0] == 0x7F:  # error frame
+        if frame[offset] == 0x7F:  # error frame
             self.chipset_error(0x7F)
 
-        if not frame[0] == 0xD5:
+        if not frame[offset] == 0xD5:
             self.log.error("invalid frame identifier")
             raise IOError(errno.EIO, os.strerror(errno.EIO))
 
-        if not frame[1] == cmd_code + 1:
+        if not frame[offset+1] == cmd_code + 1:
             self.log.error("unexpected response code")
             raise IOError(errno.EIO, os.strerror(errno.EIO))
 
-        return frame[2:-2]
+        self._count_latency(cmd_code, time.time() - started)
+
+        # Strip header, checksum and postamble in place.
+        del frame[-2:]
+        del frame[:offset+2]
+        return frame
 
     def write_frame(self, frame):
         """Write a command *frame* to the chipset."""
@@ -401,10 +460,16 @@ class Chipset(object):
         """UM0701-02 (PN532 User Manual), s7.3.5"""
         assert max_tg <= self.in_list_passive_target_max_target
         assert brty in self.in_list_passive_target_brty_range
-        data = bytes([1, brty]) + initiator_data
+        data = bytes([max_tg, brty]) + initiator_data
         data = self.command(0x4A, data, timeout=1.0)
         return data[2:] if data and data[0] > 0 else None
 
+    def in_select(self, tg):
+        """UM0701-02 (PN532 User Manual), s7.3.12"""
+        data = self.command(0x54, bytearray([tg]), timeout=1.0)
+        if data is None or data[0] != 0:
+            self.chipset_error(data)
+
     def in_atr(self, nfcid3i='', gi=''):
         """UM0701-02 (PN532 User Manual), s7.3.6"""
         flag = int(bool(nfcid3i)) | (int(bool(gi)) << 1)
@@ -568,6 +633,62 @@ class Device(device.Device):
             except Chipset.Error:
                 pass
 
+    def sense_tta_all(self, target):
+        max_tg = self.chipset.in_list_passive_target_max_target
+        if max_tg < 2 or target.sel_req:
+            target = self.sense_tta(target)
+            return [target] if target else []
+
+        if target.brty != "106A":
+            message = "unsupported bitrate {0}".format(target.brty)
+            self.log.warning(message)
+            raise ValueError(message)
+
+        rsp = self.chipset.in_list_passive_target(max_tg, 0, bytearray())
+        if rsp is None:
+            if self.chipset.read_register("CIU_FIFOData") == 0x26:
+                return []
+            # A Type 1 Tag does not answer SDD_REQ and can only be
+            # found alone with the single target activation.
+            target = self.sense_tta(target)
+            return [target] if target else []
+
+        # The InListPassiveTarget response data for the first target
+        # starts with SENS_RES, each following target is prefixed
+        # with its logical number Tg that is needed for InSelect.
+        targets, tg = [], 1
+        while len(rsp) >= 4:
+            sens_res, sel_res = rsp[1::-1], rsp[2:3]
+            sdd_res, rsp = rsp[4:4+rsp[3]], rsp[4+rsp[3]:]
+            targets.append(nfc.clf.RemoteTarget(
+                "106A", sens_res=sens_res, sel_res=sel_res,
+                sdd_res=sdd_res, _tg=tg))
+            if len(rsp) > 0:
+                tg, rsp = rsp[0], rsp[1:]
+
+        self.log.debug("found {0} type a targets".format(len(targets)))
+        if targets and targets[-1].sel_res[0] & 0x60 == 0x00:
+            self.log.debug("disable crc check for type 2 tag")
+            rxmode = self.chipset.read_register("CIU_RxMode")
+            self.chipset.write_register("CIU_RxMode", rxmode & 0x7F)
+        return targets
+
+    def select_target(self, target):
+        if target._tg is None:
+            return
+        try:
+            self.chipset.in_select(target._tg)
+        except Chipset.Error as error:
+            self.log.debug(error)
+            raise nfc.clf.TimeoutError("failed to select {0}".format(target))
+        # The CRC check must be disabled for a Type 2 Tag to receive
+        # the 4-bit ACK/NAK responses, see _tt2_send_cmd_recv_rsp.
+        rxmode = self.chipset.read_register("CIU_RxMode")
+        if target.sel_res and target.sel_res[0] & 0x60 == 0x00:
+            self.chipset.write_register("CIU_RxMode", rxmode & 0x7F)
+        else:
+            self.chipset.write_register("CIU_RxMode", rxmode | 0x80)
+
     def sense_ttb(self, target, did=None):
         brty = {"106B": 3, "212B": 6, "424B": 7, "848B": 8}.get(target.brty)
         if brty not in self.chipset.in_list_passive_target_brty_range:
@@ -24,8 +24,11 @@
 #
 import os
 import re
+import time
 import errno
+import select
 import six
+import collections
 from binascii import hexlify
 
 try:
@@ -132,6 +135,16 @@ class TTY(object):
     def open(self, port, baudrate=115200):
         self.close()
         self.tty = serial.Serial(port, baudrate, timeout=0.05)
+        # Received bytes are collected in an input buffer from which
+        # read() takes complete frames. On POSIX systems the buffer is
+        # filled directly from the (non-blocking) serial port file
+        # descriptor, elsewhere through the pyserial read method.
+        self._rbuf = bytearray()
+        self._flush = True
+        try:
+            self._fd = self.tty.fileno()
+        except (AttributeError, serial.SerialException):
+            self._fd = None
 
     @property
     def port(self):
@@ -146,29 +159,81 @@ class TTY(object):
         if self.tty:
             self.tty.baudrate = value
 
+    def _frame_size(self):
+        # Return the size of the PN53x frame at the start of the input
+        # buffer or None if the frame header is not yet complete.
+        rbuf = self._rbuf
+        if len(rbuf) < 6:
+            return None
+        if rbuf.startswith(b"\x00\x00\xff\x00\xff\x00"):
+            return 6
+        if rbuf[3] == 0xFF:
+            if len(rbuf) < 9:
+                return None
+            return (rbuf[5] << 8 | rbuf[6]) + 10
+        return rbuf[3] + 7
+
+    def _fill(self, timeout):
+        # Add received bytes to the input buffer, waiting at most
+        # *timeout* seconds (None waits forever) for the first byte.
+        # Return False if nothing was received within the timeout.
+        if self._fd is None:
+            self.tty.timeout = timeout
+            data = self.tty.read(max(self.tty.in_waiting, 1))
+        else:
+            if not select.select([self._fd], [], [], timeout)[0]:
+                return False
+            try:
+                data = os.read(self._fd, 4096)
+            except OSError as error:
+                if error.errno == errno.EAGAIN:
+                    return True
+                raise IOError(error.errno, os.strerror(error.errno))
+            if not data:
+                log.error("tty ready to read but returned no data")
+                raise IOError(errno.EIO, os.strerror(errno.EIO))
+        self._rbuf += data
+        return bool(data)
+
     def read(self, timeout):
         if self.tty is not None:
-            self.tty.timeout = max(timeout/1E3, 0.05)
-            frame = bytearray(self.tty.read(6))
-            if frame is None or len(frame) == 0:
-                raise IOError(errno.ETIMEDOUT, os.strerror(errno.ETIMEDOUT))
-            if frame.startswith(b"\x00\x00\xff\x00\xff\x00"):
-                log.log(logging.DEBUG-1, "<<< %s", str(frame).encode("hex"))
-                return frame
-            LEN = frame[3]
-            if LEN == 0xFF:
-                frame += self.tty.read(3)
-                LEN = frame[5] << 8 | frame[6]
-            frame += self.tty.read(LEN + 1)
-            log.log(logging.DEBUG-1, "<<< %s", hexlify(frame))
+            # Wait at most *timeout* milliseconds for a complete frame,
+            # or forever if the timeout is zero.
+            deadline = time.time() + timeout / 1E3 if timeout else None
+            size = self._frame_size()
+            while size is None or len(self._rbuf) < size:
+                if deadline is None:
+                    remaining = None
+                else:
+                    remaining = max(deadline - time.time(), 0)
+                if not self._fill(remaining):
+                    # The input stream is out of sync and will be
+                    # flushed with the next write.
+                    self._flush = True
+                    if not self._rbuf:
+                        raise IOError(errno.ETIMEDOUT,
+                                      os.strerror(errno.ETIMEDOUT))
+                    size = len(self._rbuf)
+                    break
+                size = self._frame_size()
+            frame = self._rbuf[:size]
+            del self._rbuf[:size]
+            if log.isEnabledFor(logging.DEBUG-1):
+                log.log(logging.DEBUG-1, "<<< %s", hexlify(frame))
             return frame
 
     def write(self, frame):
         if self.tty is not None:
-            log.log(logging.DEBUG-1, ">>> %s", hexlify(frame))
-            self.tty.flushInput()
+            if log.isEnabledFor(logging.DEBUG-1):
+                log.log(logging.DEBUG-1, ">>> %s", hexlify(frame))
+            if self._flush or self._rbuf:
+                # Discard stale input left from a previous exchange,
+                # i.e. after a read timeout or unread bytes.
+                self.tty.flushInput()
+                del self._rbuf[:]
+                self._flush = False
             try:
-                self.tty.write(str(frame))
+                self.tty.write(frame)
             except serial.SerialTimeoutException:
                 raise IOError(errno.EIO, os.strerror(errno.EIO))
 
@@ -182,6 +247,18 @@ class TTY(object):
 class USB(object):
     TYPE = "USB"
 
+    # If set to True before a device is opened, a bulk read transfer
+    # is kept submitted and received frames are collected in a queue
+    # that read() consumes. This avoids the transfer setup latency of
+    # a synchronous bulk read for the ACK and response frames.
+    async_transfers = False
+
+    # Set by open() when async_transfers is enabled. Declared here so
+    # that close() and __del__() work on a USB object that was never
+    # (or only partly) opened.
+    _read_transfer = None
+    _read_queue = None
+
     @classmethod
     def find(cls, path):
         if not path.startswith("usb"):
@@ -227,6 +304,9 @@ class USB(object):
 
     def __init__(self, usb_bus, dev_adr):
         self.context = libusb.USBContext()
+        # The asynchronous read transfer receives into this buffer, it
+        # is reused for every resubmission of the transfer.
+        self._read_buffer = bytearray(300)
         self.open(usb_bus, dev_adr)
 
     def __del__(self):
@@ -238,6 +318,8 @@ class USB(object):
         self.usb_dev = None
         self.usb_out = None
         self.usb_inp = None
+        self._read_transfer = None
+        self._read_queue = collections.deque()
 
         for dev in self.context.getDeviceList(skip_on_error=True):
             if ((dev.getBusNumber() == usb_bus and
@@ -292,7 +374,72 @@ class USB(object):
         except libusb.USBErrorNoDevice:
             raise IOError(errno.ENODEV, os.strerror(errno.ENODEV))
 
+        if self.async_transfers:
+            self._submit_read_transfer()
+
+    def _submit_read_transfer(self):
+        ep_addr = self.usb_inp.getAddress()
+        self._read_transfer = self.usb_dev.getTransfer()
+        self._read_transfer.setBulk(ep_addr, self._read_buffer,
+                                    self._read_transfer_callback)
+        self._read_transfer.submit()
+
+    def _read_transfer_callback(self, transfer):
+        # Called from libusb event handling within read(). A received
+        # frame is queued and the transfer immediately resubmitted.
+        status = transfer.getStatus()
+        if status == libusb.TRANSFER_COMPLETED:
+            length = transfer.getActualLength()
+            frame = bytearray(memoryview(transfer.getBuffer())[:length])
+            self._read_queue.append(frame)
+            transfer.submit()
+        elif status == libusb.TRANSFER_NO_DEVICE:
+            error = IOError(errno.ENODEV, os.strerror(errno.ENODEV))
+            self._read_queue.append(error)
+        elif status != libusb.TRANSFER_CANCELLED:
+            log.error("bulk read transfer status %d", status)
+            error = IOError(errno.EIO, os.strerror(errno.EIO))
+            self._read_queue.append(error)
+            transfer.submit()
+
+    def _cancel_read_transfer(self):
+        try:
+            if self._read_transfer.isSubmitted():
+                self._read_transfer.cancel()
+                # Give libusb up to one second to report the cancelled
+                # transfer, a device that went away may never do so.
+                for _ in range(10):
+                    if not self._read_transfer.isSubmitted():
+                        break
+                    self.context.handleEventsTimeout(0.1)
+            self._read_transfer.close()
+        except libusb.USBError as error:
+            log.debug("%r", error)
+        self._read_transfer = None
+        self._read_queue.clear()
+
+    @property
+    def pollfds(self):
+        """The list of (fd, events) tuples that an event loop should watch
+        for this transport when asynchronous transfers are used. When
+        any of them becomes ready, :meth:`handle_events` collects the
+        received frames without blocking.
+
+        """
+        return self.context.getPollFDList()
+
+    def handle_events(self):
+        """Process pending USB events without blocking and return the
+        number of received frames that a :meth:`read` will return
+        immediately.
+
+        """
+        self.context.handleEventsTimeout(0)
+        return len(self._read_queue)
+
     def close(self):
+        if self._read_transfer is not None:
+            self._cancel_read_transfer()
         if self.usb_dev:
             self.usb_dev.close()
         self.usb_dev = None
@@ -307,11 +454,34 @@ class USB(object):
     def product_name(self):
         return self._product_name
 
+    def _read_from_queue(self, timeout):
+        # Wait for a frame received by the asynchronous read transfer,
+        # handling libusb events for at most *timeout* milliseconds
+        # (wait forever if timeout is 0).
+        if timeout:
+            deadline = time.time() + timeout / 1000.0
+        while not self._read_queue:
+            if timeout:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise IOError(errno.ETIMEDOUT,
+                                  os.strerror(errno.ETIMEDOUT))
+                self.context.handleEventsTimeout(remaining)
+            else:
+                self.context.handleEvents()
+        frame = self._read_queue.popleft()
+        if isinstance(frame, IOError):
+            raise frame
+        return frame
+
     def read(self, timeout=0):
         if self.usb_inp is not None:
             try:
-                ep_addr = self.usb_inp.getAddress()
-                frame = self.usb_dev.bulkRead(ep_addr, 300, timeout)
+                if self._read_transfer is not None:
+                    frame = self._read_from_queue(timeout)
+                else:
+                    ep_addr = self.usb_inp.getAddress()
+                    frame = self.usb_dev.bulkRead(ep_addr, 300, timeout)
             except libusb.USBErrorTimeout:
                 raise IOError(errno.ETIMEDOUT, os.strerror(errno.ETIMEDOUT))
             except libusb.USBErrorNoDevice:
@@ -324,16 +494,20 @@ class USB(object):
                 log.error("bulk read returned zero data")
                 raise IOError(errno.EIO, os.strerror(errno.EIO))
 
-            frame = bytearray(frame)
-            log.log(logging.DEBUG-1, "<<< %s", hexlify(frame))
+            if not isinstance(frame, bytearray):
+                frame = bytearray(frame)
+            if log.isEnabledFor(logging.DEBUG-1):
+                log.log(logging.DEBUG-1, "<<< %s", hexlify(frame))
             return frame
 
     def write(self, frame, timeout=0):
         if self.usb_out is not None:
-            log.log(logging.DEBUG-1, ">>> %s", hexlify(frame))
+            if log.isEnabledFor(logging.DEBUG-1):
+                log.log(logging.DEBUG-1, ">>> %s", hexlify(frame))
             try:
+                # A bytearray frame is transferred without a copy.
                 ep_addr = self.usb_out.getAddress()
-                self.usb_dev.bulkWrite(ep_addr, bytes(frame), timeout)
+                self.usb_dev.bulkWrite(ep_addr, frame, timeout)
                 if len(frame) % self.usb_out.getMaxPacketSize() == 0:
                     self.usb_dev.bulkWrite(ep_addr, b'', timeout)
             except libusb.USBErrorTimeout:
@@ -0,0 +1,134 @@
+# -*- coding: latin-1 -*-
+# -----------------------------------------------------------------------------
+# Copyright 2009, 2017 Stephen Tiedemann <stephen.tiedemann@gmail.com>
+#
+# Licensed under the EUPL, Version 1.1 or - as soon they
+# will be approved by the European Commission - subsequent
+# versions of the EUPL (the "Licence");
+# You may not use this work except in compliance with the
+# Licence.
+# You may obtain a copy of the Licence at:
+#
+# https://joinup.ec.europa.eu/software/page/eupl
+#
+# Unless required by applicable law or agreed to in
+# writing, software distributed under the Licence is
+# distributed on an "AS IS" basis,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied.
+# See the Licence for the specific language governing
+# permissions and limitations under the Licence.
+# -----------------------------------------------------------------------------
+"""The :mod:`nfc.codec` module provides a worker pool for NDEF message
+decoding and encoding. It lets the thread that talks to the
+contactless device deal with NDEF message octets only, while the
+records are decoded or encoded in worker threads and delivered
+through :class:`concurrent.futures.Future` objects. The number of
+pending requests is limited, so that a fast producer can not queue
+up an unbounded amount of work. ::
+
+    import nfc
+    import nfc.codec
+
+    codec = nfc.codec.NdefCodecPool(max_workers=2, max_pending=8)
+
+    def on_records(future):
+        for record in future.result():
+            print(record)
+
+    def on_connect(tag):
+        if tag.ndef is not None:
+            codec.decode(tag.ndef.octets, callback=on_records)
+        return False
+
+    with nfc.ContactlessFrontend('usb') as clf:
+        clf.connect(rdwr={'on-connect': on_connect})
+    codec.shutdown()
+
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from ndef import message_decoder, message_encoder
+
+import logging
+log = logging.getLogger(__name__)
+
+
+class NdefCodecPool(object):
+    """A pool of *max_workers* threads that decode NDEF message octets
+    into records and encode records into NDEF message octets.
+
+    At most *max_pending* requests may be queued or in progress at
+    any time. A request that would exceed the limit waits until a
+    request completes or, if a *timeout* was given, until the timeout
+    expires. The *errors* argument sets the default error handling
+    strategy of the NDEF decoder, it may be 'strict', 'relax' or
+    'ignore' as described for :func:`ndef.message_decoder`.
+
+    """
+    def __init__(self, max_workers=2, max_pending=8, errors='relax'):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._pending = threading.BoundedSemaphore(max_pending)
+        self.errors = errors
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+    def _submit(self, func, args, callback, timeout):
+        # Acquire a pending request slot, which is given back when the
+        # future is done, and schedule func(*args) on a worker thread.
+        if not self._pending.acquire(timeout=timeout):
+            log.debug("too many pending requests, dropped")
+            return None
+        try:
+            future = self.executor.submit(func, *args)
+        except Exception:
+            self._pending.release()
+            raise
+        future.add_done_callback(lambda future: self._pending.release())
+        if callback is not None:
+            future.add_done_callback(callback)
+        return future
+
+    def decode(self, octets, callback=None, timeout=None, errors=None):
+        """Decode NDEF message *octets* in a worker thread. Returns a
+        :class:`concurrent.futures.Future` whose result is the list of
+        decoded :class:`ndef.Record` objects, or :const:`None` if
+        the request could not be queued within *timeout* seconds. A
+        *callback* function is called with the future when it is
+        done. The *octets* are copied before this method returns.
+
+        """
+        errors = self.errors if errors is None else errors
+        args = (bytes(octets), errors)
+        return self._submit(self._decode, args, callback, timeout)
+
+    def encode(self, records, callback=None, timeout=None):
+        """Encode a list of *records* in a worker thread. Returns a
+        :class:`concurrent.futures.Future` whose result is the NDEF
+        message octets, or :const:`None` if the request could not be
+        queued within *timeout* seconds. A *callback* function is
+        called with the future when it is done.
+
+        """
+        args = (list(records),)
+        return self._submit(self._encode, args, callback, timeout)
+
+    def shutdown(self, wait=True):
+        """Stop accepting requests and, if *wait* is True, wait until all
+        pending requests are done.
+
+        """
+        self.executor.shutdown(wait=wait)
+
+    @staticmethod
+    def _decode(octets, errors):
+        return list(message_decoder(octets, errors=errors))
+
+    @staticmethod
+    def _encode(records):
+        return b''.join(message_encoder(records))
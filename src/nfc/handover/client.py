@@ -68,6 +68,7 @@ class HandoverClient(object):
             return self._send(data, send_miu)
 
     def _send(self, data, miu):
+        data = memoryview(data)
         while len(data) > 0:
             if self.socket.send(data[0:miu]):
                 data = data[miu:]
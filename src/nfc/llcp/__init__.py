@@ -34,5 +34,7 @@ SO_SNDBUF = 3
 SO_RCVBUF = 4
 SO_SNDBSY = 5
 SO_RCVBSY = 6
+SO_RCVACK = 7
+SO_COUNTERS = 8
 
 MSG_DONTWAIT = 0b00000001
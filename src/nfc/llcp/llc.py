@@ -53,6 +53,7 @@ class ServiceAccessPoint(object):
         self.addr = addr
         self.sock_list = collections.deque()
         self.send_list = collections.deque()
+        self.raw = False
 
     def __str__(self):
         return "SAP {0:>2}".format(self.addr)
@@ -78,6 +79,8 @@ class ServiceAccessPoint(object):
                 insertable = True
             if insertable:
                 socket.bind(self.addr)
+                socket.send_notify = self.wakeup
+                self.raw = isinstance(socket, tco.RawAccessPoint)
                 self.sock_list.appendleft(socket)
             else:
                 log.error("can't insert socket of different type")
@@ -97,6 +100,15 @@ class ServiceAccessPoint(object):
 
     def send(self, send_pdu):
         self.send_list.append(send_pdu)
+        self.wakeup()
+
+    def wakeup(self):
+        self.llc.ready.put(self)
+
+    def pending(self):
+        with self.llc.lock:
+            return bool(self.send_list) or any(
+                socket.pending() for socket in self.sock_list)
 
     def shutdown(self):
         while True:
@@ -156,6 +168,8 @@ class ServiceAccessPoint(object):
 class ServiceDiscovery(object):
     def __init__(self, llc):
         self.llc = llc
+        self.addr = 1
+        self.raw = False
         self.snl = dict()
         self.tids = range(256)
         self.resp = threading.Condition(self.llc.lock)
@@ -183,6 +197,7 @@ class ServiceDiscovery(object):
             tid = random.choice(self.tids)
             self.tids.remove(tid)
             self.sdreq.append((tid, name))
+            self.wakeup()
             while self.snl is not None and name not in self.snl:
                 self.resp.wait()
             return None if self.snl is None else self.snl[name]
@@ -239,12 +254,52 @@ class ServiceDiscovery(object):
             if len(self.dmpdu) > 0 and miu_size > 0:
                 return self.dmpdu.popleft()
 
+    def wakeup(self):
+        self.llc.ready.put(self)
+
+    def pending(self):
+        with self.llc.lock:
+            return bool(self.sdres or self.sdreq or self.dmpdu)
+
     def shutdown(self):
         with self.llc.lock:
             self.snl = None
             self.resp.notify_all()
 
 
+class ReadyQueue(object):
+    # The service access points that may have PDUs to send. A service
+    # access point is put into the queue when one of its sockets has
+    # something to send, and all are taken out for each collect. The
+    # packet collector puts back those that have still something
+    # pending, so that idle service access points cost nothing.
+    def __init__(self, event):
+        self.lock = threading.Lock()
+        self.event = event
+        self.saps = set()
+        self.first = 0
+
+    def __len__(self):
+        return len(self.saps)
+
+    def put(self, sap, wakeup=True):
+        with self.lock:
+            self.saps.add(sap)
+        if wakeup:
+            self.event.set()
+
+    def take(self):
+        # Remove and return all queued service access points. Raw
+        # access points come first, because their PDUs must not be
+        # aggregated. All others are in address order, but starting
+        # from the address that follows the one that was served first
+        # during the last collect (round-robin).
+        with self.lock:
+            saps, self.saps = self.saps, set()
+        return sorted(saps, key=lambda sap: (
+            not sap.raw, (sap.addr - self.first) % 64))
+
+
 class LogicalLinkController(object):
     class LinkState(object):
         def __init__(self):
@@ -288,6 +343,8 @@ class LogicalLinkController(object):
         self.pcnt = LogicalLinkController.Counter()
         self.link = LogicalLinkController.LinkState()
         self.lock = threading.RLock()
+        self.send_pending = threading.Event()
+        self.ready = ReadyQueue(self.send_pending)
         self.cfg = dict()
         self.cfg['recv-miu'] = options.get('miu', 248)
         self.cfg['send-lto'] = options.get('lto', 500)
@@ -468,7 +525,7 @@ class LogicalLinkController(object):
                 if rcvd_pdu == pdu.Disconnect(0, 0):
                     self.link.CLOSED = True
                     return self.terminate(reason="remote choice")
-                symm += 1 if rcvd_pdu.name == "SYMM" else 0
+                symm = symm + 1 if rcvd_pdu.name == "SYMM" else 0
                 self.dispatch(rcvd_pdu)
                 send_pdu = self.collect(delay=0.001)
                 if send_pdu is None and symm >= 10:
@@ -531,7 +588,7 @@ class LogicalLinkController(object):
                 if rcvd_pdu == pdu.Disconnect(0, 0):
                     self.link.CLOSED = True
                     return self.terminate(reason="remote choice")
-                symm += 1 if isinstance(rcvd_pdu, pdu.Symmetry) else 0
+                symm = symm + 1 if isinstance(rcvd_pdu, pdu.Symmetry) else 0
                 self.dispatch(rcvd_pdu)
                 send_pdu = self.collect(delay=0.001)
                 if send_pdu is None and symm >= 10:
@@ -563,10 +620,39 @@ class LogicalLinkController(object):
             log.debug("llc run loop terminated on target")
 
     def collect(self, delay=None):
-        # Collect a single PDU or multiple PDUs if aggregation is enabled.
-        if delay:
-            time.sleep(delay)
+        # Collect a single PDU or multiple PDUs if aggregation is
+        # enabled. If there is nothing to send, wait up to delay
+        # seconds for an application thread to queue a PDU and signal
+        # send_pending. The wait is limited to half of the local link
+        # timeout, which is the time the remote LLC waits for us.
+        self.send_pending.clear()
+        send_pdu = self._collect()
+        if send_pdu is None and delay:
+            delay = min(delay, self.cfg['send-lto'] * 0.5E-3)
+            deadline = time.time() + delay
+            while send_pdu is None and delay > 0:
+                if not self.send_pending.wait(delay):
+                    break
+                self.send_pending.clear()
+                send_pdu = self._collect()
+                delay = deadline - time.time()
+        return send_pdu
+
+    def _collect(self):
+        # Collect from the service access points in the ready queue
+        # and put back those that still have PDUs or acknowledgements
+        # pending.
+        with self.lock:
+            saps = [sap for sap in self.ready.take()
+                    if self.sap[sap.addr] is sap]
+            try:
+                return self._collect_from(saps)
+            finally:
+                for sap in saps:
+                    if sap.pending():
+                        self.ready.put(sap, wakeup=False)
 
+    def _collect_from(self, saps):
         def encrypt(send_pdu):
             pdu_type = type(send_pdu)
             a = send_pdu.encode_header()
@@ -577,74 +663,73 @@ class LogicalLinkController(object):
         icv_size = self.sec.icv_size if self.sec else 0
         send_pdu = None
 
-        with self.lock:
-            # Dequeue from the list of active SAP until a first PDU is
-            # returned. The list is sorted to first iterate the raw
-            # SAPs (raw SAPs do not respect the miu_size value and we
-            # must avoid them to return PDUs in aggregation). The PDU
-            # is returned straight if it fills or exceeds the Link
-            # MIU. Otherwise the loop terminates at this point. The
-            # sap.dequeue method is called with icv_size=0 because for
-            # encrypted but not aggregated UI and I PDUs the receiver
-            # must accept them with complete MIU plus ICV size.
-            for sap in sorted(filter(None, self.sap), reverse=True,
-                              key=lambda sap: sap.mode == RAW_ACCESS_POINT):
-                send_pdu = sap.dequeue(miu_size, icv_size=0)
+        # Dequeue from the list of active SAP until a first PDU is
+        # returned. The list has the raw SAPs first (raw SAPs do not
+        # respect the miu_size value and we must avoid them to return
+        # PDUs in aggregation). The PDU is returned straight if it
+        # fills or exceeds the Link MIU. Otherwise the loop terminates
+        # at this point. The sap.dequeue method is called with
+        # icv_size=0 because for encrypted but not aggregated UI and I
+        # PDUs the receiver must accept them with complete MIU plus
+        # ICV size.
+        for sap in saps:
+            send_pdu = sap.dequeue(miu_size, icv_size=0)
+            if send_pdu:
+                self.ready.first = (sap.addr + 1) % 64
+                if self.sec and send_pdu.name in ("UI", "I"):
+                    send_pdu = encrypt(send_pdu)
+                if len(send_pdu) - send_pdu.header_size >= miu_size:
+                    return send_pdu
+                break
+
+        # Data Link Connection endpoints do not dequeue RR/RNR PDUs until
+        # the receive window is exhausted. If there is not yet a PDU to
+        # send, this loop allows voluntary acknowledgement.
+        if send_pdu is None:
+            for sap in saps:
+                if sap.mode == DATA_LINK_CONNECTION:
+                    send_pdu = sap.sendack()
+                    if send_pdu:
+                        break
+
+        # Finish if either there is either no PDU to send or if PDU
+        # aggregation is disabled.
+        if send_pdu is None or self.cfg['send-agf'] is False:
+            return send_pdu
+
+        # We have one PDU to send and aggregation is enabled. We'll see if
+        # there are more outbound PDUs and collect them into an AGF PDU.
+        agf_pdu = pdu.AggregatedFrame(0, 0, [send_pdu])
+        miu_size = self.cfg["send-miu"] - len(agf_pdu) - 3
+        while True:
+            # The first loop will dequeue PDUs until the reamining miu_size
+            # is exhausted or all active SAP did not return a PDU.
+            deq_none = True
+            for sap in saps:
+                send_pdu = sap.dequeue(miu_size, icv_size)
                 if send_pdu:
+                    deq_none = False
                     if self.sec and send_pdu.name in ("UI", "I"):
                         send_pdu = encrypt(send_pdu)
-                    if len(send_pdu) - send_pdu.header_size >= miu_size:
-                        return send_pdu
-                    break
-
-            # Data Link Connection endpoints do not dequeue RR/RNR PDUs until
-            # the receive window is exhausted. If there is not yet a PDU to
-            # send, this loop allows voluntary acknowledgement.
-            if send_pdu is None:
-                for sap in filter(None, self.sap):
-                    if sap.mode == DATA_LINK_CONNECTION:
-                        send_pdu = sap.sendack()
-                        if send_pdu:
-                            break
-
-            # Finish if either there is either no PDU to send or if PDU
-            # aggregation is disabled.
-            if send_pdu is None or self.cfg['send-agf'] is False:
-                return send_pdu
-
-            # We have one PDU to send and aggregation is enabled. We'll see if
-            # there are more outbound PDUs and collect them into an AGF PDU.
-            agf_pdu = pdu.AggregatedFrame(0, 0, [send_pdu])
-            miu_size = self.cfg["send-miu"] - len(agf_pdu) - 3
-            while True:
-                # The first loop will dequeue PDUs until the reamining miu_size
-                # is exhausted or all active SAP did not return a PDU.
-                deq_none = True
-                for sap in filter(None, self.sap):
-                    send_pdu = sap.dequeue(miu_size, icv_size)
+                    agf_pdu.append(send_pdu)
+                    miu_size = self.cfg["send-miu"] - len(agf_pdu) - 3
+                    if miu_size < 0:
+                        break
+            if miu_size < 0 or deq_none:
+                break
+        # If the miu_size is not yet exhausted we query all data link
+        # connection endpoints once for voluntary acknowledgements.
+        if miu_size >= 0:
+            for sap in saps:
+                if sap.mode == DATA_LINK_CONNECTION:
+                    send_pdu = sap.sendack()
                     if send_pdu:
-                        deq_none = False
-                        if self.sec and send_pdu.name in ("UI", "I"):
-                            send_pdu = encrypt(send_pdu)
                         agf_pdu.append(send_pdu)
                         miu_size = self.cfg["send-miu"] - len(agf_pdu) - 3
                         if miu_size < 0:
                             break
-                if miu_size < 0 or deq_none:
-                    break
-            # If the miu_size is not yet exhausted we query all data link
-            # connection endpoints once for voluntary acknowledgements.
-            if miu_size >= 0:
-                for sap in filter(None, self.sap):
-                    if sap.mode == DATA_LINK_CONNECTION:
-                        send_pdu = sap.sendack()
-                        if send_pdu:
-                            agf_pdu.append(send_pdu)
-                            miu_size = self.cfg["send-miu"] - len(agf_pdu) - 3
-                            if miu_size < 0:
-                                break
-
-            return agf_pdu if agf_pdu.count > 1 else agf_pdu.first
+
+        return agf_pdu if agf_pdu.count > 1 else agf_pdu.first
 
     def dispatch(self, rcvd_pdu):
         if rcvd_pdu is None or rcvd_pdu.name == "SYMM":
@@ -665,6 +750,7 @@ class LogicalLinkController(object):
                 dm_reason = 0x10 if rcvd_pdu.sn is None else 0x02
                 dm_pdu = pdu.DisconnectedMode(rcvd_pdu.ssap, 1, dm_reason)
                 self.sap[1].dmpdu.append(dm_pdu)
+                self.sap[1].wakeup()
                 log.debug("could not find service %r", rcvd_pdu.sn)
                 return
             # service found, rewrite CONNECT PDU to its DSAP
@@ -681,6 +767,7 @@ class LogicalLinkController(object):
             sap = self.sap[rcvd_pdu.dsap]
             if sap:
                 sap.enqueue(rcvd_pdu)
+                sap.wakeup()
             else:
                 log.debug("can't dispatch PDU %s", rcvd_pdu)
 
@@ -825,7 +912,7 @@ class LogicalLinkController(object):
             # FIXME: set socket send miu when activated
             socket.send_miu = self.cfg['send-miu']
             return socket.send(message, flags)
-        if not isinstance(message, bytes):
+        if not isinstance(message, (bytes, memoryview)):
             raise TypeError("the message argument must be a byte string")
         if isinstance(socket, tco.LogicalDataLink):
             if dest is None:
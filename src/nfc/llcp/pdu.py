@@ -38,94 +38,162 @@ class EncodeError(Error):
     pass
 
 
+# Precompiled struct formats for the PDU header, sequence and parameter
+# TLV fields. These are used on every received and transmitted PDU and
+# save the format string lookup and parse of the struct module level
+# functions.
+_pdu_header = struct.Struct('!BB')
+_pdu_numbered_header = struct.Struct('!BBB')
+_pdu_sap_field = struct.Struct('!H')
+_agf_length = struct.Struct('!H')
+_pdu_sequence = struct.Struct('!B')
+_tlv_header = struct.Struct('BB')
+_tlv_uint8 = struct.Struct('B')
+_tlv_uint16 = struct.Struct('>H')
+_tlv_pack_uint8 = struct.Struct('BBB')
+_tlv_pack_uint16 = struct.Struct('>BBH')
+_tlv_pack_sdreq = struct.Struct('>BBB')
+_tlv_pack_sdres = struct.Struct('>BBBB')
+
+
+def _decode_version_tlv(L, V):
+    if L != 1:
+        raise DecodeError("VERSION TLV length error")
+    return _tlv_uint8.unpack(V)[0]
+
+
+def _decode_miux_tlv(L, V):
+    if L != 2:
+        raise DecodeError("MIUX TLV length error")
+    V = _tlv_uint16.unpack(V)[0]
+    if V & 0xF800:
+        log.warn("MIUX TLV reserved bits set")
+        V = V & 0x07FF
+    return V
+
+
+def _decode_wks_tlv(L, V):
+    if L != 2:
+        raise DecodeError("WKS TLV length error")
+    return _tlv_uint16.unpack(V)[0]
+
+
+def _decode_lto_tlv(L, V):
+    if L != 1:
+        raise DecodeError("LTO TLV length error")
+    return _tlv_uint8.unpack(V)[0]
+
+
+def _decode_rw_tlv(L, V):
+    if L != 1:
+        raise DecodeError("RW TLV length error")
+    V = _tlv_uint8.unpack(V)[0]
+    if V & 0xF0:
+        log.warn("RW TLV reserved bits set")
+        V = V & 0x0F
+    return V
+
+
+def _decode_sn_tlv(L, V):
+    if L == 0:
+        log.warn("SN TLV with zero-length service name")
+    return V
+
+
+def _decode_opt_tlv(L, V):
+    if L != 1:
+        raise DecodeError("OPT TLV length error")
+    V = _tlv_uint8.unpack(V)[0]
+    if V & 0xF8:
+        log.warn("OPT TLV reserved bits set")
+        V = V & 0x07
+    return V
+
+
+def _decode_sdreq_tlv(L, V):
+    if L == 0:
+        raise DecodeError("SDREQ TLV length error")
+    if L == 1:
+        log.warn("SDREQ TLV with zero-length service name")
+    return (_tlv_uint8.unpack_from(V)[0], V[1:])
+
+
+def _decode_sdres_tlv(L, V):
+    if L != 2:
+        raise DecodeError("SDRES TLV length error")
+    return _tlv_header.unpack(V)
+
+
+def _decode_ecpk_tlv(L, V):
+    if L == 0:
+        log.warn("ECPK TLV with zero-length value")
+    if L & 1:
+        log.warn("ECPK TLV with odd length value")
+    return V
+
+
+def _decode_rn_tlv(L, V):
+    if L == 0:
+        log.warn("RN TLV with zero-length value")
+    return V
+
+
 class Parameter:
     VERSION, MIUX, WKS, LTO, RW, SN, OPT, SDREQ, SDRES, ECPK, RN = range(1, 12)
 
+    # Value decoders by TLV type. A decoder checks the length and
+    # converts the value octets, unknown types keep the octets.
+    _value_decoder = {
+        VERSION: _decode_version_tlv,
+        MIUX: _decode_miux_tlv,
+        WKS: _decode_wks_tlv,
+        LTO: _decode_lto_tlv,
+        RW: _decode_rw_tlv,
+        SN: _decode_sn_tlv,
+        OPT: _decode_opt_tlv,
+        SDREQ: _decode_sdreq_tlv,
+        SDRES: _decode_sdres_tlv,
+        ECPK: _decode_ecpk_tlv,
+        RN: _decode_rn_tlv,
+    }
+
     @staticmethod
     def decode(data, offset):
         try:
-            T, L = struct.unpack_from('BB', data, offset)
-            V = struct.unpack_from('%ds' % L, data, offset+2)[0]
+            T, L = _tlv_header.unpack_from(data, offset)
         except struct.error as error:
             msg = " while decoding TLV %r" % hexlify(data[offset:])
             raise DecodeError(str(error) + msg)
 
-        if T == Parameter.VERSION:
-            if L != 1:
-                raise DecodeError("VERSION TLV length error")
-            V = struct.unpack('B', V)[0]
-        elif T == Parameter.MIUX:
-            if L != 2:
-                raise DecodeError("MIUX TLV length error")
-            V = struct.unpack('>H', V)[0]
-            if V & 0xF800:
-                log.warn("MIUX TLV reserved bits set")
-                V = V & 0x07FF
-        elif T == Parameter.WKS:
-            if L != 2:
-                raise DecodeError("WKS TLV length error")
-            V = struct.unpack('>H', V)[0]
-        elif T == Parameter.LTO:
-            if L != 1:
-                raise DecodeError("LTO TLV length error")
-            V = struct.unpack('B', V)[0]
-        elif T == Parameter.RW:
-            if L != 1:
-                raise DecodeError("RW TLV length error")
-            V = struct.unpack('B', V)[0]
-            if V & 0xF0:
-                log.warn("RW TLV reserved bits set")
-                V = V & 0x0F
-        elif T == Parameter.SN and L == 0:
-            log.warn("SN TLV with zero-length service name")
-        elif T == Parameter.OPT:
-            if L != 1:
-                raise DecodeError("OPT TLV length error")
-            V = struct.unpack_from('B', V)[0]
-            if V & 0xF8:
-                log.warn("OPT TLV reserved bits set")
-                V = V & 0x07
-        elif T == Parameter.SDREQ:
-            if L == 0:
-                raise DecodeError("SDREQ TLV length error")
-            if L == 1:
-                log.warn("SDREQ TLV with zero-length service name")
-            V = struct.unpack('B%ds' % (L-1), V)
-        elif T == Parameter.SDRES:
-            if L != 2:
-                raise DecodeError("SDRES TLV length error")
-            V = struct.unpack('BB', V)
-        elif T == Parameter.ECPK:
-            if L == 0:
-                log.warn("ECPK TLV with zero-length value")
-            if L & 1:
-                log.warn("ECPK TLV with odd length value")
-        elif T == Parameter.RN:
-            if L == 0:
-                log.warn("RN TLV with zero-length value")
-
-        return (T, L, V)
+        V = memoryview(data)[offset+2:offset+2+L].tobytes()
+        if len(V) != L:
+            msg = "TLV value requires %d bytes" % L
+            msg += " while decoding TLV %r" % hexlify(data[offset:])
+            raise DecodeError(msg)
+
+        decode_value = Parameter._value_decoder.get(T)
+        return (T, L, decode_value(L, V) if decode_value else V)
 
     @staticmethod
     def encode(T, V):
         try:
             if T in (Parameter.VERSION, Parameter.LTO,
                      Parameter.RW, Parameter.OPT):
-                return struct.pack('BBB', T, 1, V)
+                return _tlv_pack_uint8.pack(T, 1, V)
             if T in (Parameter.MIUX, Parameter.WKS):
-                return struct.pack('>BBH', T, 2, V)
+                return _tlv_pack_uint16.pack(T, 2, V)
             if T in (Parameter.SN, Parameter.ECPK, Parameter.RN):
                 if len(V) > 255:
                     raise EncodeError("can't encode TLV T=%d, V=%r" % (T, V))
-                return struct.pack('BB', T, len(V)) + bytes(V)
+                return _tlv_header.pack(T, len(V)) + bytes(V)
             if T == Parameter.SDREQ:
                 tid, sn = V[0], V[1]
                 if len(sn) > 254:
                     raise EncodeError("can't encode TLV T=%d, V=%r" % (T, V))
-                return struct.pack('>BBB', T, 1+len(sn), tid) + bytes(sn)
+                return _tlv_pack_sdreq.pack(T, 1+len(sn), tid) + bytes(sn)
             if T == Parameter.SDRES:
                 tid, sap = V[0], V[1]
-                return struct.pack('>BBBB', T, 2, tid, sap)
+                return _tlv_pack_sdres.pack(T, 2, tid, sap)
             raise EncodeError("unknown TLV T=%d, V=%r" % (T, V))
         except struct.error as error:
             msg = " for TLV T=%d, V=%r" % (T, V)
@@ -149,7 +217,7 @@ class ProtocolDataUnit(object):
             size = len(data) - offset
         if size < cls.header_size:
             raise DecodeError("insufficient pdu header bytes")
-        (dsap, ssap) = struct.unpack_from('!BB', data, offset)
+        (dsap, ssap) = _pdu_header.unpack_from(data, offset)
         return (dsap >> 2, ssap & 63)
 
     def encode_header(self):
@@ -159,7 +227,16 @@ class ProtocolDataUnit(object):
             raise EncodeError("pdu dsap and ssap field can not be < 0")
         if self.dsap > 63 or self.ssap > 63:
             raise EncodeError("pdu dsap and ssap field can not be > 63")
-        return struct.pack('!H', self.dsap << 10 | self.ptype << 6 | self.ssap)
+        return _pdu_sap_field.pack(
+            self.dsap << 10 | self.ptype << 6 | self.ssap)
+
+    def encode_into(self, buffer, offset=0):
+        # Write the encoded pdu into buffer at offset and return the
+        # number of bytes written. Subclasses with a payload override
+        # this to write header and payload without joining them first.
+        data = self.encode()
+        buffer[offset:offset+len(data)] = data
+        return len(data)
 
     def __eq__(self, other):
         return self.encode() == other.encode()
@@ -185,7 +262,8 @@ class NumberedProtocolDataUnit(ProtocolDataUnit):
             size = len(data) - offset
         if size < cls.header_size:
             raise DecodeError("numbered pdu header length error")
-        (dsap, ssap, sequence) = struct.unpack_from('!BBB', data, offset)
+        (dsap, ssap, sequence) = _pdu_numbered_header.unpack_from(
+            data, offset)
         return (dsap >> 2, ssap & 63, sequence >> 4, sequence & 15)
 
     def encode_header(self):
@@ -196,7 +274,7 @@ class NumberedProtocolDataUnit(ProtocolDataUnit):
             raise EncodeError("pdu ns and nr field can not be < 0")
         if self.ns > 15 or self.nr > 15:
             raise EncodeError("pdu ns and nr field can not be > 15")
-        return data + struct.pack('!B', self.ns << 4 | self.nr)
+        return data + _pdu_sequence.pack(self.ns << 4 | self.nr)
 
     def __len__(self):
         return 3
@@ -404,7 +482,7 @@ class AggregatedFrame(ProtocolDataUnit):
         offset, size = offset + 2, size - 2
         while size > 0:
             try:
-                (pdu_size,) = struct.unpack_from('!H', data, offset)
+                (pdu_size,) = _agf_length.unpack_from(data, offset)
             except struct.error:
                 raise DecodeError("aggregated PDU length field error in AGF")
             agf_pdu.append(decode(data, offset+2, pdu_size))
@@ -412,12 +490,21 @@ class AggregatedFrame(ProtocolDataUnit):
         return agf_pdu
 
     def encode(self):
+        data = bytearray(len(self))
+        self.encode_into(data)
+        return bytes(data)
+
+    def encode_into(self, buffer, offset=0):
         if self.dsap != 0 or self.ssap != 0:
             raise EncodeError("SSAP and DSAP must be 0 in AGF PDU")
-        data = self.encode_header()
-        for encoded_pdu in [pdu.encode() for pdu in self._aggregate]:
-            data += struct.pack('!H', len(encoded_pdu)) + encoded_pdu
-        return data
+        start = offset
+        buffer[offset:offset+2] = self.encode_header()
+        offset += 2
+        for pdu in self._aggregate:
+            pdu_size = pdu.encode_into(buffer, offset+2)
+            _agf_length.pack_into(buffer, offset, pdu_size)
+            offset += 2 + pdu_size
+        return offset - start
 
     def append(self, pdu):
         self._aggregate.append(pdu)
@@ -470,11 +557,18 @@ class UnnumberedInformation(ProtocolDataUnit):
     @classmethod
     def decode(cls, data, offset, size):
         dsap, ssap = cls.decode_header(data, offset, size)
-        payload = bytes(data[offset+2:offset+size])
+        payload = memoryview(data)[offset+2:offset+size]
         return UnnumberedInformation(dsap, ssap, payload)
 
     def encode(self):
-        return self.encode_header() + bytes(self.data)
+        data = bytearray(len(self))
+        self.encode_into(data)
+        return bytes(data)
+
+    def encode_into(self, buffer, offset=0):
+        buffer[offset:offset+2] = self.encode_header()
+        buffer[offset+2:offset+2+len(self.data)] = self.data
+        return 2 + len(self.data)
 
     def __len__(self):
         return 2 + len(self.data)
@@ -817,11 +911,18 @@ class Information(NumberedProtocolDataUnit):
     @classmethod
     def decode(cls, data, offset, size):
         dsap, ssap, ns, nr = cls.decode_header(data, offset, size)
-        payload = bytes(data[offset+3:offset+size])
+        payload = memoryview(data)[offset+3:offset+size]
         return cls(dsap, ssap, ns, nr, payload)
 
     def encode(self):
-        return self.encode_header() + bytes(self.data)
+        data = bytearray(len(self))
+        self.encode_into(data)
+        return bytes(data)
+
+    def encode_into(self, buffer, offset=0):
+        buffer[offset:offset+3] = self.encode_header()
+        buffer[offset+3:offset+3+len(self.data)] = self.data
+        return 3 + len(self.data)
 
     def __len__(self):
         return 3 + len(self.data)
@@ -927,7 +1028,7 @@ def decode(data, offset=0, size=None):
     if size < 2:
         raise DecodeError("less than two header bytes can't make a valid pdu")
 
-    ptype = (struct.unpack_from('>H', data, offset)[0] >> 6) & 0b1111
+    ptype = (_pdu_sap_field.unpack_from(data, offset)[0] >> 6) & 0b1111
     pdu_type = pdu_type_map.get(ptype, UnknownProtocolDataUnit)
     return pdu_type.decode(data, offset, size)
 
@@ -937,3 +1038,10 @@ def encode(pdu):
         raise AttributeError("can't encode %s" % type(pdu))
 
     return pdu.encode()
+
+
+def encode_into(pdu, buffer, offset=0):
+    if not isinstance(pdu, ProtocolDataUnit):
+        raise AttributeError("can't encode %s" % type(pdu))
+
+    return pdu.encode_into(buffer, offset)
@@ -130,7 +130,8 @@ class CipherSuite1:
         # OpenSSLWrapper methods raise AssertionError when any of the
         # operations failed.
         try:
-            return self._encrypt(bytes(a), bytes(p), key, nonce, self._ccm_t)
+            p = memoryview(p).tobytes()
+            return self._encrypt(bytes(a), p, key, nonce, self._ccm_t)
         except AssertionError:
             error = "encrypt failed for message %d" % self._pcs
             log.error(error)
@@ -166,7 +167,8 @@ class CipherSuite1:
         # OpenSSLWrapper methods raise AssertionError when any of the
         # operations failed.
         try:
-            return self._decrypt(bytes(a), bytes(c), key, nonce, self._ccm_t)
+            c = memoryview(c).tobytes()
+            return self._decrypt(bytes(a), c, key, nonce, self._ccm_t)
         except AssertionError:
             error = "decrypt failed for message %d" % self._pcr
             log.error(error)
@@ -23,6 +23,7 @@ from . import pdu
 from . import err
 import nfc.llcp
 
+import time
 import errno
 import threading
 import collections
@@ -74,6 +75,7 @@ class TransmissionControlObject(object):
         self.send_buf = 1
         self.addr = None
         self.peer = None
+        self.send_notify = None
 
     @property
     def is_bound(self):
@@ -120,9 +122,29 @@ class TransmissionControlObject(object):
                     self.send_ready.wait(timeout)
                 return len(self.send_queue) < self.send_buf
 
+    def queue(self, send_pdu):
+        # Append an outbound PDU to the send queue and wake up the llc
+        # so that the PDU is collected for the next link turn. Used
+        # from application threads, the llc thread appends to the
+        # send queue directly.
+        with self.lock:
+            self.send_queue.append(send_pdu)
+        self.wakeup()
+
+    def wakeup(self):
+        # Tell the llc that this socket has something to send. The
+        # send_notify function is set when the socket is inserted
+        # into a service access point.
+        if self.send_notify is not None:
+            self.send_notify()
+
+    def pending(self):
+        # Return True if dequeue() would return a PDU.
+        return len(self.send_queue) > 0
+
     def send(self, send_pdu, flags):
         with self.send_ready:
-            self.send_queue.append(send_pdu)
+            self.queue(send_pdu)
             if not (flags & nfc.llcp.MSG_DONTWAIT):
                 self.send_ready.wait()
 
@@ -232,9 +254,14 @@ class RawAccessPoint(TransmissionControlObject):
         if self.state.SHUTDOWN:
             raise err.Error(errno.ESHUTDOWN)
         try:
-            return super(RawAccessPoint, self).recv()
+            rcvd_pdu = super(RawAccessPoint, self).recv()
         except IndexError:
             raise err.Error(errno.EPIPE)
+        # UI and I PDU data references the received frame, the
+        # application gets its own copy.
+        if isinstance(getattr(rcvd_pdu, 'data', None), memoryview):
+            rcvd_pdu.data = rcvd_pdu.data.tobytes()
+        return rcvd_pdu
 
     def close(self):
         super(RawAccessPoint, self).close()
@@ -307,7 +334,11 @@ class LogicalDataLink(TransmissionControlObject):
             rcvd_pdu = super(LogicalDataLink, self).recv()
         except IndexError:
             raise err.Error(errno.EPIPE)
-        return (rcvd_pdu.data, rcvd_pdu.ssap) if rcvd_pdu else (None, None)
+        if rcvd_pdu is None:
+            return (None, None)
+        # The pdu data references the received frame, the application
+        # gets its own copy.
+        return (memoryview(rcvd_pdu.data).tobytes(), rcvd_pdu.ssap)
 
     def close(self):
         super(LogicalDataLink, self).close()
@@ -350,6 +381,31 @@ class DataLinkConnection(TransmissionControlObject):
 
     DLC_PDU_NAMES = ("CONNECT", "DISC", "CC", "DM", "FRMR", "I", "RR", "RNR")
 
+    # Upper bound in seconds for holding back a voluntary ack when
+    # acknowledgements are delayed, and for an I PDU inter-arrival
+    # time to count as a link turnaround sample (not an idle gap).
+    ACK_DELAY_MAX = 0.1
+
+    class Counter(object):
+        def __init__(self):
+            self.start = time.time()
+            self.sent_count = self.sent_bytes = 0
+            self.rcvd_count = self.rcvd_bytes = 0
+
+        @property
+        def sent_rate(self):
+            return self.sent_bytes / max(time.time() - self.start, 1E-6)
+
+        @property
+        def rcvd_rate(self):
+            return self.rcvd_bytes / max(time.time() - self.start, 1E-6)
+
+        def __str__(self):
+            s = "sent {0} I PDU {1} byte {2:.0f} byte/s, "
+            s += "rcvd {3} I PDU {4} byte {5:.0f} byte/s"
+            return s.format(self.sent_count, self.sent_bytes, self.sent_rate,
+                            self.rcvd_count, self.rcvd_bytes, self.rcvd_rate)
+
     def __init__(self, recv_miu, recv_win):
         super(DataLinkConnection, self).__init__(128, recv_miu)
         self.state.CLOSED = True
@@ -364,6 +420,11 @@ class DataLinkConnection(TransmissionControlObject):
         self.send_win = None      # RW(Remote)
         self.send_cnt = 0         # V(S)
         self.send_ack = 0         # V(SA)
+        self.recv_ack_freq = 1    # confirmations per voluntary ack, 0=auto
+        self.recv_ack_time = 0    # when a delayed voluntary ack is due
+        self.recv_interval = None  # smoothed I PDU inter-arrival time
+        self.recv_time = None     # arrival time of the last I PDU
+        self.pcnt = DataLinkConnection.Counter()
 
     def __str__(self):
         s = "DLC {dlc.addr:2} <-> {dlc.peer:2} {dlc.state} "
@@ -389,6 +450,11 @@ class DataLinkConnection(TransmissionControlObject):
                 return
             if option == nfc.llcp.SO_RCVBSY:
                 self.mode.RECV_BUSY = bool(value)
+                self.wakeup()
+                return
+            if option == nfc.llcp.SO_RCVACK:
+                self.recv_ack_freq = max(0, min(int(value), 15))
+                self.wakeup()
                 return
             super(DataLinkConnection, self).setsockopt(option, value)
 
@@ -399,6 +465,10 @@ class DataLinkConnection(TransmissionControlObject):
             return self.mode.SEND_BUSY
         if option == nfc.llcp.SO_RCVBSY:
             return self.mode.RECV_BUSY
+        if option == nfc.llcp.SO_RCVACK:
+            return self.recv_ack_freq
+        if option == nfc.llcp.SO_COUNTERS:
+            return self.pcnt
         return super(DataLinkConnection, self).getsockopt(option)
 
     def listen(self, backlog):
@@ -426,6 +496,7 @@ class DataLinkConnection(TransmissionControlObject):
             self.recv_buf -= 1
             if rcvd_pdu.name == "CONNECT":
                 dlc = DataLinkConnection(self.recv_miu, self.recv_win)
+                dlc.recv_ack_freq = self.recv_ack_freq
                 dlc.addr = self.addr
                 dlc.peer = rcvd_pdu.ssap
                 dlc.send_miu = rcvd_pdu.miu
@@ -434,7 +505,7 @@ class DataLinkConnection(TransmissionControlObject):
                 send_pdu.miu, send_pdu.rw = dlc.recv_miu, dlc.recv_win
                 log.debug("accepting CONNECT from SAP %d" % dlc.peer)
                 dlc.state.ESTABLISHED = True
-                self.send_queue.append(send_pdu)
+                self.queue(send_pdu)
                 return dlc
             else:  # pragma: no cover
                 raise RuntimeError("CONNECT expected, not " + rcvd_pdu.name)
@@ -458,7 +529,7 @@ class DataLinkConnection(TransmissionControlObject):
                 raise TypeError("connect destination must be int or bytes")
 
             self.state.CONNECT = True
-            self.send_queue.append(send_pdu)
+            self.queue(send_pdu)
 
             try:
                 rcvd_pdu = super(DataLinkConnection, self).recv()
@@ -475,6 +546,7 @@ class DataLinkConnection(TransmissionControlObject):
                 self.recv_buf = self.recv_win
                 self.send_miu = rcvd_pdu.miu
                 self.send_win = rcvd_pdu.rw
+                self.pcnt = DataLinkConnection.Counter()
                 self.state.ESTABLISHED = True
                 return
             else:  # pragma: no cover
@@ -490,6 +562,25 @@ class DataLinkConnection(TransmissionControlObject):
         # RW(L) - V(R) + V(RA) mod 16
         return (self.recv_win - self.recv_cnt + self.recv_ack) % 16
 
+    @property
+    def recv_ack_threshold(self):
+        # Number of receive confirmations that make a voluntary ack
+        # due. Automatic mode acks at half the local receive window,
+        # so that the remote side can send on while the ack is under
+        # way.
+        if self.recv_ack_freq == 0:
+            return max(1, self.recv_win // 2)
+        return max(1, min(self.recv_ack_freq, self.recv_win))
+
+    @property
+    def recv_ack_delay(self):
+        # How long a voluntary ack may be held back below threshold.
+        # If no I PDU arrived within two inter-arrival times then the
+        # remote side is most likely waiting for the acknowledgement.
+        if self.recv_ack_threshold == 1 or self.recv_interval is None:
+            return 0.0
+        return min(2 * self.recv_interval, self.ACK_DELAY_MAX)
+
     def send(self, message, flags):
         with self.send_token:
             if not self.state.ESTABLISHED:
@@ -524,12 +615,15 @@ class DataLinkConnection(TransmissionControlObject):
                 return None
 
             if rcvd_pdu.name == "I":
+                if self.recv_confs == 0:
+                    self.recv_ack_time = time.time() + self.recv_ack_delay
                 self.recv_confs += 1
                 if self.recv_confs > self.recv_win:
                     self.err("recv_confs({0}) > recv_win({1})"
                              .format(self.recv_confs, self.recv_win))
                     raise RuntimeError("recv_confs > recv_win")
-                return rcvd_pdu.data
+                self.wakeup()
+                return memoryview(rcvd_pdu.data).tobytes()
 
             if rcvd_pdu.name == "DISC":
                 self.close()
@@ -570,7 +664,7 @@ class DataLinkConnection(TransmissionControlObject):
                 self.send_token.notify_all()
                 self.acks_ready.notify_all()
                 send_pdu = pdu.Disconnect(self.peer, self.addr)
-                self.send_queue.append(send_pdu)
+                self.queue(send_pdu)
                 try:
                     super(DataLinkConnection, self).recv()
                 except IndexError:
@@ -661,8 +755,24 @@ class DataLinkConnection(TransmissionControlObject):
             with self.lock:
                 # V(R) := V(R) + 1 mod 16
                 self.recv_cnt = (self.recv_cnt + 1) % 16
+                self.pcnt.rcvd_count += 1
+                self.pcnt.rcvd_bytes += len(rcvd_pdu.data)
+                self._update_recv_interval(time.time())
             super(DataLinkConnection, self).enqueue(rcvd_pdu)
 
+    def _update_recv_interval(self, now):
+        # Smooth the I PDU inter-arrival time like the TCP round trip
+        # time estimate (RFC 6298, alpha 1/8). Longer gaps are idle
+        # time between messages and not a link turnaround sample.
+        if self.recv_time is not None:
+            sample = now - self.recv_time
+            if sample < self.ACK_DELAY_MAX:
+                if self.recv_interval is None:
+                    self.recv_interval = sample
+                else:
+                    self.recv_interval += (sample - self.recv_interval) / 8
+        self.recv_time = now
+
     def dequeue(self, miu_size, icv_size):
         with self.lock:
             if self.state.ESTABLISHED:
@@ -687,6 +797,8 @@ class DataLinkConnection(TransmissionControlObject):
                         self.recv_ack = (self.recv_ack + self.recv_confs) % 16
                         self.recv_confs = 0
                     send_pdu.nr = self.recv_ack
+                    self.pcnt.sent_count += 1
+                    self.pcnt.sent_bytes += len(send_pdu.data)
                     self.send_ready.notify()
 
                 if send_pdu.name == "DM" and self.state.CLOSE_WAIT:
@@ -707,10 +819,23 @@ class DataLinkConnection(TransmissionControlObject):
 
             return send_pdu
 
+    def pending(self):
+        with self.lock:
+            if super(DataLinkConnection, self).pending():
+                return True
+            if self.state.ESTABLISHED:
+                if self.mode.RECV_BUSY_SENT != self.mode.RECV_BUSY:
+                    return True
+                return bool(self.recv_confs and self.recv_cnt != self.recv_ack)
+            return False
+
     def sendack(self):
         if self.state.ESTABLISHED:
             with self.lock:
                 if self.recv_confs and self.recv_cnt != self.recv_ack:
+                    if ((self.recv_confs < self.recv_ack_threshold and
+                         time.time() < self.recv_ack_time)):
+                        return None
                     self.log("voluntary ack " + str(self))
                     self.recv_ack = (self.recv_ack + self.recv_confs) % 16
                     self.recv_confs = 0
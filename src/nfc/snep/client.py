@@ -34,6 +34,10 @@ def send_request(socket, snep_request, send_miu):
     if len(snep_request) <= send_miu:
         return socket.send(snep_request)
 
+    # Fragments are sent as views of the request, the bytes are only
+    # copied when the information pdu is encoded.
+    snep_request = memoryview(snep_request)
+
     if not socket.send(snep_request[0:send_miu]):
         return False
 
@@ -43,6 +43,7 @@ class SnepServer(Thread):
         socket = nfc.llcp.Socket(llc, nfc.llcp.DATA_LINK_CONNECTION)
         recv_miu = socket.setsockopt(nfc.llcp.SO_RCVMIU, recv_miu)
         recv_buf = socket.setsockopt(nfc.llcp.SO_RCVBUF, recv_buf)
+        socket.setsockopt(nfc.llcp.SO_RCVACK, 0)
         socket.bind(service_name)
         log.info("snep server bound to port {0} (MIU={1}, RW={2}), "
                  "will accept up to {3} byte NDEF messages"
@@ -115,6 +116,7 @@ class SnepServer(Thread):
                 if len(snep_response) <= send_miu:
                     socket.send(snep_response)
                 else:
+                    snep_response = memoryview(snep_response)
                     socket.send(snep_response[0:send_miu])
                     if socket.recv() == b"\x10\x00\x00\x00\x00\x00":
                         parts = range(send_miu, len(snep_response), send_miu)
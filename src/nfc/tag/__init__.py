@@ -19,7 +19,11 @@
 # See the Licence for the specific language governing
 # permissions and limitations under the Licence.
 # -----------------------------------------------------------------------------
+import collections
+import copy
 import logging
+import threading
+import time
 import warnings
 from ndef import message_decoder, message_encoder
 
@@ -57,12 +61,26 @@ class Tag(object):
                     tag.ndef.records = [TextRecord("Hello World")]
 
         """
+        # Attributes that are saved to and restored from an NdefCache
+        # in addition to the NDEF message data.
+        _cache_attributes = ('_capacity', '_readable', '_writeable')
+
         def __init__(self, tag):
             self._tag = tag
             self._data = None
             self._capacity = 0
             self._readable = False
             self._writeable = False
+            self._fingerprint = None
+
+        def _read_fingerprint(self):
+            # Return a short byte sequence, read from the tag with
+            # very few commands, that changes whenever the NDEF data
+            # changes. The default None means that NDEF data of this
+            # tag type is not cached. Tag types that support it also
+            # set _fingerprint from the data that _read_ndef_data()
+            # has read, so storing a cache entry needs no commands.
+            return None
 
         def _read_ndef_data(self):
             msg = "_read_ndef_data is not implemented for this tag type"
@@ -235,6 +253,13 @@ class Tag(object):
                 raise ValueError("data length exceeds tag capacity")
             self._write_ndef_data(data)
             self._data = data
+            if self._tag.ndef_cache is not None:
+                self._tag.ndef_cache.discard(self._tag)
+
+    #: An :class:`NdefCache` that is used by all tags to avoid
+    #: reading unchanged NDEF data again, or :const:`None` (the
+    #: default) to always read the complete NDEF data from the tag.
+    ndef_cache = None
 
     def __init__(self, clf, target):
         self._clf, self._target = (clf, target)
@@ -273,10 +298,14 @@ class Tag(object):
     @property
     def ndef(self):
         """An :class:`NDEF` object if found, otherwise :const:`None`."""
+        if self._ndef is None and self.ndef_cache is not None:
+            self._ndef = self.ndef_cache.load(self)
         if self._ndef is None:
             ndef = self.NDEF(self)
             if ndef.has_changed:
                 self._ndef = ndef
+                if self.ndef_cache is not None:
+                    self.ndef_cache.store(self, ndef)
         return self._ndef
 
     @property
@@ -289,6 +318,14 @@ class Tag(object):
         """True if the tag was successfully authenticated."""
         return bool(self._authenticated)
 
+    def select(self):
+        """Make this tag the current target for data exchange. This is
+        only needed when more than one tag was activated from the
+        targets returned by :meth:`nfc.clf.ContactlessFrontend.sense_all`.
+
+        """
+        self._clf.select(self._target)
+
     def dump(self):
         """The dump() method returns a list of strings describing the memory
         structure of the tag, suitable for printing with join(). The
@@ -338,6 +375,8 @@ class Tag(object):
             status = self._format(version, wipe)
             if status is True:
                 self._ndef = None
+                if self.ndef_cache is not None:
+                    self.ndef_cache.discard(self)
             return status
         else:
             log.debug("this tag can not be formatted with nfcpy")
@@ -378,6 +417,8 @@ class Tag(object):
             status = self._protect(password, read_protect, protect_from)
             if status is True:
                 self._ndef = None
+                if self.ndef_cache is not None:
+                    self.ndef_cache.discard(self)
             return status
         else:
             log.error("this tag can not be protected with nfcpy")
@@ -407,6 +448,97 @@ class Tag(object):
             return None
 
 
+class NdefCache(object):
+    """A least recently used cache of NDEF data and management
+    information for tags that are seen repeatedly, for example badges
+    in an access control system. The cache is enabled for all tags by
+    assigning an instance to :attr:`Tag.ndef_cache`. ::
+
+        nfc.tag.Tag.ndef_cache = nfc.tag.NdefCache(maxsize=2000, ttl=3600)
+
+    Entries are keyed by tag product, identifier and authentication
+    status, and hold the NDEF message data together with the tag type
+    specific management information (like the capability container
+    and TLV layout). When a tag with a cached entry is read, only a
+    short fingerprint (for example the NDEF length field and the
+    first data bytes) is read from the tag and compared to the cached
+    one. The complete NDEF data is read only if the fingerprint
+    differs or the entry is older than *ttl* seconds. At most
+    *maxsize* entries are held, the least recently used are dropped.
+
+    Note that a tag that changes its NDEF data without changing the
+    fingerprint will present stale data until the entry expires, and
+    that :attr:`Tag.NDEF.has_changed` always reads the complete NDEF
+    data. Tag types that do not support a fingerprint are not cached.
+
+    """
+    def __init__(self, maxsize=256, ttl=300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _key(tag):
+        return (tag.product, tag.identifier, tag.is_authenticated)
+
+    def load(self, tag):
+        """Return a :class:`Tag.NDEF` instance for *tag* restored from a
+        cache entry, or :const:`None` if there is no valid entry.
+
+        """
+        key = self._key(tag)
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None or entry[0] < time.time():
+                return None
+            self._entries[key] = entry
+
+        expires, fingerprint, state, data = entry
+        ndef = tag.NDEF(tag)
+        for name, value in state.items():
+            setattr(ndef, name, copy.copy(value))
+        ndef._data = bytearray(data)
+        try:
+            if ndef._read_fingerprint() == fingerprint:
+                log.debug("restored ndef data from cache")
+                return ndef
+        except TagCommandError:
+            pass
+        self.discard(tag)
+
+    def store(self, tag, ndef):
+        """Save the state of *ndef* read from *tag*. Nothing is saved if
+        the tag type does not support a fingerprint.
+
+        """
+        fingerprint = ndef._fingerprint
+        if fingerprint is None:
+            return
+
+        state = dict((name, copy.copy(getattr(ndef, name)))
+                     for name in ndef._cache_attributes)
+        entry = (time.time() + self.ttl, fingerprint, state, bytes(ndef._data))
+        with self._lock:
+            self._entries.pop(self._key(tag), None)
+            self._entries[self._key(tag)] = entry
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, tag):
+        """Remove the cache entry for *tag* if there is one."""
+        with self._lock:
+            self._entries.pop(self._key(tag), None)
+
+    def clear(self):
+        """Remove all cache entries."""
+        with self._lock:
+            self._entries.clear()
+
+
 TIMEOUT_ERROR = 0
 RECEIVE_ERROR = -1
 PROTOCOL_ERROR = -2
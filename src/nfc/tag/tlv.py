@@ -0,0 +1,234 @@
+# -*- coding: latin-1 -*-
+# -----------------------------------------------------------------------------
+# Copyright 2009, 2017 Stephen Tiedemann <stephen.tiedemann@gmail.com>
+#
+# Licensed under the EUPL, Version 1.1 or - as soon they
+# will be approved by the European Commission - subsequent
+# versions of the EUPL (the "Licence");
+# You may not use this work except in compliance with the
+# Licence.
+# You may obtain a copy of the Licence at:
+#
+# https://joinup.ec.europa.eu/software/page/eupl
+#
+# Unless required by applicable law or agreed to in
+# writing, software distributed under the Licence is
+# distributed on an "AS IS" basis,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied.
+# See the Licence for the specific language governing
+# permissions and limitations under the Licence.
+# -----------------------------------------------------------------------------
+#
+# TLV block handling for the NFC Forum Type 1 and Type 2 Tag memory
+# layout. The memory argument of the functions below is a tag memory
+# reader (Type1TagMemoryReader or Type2TagMemoryReader) that reads
+# tag data on demand when indexed or sliced. Values are read with
+# slices over contiguous runs of memory, so that the memory reader
+# can use its multi-byte read commands, and only TLV values that are
+# actually needed are read at all.
+#
+from bisect import bisect_left, bisect_right
+from struct import unpack
+
+import logging
+log = logging.getLogger(__name__)
+
+
+class SkipRegions(object):
+    """A sorted list of non-overlapping byte address ranges that hold
+    lock bits or reserved memory and are not part of the data area.
+    Adjacent and overlapping ranges are merged when added.
+
+    """
+    def __init__(self, *ranges):
+        self._starts = []
+        self._stops = []
+        for start, stop in ranges:
+            self.add(start, stop)
+
+    def __copy__(self):
+        return SkipRegions(*zip(self._starts, self._stops))
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return "SkipRegions({0})".format(
+            ", ".join("({0}, {1})".format(*r) for r in self))
+
+    def __iter__(self):
+        return iter(zip(self._starts, self._stops))
+
+    def __len__(self):
+        return sum(stop - start for start, stop in self)
+
+    def __contains__(self, index):
+        i = bisect_right(self._starts, index) - 1
+        return i >= 0 and index < self._stops[i]
+
+    def add(self, start, stop):
+        """Add the byte address range from *start* to *stop*."""
+        if start < stop:
+            i = bisect_left(self._stops, start)
+            j = bisect_right(self._starts, stop)
+            if i < j:
+                start = min(start, self._starts[i])
+                stop = max(stop, self._stops[j-1])
+            self._starts[i:j] = [start]
+            self._stops[i:j] = [stop]
+
+    def next_free(self, index):
+        """Return the first address at or after *index* that is not
+        within a skip region.
+
+        """
+        i = bisect_right(self._starts, index) - 1
+        return self._stops[i] if i >= 0 and index < self._stops[i] else index
+
+    def count(self, start, stop):
+        """Return the number of skip bytes from *start* to *stop*."""
+        i = max(bisect_right(self._starts, start) - 1, 0)
+        j = bisect_left(self._starts, stop)
+        return sum(max(0, min(stop, b) - max(start, a))
+                   for a, b in zip(self._starts[i:j], self._stops[i:j]))
+
+    def spans(self, index, length):
+        """Yield (start, stop) address ranges that together hold *length*
+        data bytes beginning at *index* and jumping over skip regions.
+
+        """
+        index = self.next_free(index)
+        i = bisect_right(self._starts, index)
+        while length > 0:
+            stop = index + length
+            if i < len(self._starts) and self._starts[i] < stop:
+                stop = self._starts[i]
+            yield (index, stop)
+            length -= stop - index
+            if length > 0:
+                index = self._stops[i]
+                i += 1
+
+    def advance(self, index, length):
+        """Return the address that follows *length* data bytes beginning
+        at *index*, jumping over skip regions.
+
+        """
+        stop = index
+        for _, stop in self.spans(index, length):
+            pass
+        return stop
+
+
+def read_tlv_header(memory, offset):
+    # Unpack the type and length field of the TLV at *offset* and
+    # return type, length and value offset. For the NULL and the
+    # Terminator TLV there is no length field, this is returned as
+    # length -1. The length field can be one or three bytes, if the
+    # first byte is 255 then the next two byte carry the length (big
+    # endian).
+    tlv_t = memory[offset]
+    if tlv_t in (0x00, 0xFE):
+        return (tlv_t, -1, offset + 1)
+    tlv_l = memory[offset+1]
+    if tlv_l == 0xFF:
+        return (tlv_t, unpack(">H", memory[offset+2:offset+4])[0], offset + 4)
+    return (tlv_t, tlv_l, offset + 2)
+
+
+def read_tlv_value(memory, offset, length, skip_bytes):
+    # Return *length* value bytes starting at *offset*, jumping over
+    # the lock and reserved bytes in *skip_bytes*.
+    tlv_v = bytearray(length)
+    index = 0
+    for start, stop in skip_bytes.spans(offset, length):
+        tlv_v[index:index+stop-start] = memory[start:stop]
+        index += stop - start
+    return tlv_v
+
+
+def read_tlv(memory, offset, skip_bytes):
+    # Unpack a TLV from tag memory and return tag type, tag length and
+    # tag value. The tag value is None for the NULL and Terminator
+    # TLV, which are returned with length -1.
+    tlv_t, tlv_l, offset = read_tlv_header(memory, offset)
+    if tlv_l < 0:
+        return (tlv_t, tlv_l, None)
+    return (tlv_t, tlv_l, read_tlv_value(memory, offset, tlv_l, skip_bytes))
+
+
+def get_lock_byte_range(data):
+    # Extract the lock byte range indicated by a Lock Control TLV. The
+    # data argument is the TLV value field.
+    page_addr = data[0] >> 4
+    byte_offs = data[0] & 0x0F
+    rsvd_size = ((data[1] if data[1] > 0 else 256) + 7) // 8
+    page_size = 2 ** (data[2] & 0x0F)
+    rsvd_from = page_addr * page_size + byte_offs
+    return slice(rsvd_from, rsvd_from + rsvd_size)
+
+
+def get_rsvd_byte_range(data):
+    # Extract the reserved memory range indicated by a Memory Control
+    # TLV. The data argument is the TLV value field.
+    page_addr = data[0] >> 4
+    byte_offs = data[0] & 0x0F
+    rsvd_size = data[1] if data[1] > 0 else 256
+    page_size = 2 ** (data[2] & 0x0F)
+    rsvd_from = page_addr * page_size + byte_offs
+    return slice(rsvd_from, rsvd_from + rsvd_size)
+
+
+def find_ndef_tlv(memory, offset, stop, skip_bytes):
+    # Walk the TLV blocks from *offset* until *stop* and return the
+    # offset, type, length and value offset of the first NDEF Message
+    # or Terminator TLV, or (offset, None, None, None) if neither was
+    # found before *stop*. Lock and Memory Control TLV areas are
+    # added to *skip_bytes*, the values of all other TLVs are not
+    # read from memory.
+    while True:
+        offset = skip_bytes.next_free(offset)
+        if offset >= stop:
+            return (offset, None, None, None)
+
+        tlv_t, tlv_l, value_offset = read_tlv_header(memory, offset)
+        log.debug("tlv type {0} length {1} at offset {2}".format(
+            tlv_t, tlv_l, offset))
+
+        if tlv_t in (0x03, 0xFE):
+            return (offset, tlv_t, tlv_l, value_offset)
+
+        if tlv_t in (0x01, 0x02):
+            if tlv_l == 3:
+                tlv_v = read_tlv_value(memory, value_offset, 3, skip_bytes)
+                if tlv_t == 0x01:
+                    rsvd_bytes = get_lock_byte_range(tlv_v)
+                else:
+                    rsvd_bytes = get_rsvd_byte_range(tlv_v)
+                skip_bytes.add(rsvd_bytes.start, rsvd_bytes.stop)
+            else:
+                log.debug("control tlv {0} has wrong length".format(tlv_t))
+        elif tlv_t != 0x00:
+            log.debug("unknown tlv {0} at offset {1}".format(tlv_t, offset))
+
+        offset = skip_bytes.advance(value_offset, max(tlv_l, 0))
+
+
+def get_capacity(offset, stop, skip_bytes):
+    # The net capacity is the range of bytes from the current offset
+    # until the end of user data bytes, reduced by the number of skip
+    # bytes (from memory and lock control TLVs) that are within the
+    # usable memory range, and adjusted by the required number of TLV
+    # length bytes (1 or 3) and the TLV tag byte.
+    log.debug("subtract {0} skip bytes from capacity".format(
+        skip_bytes.count(offset, stop)))
+    capacity = max(stop - offset, 0) - skip_bytes.count(offset, stop)
+    # To store more than 254 byte ndef we must use three length bytes,
+    # otherwise it's only one. But only if the capacity is more than
+    # 256 the three length byte format will provide a higher value.
+    capacity -= 4 if capacity > 256 else 2
+    return capacity
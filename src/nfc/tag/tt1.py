@@ -23,9 +23,10 @@
 # -----------------------------------------------------------------------------
 import time
 from binascii import hexlify
-from struct import pack, unpack
+from struct import pack
 
 from . import Tag, TagCommandError
+from .tlv import SkipRegions, find_ndef_tlv, read_tlv_value, get_capacity
 import nfc.clf
 
 import logging
@@ -52,72 +53,6 @@ class Type1TagCommandError(TagCommandError):
     }
 
 
-def read_tlv(memory, offset, skip_bytes):
-    # Unpack a TLV from tag memory and return tag type, tag length and
-    # tag value. For tag type 0 there is no length field, this is
-    # returned as length -1. The tlv length field can be one or three
-    # bytes, if the first byte is 255 then the next two byte carry the
-    # length (big endian).
-    try:
-        tlv_t, offset = (memory[offset], offset+1)
-    except Type1TagCommandError:
-        return (None, None, None)
-
-    if tlv_t in (0x00, 0xFE):
-        return (tlv_t, -1, None)
-
-    tlv_l, offset = (memory[offset], offset+1)
-
-    if tlv_l == 0xFF:
-        tlv_l, offset = (unpack(">H", memory[offset:offset+2])[0], offset+2)
-
-    tlv_v = bytearray(tlv_l)
-    for i in range(tlv_l):
-        while (offset + i) in skip_bytes:
-            offset += 1
-        tlv_v[i] = memory[offset+i]
-
-    return (tlv_t, tlv_l, tlv_v)
-
-
-def get_lock_byte_range(data):
-    # Extract the lock byte range indicated by a Lock Control TLV. The
-    # data argument is the TLV value field.
-    page_addr = data[0] >> 4
-    byte_offs = data[0] & 0x0F
-    rsvd_size = ((data[1] if data[1] > 0 else 256) + 7) // 8
-    page_size = 2 ** (data[2] & 0x0F)
-    rsvd_from = page_addr * page_size + byte_offs
-    return slice(rsvd_from, rsvd_from + rsvd_size)
-
-
-def get_rsvd_byte_range(data):
-    # Extract the reserved memory range indicated by a Memory Control
-    # TLV. The data argument is the TLV value field.
-    page_addr = data[0] >> 4
-    byte_offs = data[0] & 0x0F
-    rsvd_size = data[1] if data[1] > 0 else 256
-    page_size = 2 ** (data[2] & 0x0F)
-    rsvd_from = page_addr * page_size + byte_offs
-    return slice(rsvd_from, rsvd_from + rsvd_size)
-
-
-def get_capacity(tag_memory_size, offset, skip_bytes):
-    # The net capacity is the range of bytes from the current offset
-    # until the end of user data bytes (given by the capability
-    # container capacity value plus 16 header bytes), reduced by the
-    # number of skip bytes (from memory and lock control TLVs) that
-    # are within the usable memory range, and adjusted by the required
-    # number of TLV length bytes (1 or 3) and the TLV tag byte.
-    log.debug("subtract {0} skip bytes from capacity".format(len(skip_bytes)))
-    capacity = len(set(range(offset, tag_memory_size)) - skip_bytes)
-    # To store more than 254 byte ndef we must use three length bytes,
-    # otherwise it's only one. But only if the capacity is more than
-    # 256 the three length byte format will provide a higher value.
-    capacity -= 4 if capacity > 256 else 2
-    return capacity
-
-
 class Type1Tag(Tag):
     """Implementation of the NFC Forum Type 1 Tag Operation specification.
 
@@ -137,6 +72,20 @@ class Type1Tag(Tag):
             super(Type1Tag.NDEF, self).__init__(tag)
             self._ndef_tlv_offset = 0
 
+        _cache_attributes = Tag.NDEF._cache_attributes + (
+            '_ndef_tlv_offset', '_skip_bytes')
+
+        def _read_fingerprint(self):
+            # The new memory reader is also used for writing.
+            self._tag_memory = Type1TagMemoryReader(self.tag)
+            return self._memory_fingerprint(self._tag_memory)
+
+        def _memory_fingerprint(self, tag_memory):
+            # The header ROM and static memory returned by RALL hold
+            # the capability container and the NDEF message TLV length.
+            static_memory = tag_memory._data_from_tag[0:120]
+            return bytes(tag_memory._header_rom + static_memory)
+
         def _read_ndef_data(self):
             # Check and read ndef data from tag. Return None if the
             # tag is not ndef formatted, i.e. it can not hold ndef
@@ -169,40 +118,24 @@ class Type1Tag(Tag):
                 return None
 
             ndef = None
-            offset = 12
             skip_end = 120 if tag_memory_size == 120 else 128
-            skip_bytes = set(range(104, skip_end))
-            while offset < tag_memory_size:
-                if offset in skip_bytes:
-                    offset += 1
-                    continue
-
-                tlv_t, tlv_l, tlv_v = read_tlv(tag_memory, offset, skip_bytes)
-                log.debug("tlv type {0} at address {1}".format(tlv_t, offset))
-
-                if tlv_t == 0x00:
-                    pass
-                elif tlv_t == 0x01:
-                    lock_bytes = get_lock_byte_range(tlv_v)
-                    skip_bytes.update(range(*lock_bytes.indices(0x800)))
-                elif tlv_t == 0x02:
-                    rsvd_bytes = get_rsvd_byte_range(tlv_v)
-                    skip_bytes.update(range(*rsvd_bytes.indices(0x800)))
-                elif tlv_t == 0x03:
-                    ndef = tlv_v
-                    break
-                elif tlv_t == 0xFE or tlv_t is None:
-                    break
-                else:
-                    logmsg = "unknown tlv {0} at offset {0}"
-                    log.debug(logmsg.format(tlv_t, offset))
-
-                offset += tlv_l + 1 + (1 if tlv_l < 255 else 3)
-
-            self._capacity = get_capacity(tag_memory_size, offset, skip_bytes)
+            skip_bytes = SkipRegions((104, skip_end))
+            try:
+                offset, tlv_t, tlv_l, value_offset = find_ndef_tlv(
+                    tag_memory, 12, tag_memory_size, skip_bytes)
+                if tlv_t == 0x03:
+                    ndef = read_tlv_value(
+                        tag_memory, value_offset, tlv_l, skip_bytes)
+            except Type1TagCommandError:
+                log.debug("tlv area was unreadable")
+                return None
+
+            self._capacity = get_capacity(offset, tag_memory_size, skip_bytes)
             self._ndef_tlv_offset = offset
             self._tag_memory = tag_memory
             self._skip_bytes = skip_bytes
+            if ndef is not None:
+                self._fingerprint = self._memory_fingerprint(tag_memory)
             return ndef
 
         def _write_ndef_data(self, data):
@@ -222,18 +155,15 @@ class Type1Tag(Tag):
             # ndef data into the memory image, but jump over skip
             # bytes.
             offset += 2 if len(data) < 255 else 4
-            for i in range(len(data)):
-                while offset + i in skip_bytes:
-                    offset += 1
-                tag_memory[offset+i] = data[i]
+            index = 0
+            for start, stop in skip_bytes.spans(offset, len(data)):
+                tag_memory[start:stop] = data[index:index+stop-start]
+                index += stop - start
             # Write a terminator tlv if space permits. We may have to
             # skip reserved and lock bytes.
-            offset = offset + i + 1
-            while offset < tag_memory_size:
-                if offset not in skip_bytes:
-                    tag_memory[offset] = 0xFE
-                    break
-                offset += 1
+            offset = skip_bytes.next_free(skip_bytes.advance(offset, index))
+            if offset < tag_memory_size:
+                tag_memory[offset] = 0xFE
             # Write the new message data to the tag.
             tag_memory.synchronize()
 
@@ -381,14 +311,14 @@ class Type1Tag(Tag):
         """Returns the 2 byte Header ROM and 4 byte UID.
         """
         log.debug("read identification")
-        cmd = "\x78\x00\x00\x00\x00\x00\x00"
+        cmd = bytearray(b"\x78\x00\x00\x00\x00\x00\x00")
         return self.transceive(cmd)
 
     def read_all(self):
         """Returns the 2 byte Header ROM and all 120 byte static memory.
         """
         log.debug("read all static memory")
-        cmd = "\x00\x00\x00" + self.uid
+        cmd = bytearray(b"\x00\x00\x00") + self.uid
         return self.transceive(cmd)
 
     def read_byte(self, addr):
@@ -397,7 +327,7 @@ class Type1Tag(Tag):
         if addr < 0 or addr > 127:
             raise ValueError("invalid byte address")
         log.debug("read byte at address {0} ({0:02X}h)".format(addr))
-        cmd = "\x01" + chr(addr) + "\x00" + self.uid
+        cmd = bytearray([0x01, addr, 0x00]) + self.uid
         return self.transceive(cmd)[-1]
 
     def read_block(self, block):
@@ -406,7 +336,7 @@ class Type1Tag(Tag):
         if block < 0 or block > 255:
             raise ValueError("invalid block number")
         log.debug("read block {0}".format(block))
-        cmd = "\x02" + chr(block) + 8 * chr(0) + self.uid
+        cmd = bytearray([0x02, block]) + bytearray(8) + self.uid
         return self.transceive(cmd)[1:9]
 
     def read_segment(self, segment):
@@ -415,7 +345,7 @@ class Type1Tag(Tag):
         log.debug("read segment {0}".format(segment))
         if segment < 0 or segment > 15:
             raise ValueError("invalid segment number")
-        cmd = "\x10" + chr(segment << 4) + 8 * chr(0) + self.uid
+        cmd = bytearray([0x10, segment << 4]) + bytearray(8) + self.uid
         rsp = self.transceive(cmd)
         if len(rsp) < 129:
             raise Type1TagCommandError(RESPONSE_ERROR)
@@ -429,8 +359,8 @@ class Type1Tag(Tag):
         if addr < 0 or addr >= 128:
             raise ValueError("invalid byte address")
         log.debug("write byte at address {0} ({0:02X}h)".format(addr))
-        cmd = "\x53" if erase is True else "\x1A"
-        cmd = cmd + chr(addr) + chr(data) + self.uid
+        cmd = bytearray([0x53 if erase is True else 0x1A, addr, data])
+        cmd = cmd + self.uid
         return self.transceive(cmd)
 
     def write_block(self, block, data, erase=True):
@@ -441,8 +371,8 @@ class Type1Tag(Tag):
         if block < 0 or block > 255:
             raise ValueError("invalid block number")
         log.debug("write block {0}".format(block))
-        cmd = "\x54" if erase is True else "\x1B"
-        cmd = cmd + chr(block) + data + self.uid
+        cmd = bytearray([0x54 if erase is True else 0x1B, block])
+        cmd = cmd + data + self.uid
         rsp = self.transceive(cmd)
         if len(rsp) < 9:
             raise Type1TagCommandError(RESPONSE_ERROR)
@@ -479,6 +409,7 @@ class Type1TagMemoryReader(object):
         assert isinstance(tag, Type1Tag)
         self._data_from_tag = bytearray()
         self._data_in_cache = bytearray()
+        self._dirty_blocks = set()
         self._tag = tag
         self._header_rom = bytearray(0)
         # read header_rom and static memory
@@ -504,6 +435,11 @@ class Type1TagMemoryReader(object):
                 raise ValueError(msg.format(cls=self.__class__.__name__))
         self._data_in_cache[key] = value
         del self._data_in_cache[len(self):]
+        if isinstance(key, slice):
+            indices = range(*key.indices(len(self)))
+        else:
+            indices = (key if key >= 0 else key + len(self),)
+        self._dirty_blocks.update(index >> 3 for index in indices)
 
     def __delitem__(self, key):
         msg = "{cls} object does not support item deletion"
@@ -527,19 +463,31 @@ class Type1TagMemoryReader(object):
             self._data_in_cache.extend(data)
 
     def _write_to_tag(self, stop):
+        # Only blocks touched since the last synchronization are
+        # compared and written. A write that only sets bits does not
+        # need the erase cycle and uses WRITE-NE(8) instead of
+        # WRITE-E(8), which is roughly half the programming time.
         hr0 = self._header_rom[0]
-        if hr0 >> 4 == 1 and hr0 & 0x0F != 1:
-            for i in range(0, stop, 8):
-                data = self._data_in_cache[i:i+8]
-                if data != self._data_from_tag[i:i+8]:
-                    self._tag.write_block(i//8, data)
-                    self._data_from_tag[i:i+8] = data
-        else:
-            for i in range(0, stop):
-                data = self._data_in_cache[i]
-                if data != self._data_from_tag[i]:
-                    self._tag.write_byte(i, data)
-                    self._data_from_tag[i] = data
+        block_write = bool(hr0 >> 4 == 1 and hr0 & 0x0F != 1)
+        for block in sorted(self._dirty_blocks):
+            index = block << 3
+            if index >= stop:
+                continue
+            if block_write:
+                data = self._data_in_cache[index:index+8]
+                old_data = self._data_from_tag[index:index+8]
+                if data != old_data:
+                    erase = any(o & ~n for o, n in zip(old_data, data))
+                    self._tag.write_block(block, data, erase)
+                    self._data_from_tag[index:index+8] = data
+            else:
+                for i in range(index, min(index+8, stop)):
+                    data = self._data_in_cache[i]
+                    if data != self._data_from_tag[i]:
+                        erase = bool(self._data_from_tag[i] & ~data)
+                        self._tag.write_byte(i, data, erase)
+                        self._data_from_tag[i] = data
+            self._dirty_blocks.discard(block)
 
     def synchronize(self):
         """Write pages that contain modified data back to tag memory."""
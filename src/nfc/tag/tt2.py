@@ -21,10 +21,12 @@
 # -----------------------------------------------------------------------------
 import time
 from binascii import hexlify
-from struct import pack, unpack
+from struct import pack
 from typing import Union
 
 from . import Tag, TagCommandError
+from .tlv import SkipRegions, find_ndef_tlv, get_capacity
+from .tlv import read_tlv_header, read_tlv_value
 import nfc.clf
 
 import logging
@@ -67,63 +69,6 @@ class Type2TagCommandError(TagCommandError):
     }
 
 
-def read_tlv(memory, offset, skip_bytes):
-    # Unpack a Type 2 Tag TLV from tag memory and return tag type, tag
-    # length and tag value. For tag type 0 there is no length field,
-    # this is returned as length -1. The tlv length field can be one
-    # or three bytes, if the first byte is 255 then the next two byte
-    # carry the length (big endian).
-    tlv_t, offset = (memory[offset], offset+1)
-    if tlv_t in (0x00, 0xFE):
-        return (tlv_t, -1, None)
-    tlv_l, offset = (memory[offset], offset+1)
-    if tlv_l == 0xFF:
-        tlv_l, offset = (unpack(">H", memory[offset:offset+2])[0], offset+2)
-    tlv_v = bytearray(tlv_l)
-    for i in range(tlv_l):
-        while (offset + i) in skip_bytes:
-            offset += 1
-        tlv_v[i] = memory[offset+i]
-    return (tlv_t, tlv_l, tlv_v)
-
-
-def get_lock_byte_range(data):
-    # Extract the lock byte range indicated by a Lock Control TLV. The
-    # data argument is the TLV value field.
-    page_addr = data[0] >> 4
-    byte_offs = data[0] & 0x0F
-    rsvd_size = ((data[1] if data[1] > 0 else 256) + 7) // 8
-    page_size = 2 ** (data[2] & 0x0F)
-    rsvd_from = page_addr * page_size + byte_offs
-    return slice(rsvd_from, rsvd_from + rsvd_size)
-
-
-def get_rsvd_byte_range(data):
-    # Extract the reserved memory range indicated by a Memory Control
-    # TLV. The data argument is the TLV value field.
-    page_addr = data[0] >> 4
-    byte_offs = data[0] & 0x0F
-    rsvd_size = data[1] if data[1] > 0 else 256
-    page_size = 2 ** (data[2] & 0x0F)
-    rsvd_from = page_addr * page_size + byte_offs
-    return slice(rsvd_from, rsvd_from + rsvd_size)
-
-
-def get_capacity(capacity, offset, skip_bytes):
-    # The net capacity is the range of bytes from the current offset
-    # until the end of user data bytes (given by the capability
-    # container capacity value plus 16 header bytes), reduced by the
-    # number of skip bytes (from memory and lock control TLVs) that
-    # are within the usable memory range, and adjusted by the required
-    # number of TLV length bytes (1 or 3) and the TLV tag byte.
-    capacity = len(set(range(offset, capacity + 16)) - skip_bytes)
-    # To store more than 254 byte ndef we must use three length bytes,
-    # otherwise it's only one. But only if the capacity is more than
-    # 256 the three length byte format will provide a higher value.
-    capacity -= 4 if capacity > 256 else 2
-    return capacity
-
-
 class Type2Tag(Tag):
     """Implementation of the NFC Forum Type 2 Tag Operation specification.
 
@@ -143,6 +88,24 @@ class Type2Tag(Tag):
             super(Type2Tag.NDEF, self).__init__(tag)
             self._ndef_tlv_offset = 0
 
+        _cache_attributes = Tag.NDEF._cache_attributes + (
+            '_ndef_tlv_offset', '_skip_bytes')
+
+        def _read_fingerprint(self):
+            # Memory is read in 16 byte units so that is normally one
+            # or two READ commands. The new memory reader is also used
+            # for writing.
+            self._tag_memory = Type2TagMemoryReader(self.tag)
+            return self._memory_fingerprint(self._tag_memory)
+
+        def _memory_fingerprint(self, tag_memory):
+            # The capability container and the memory up to the end
+            # of the NDEF message TLV length field, but at least the
+            # first 32 bytes.
+            offset = self._ndef_tlv_offset
+            stop = offset + (4 if tag_memory[offset+1] == 0xFF else 2)
+            return bytes(tag_memory[0:max(32, stop)])
+
         def _read_capability_data(self, tag_memory: 'Type2TagMemoryReader'):
             try:
                 if tag_memory[12] != 0xE1:  # refer NFC Forum, Type 2 Tag Operation Specification, s6.4.1
@@ -168,52 +131,24 @@ class Type2Tag(Tag):
             raw_capacity = tag_memory[14] * 8
             log.debug("raw capacity is {0} byte".format(raw_capacity))
 
-            offset = 16
             ndef = None
-            skip_bytes = set()
-            data_area_size = raw_capacity
-            while offset < data_area_size + 16:
-                while (offset) in skip_bytes:
-                    offset += 1
-
-                try:
-                    tlv = read_tlv(tag_memory, offset, skip_bytes)
-                    tlv_t, tlv_l, tlv_v = tlv
-                except Type2TagCommandError:
-                    return None
-                else:
-                    logmsg = "tlv type {0} length {1} at offset {2}"
-                    log.debug(logmsg.format(tlv_t, tlv_l, offset))
-
-                if tlv_t == 0:
-                    pass
-                elif tlv_t == 1:
-                    if tlv_l == 3:
-                        lock_bytes = get_lock_byte_range(tlv_v)
-                        skip_bytes.update(range(*lock_bytes.indices(0x100000)))
-                    else:
-                        log.debug("lock tlv has wrong length")
-                elif tlv_t == 2:
-                    if tlv_l == 3:
-                        rsvd_bytes = get_rsvd_byte_range(tlv_v)
-                        skip_bytes.update(range(*rsvd_bytes.indices(0x100000)))
-                    else:
-                        log.debug("memory tlv has wrong length")
-                elif tlv_t == 3:
-                    ndef = tlv_v
-                    break
-                elif tlv_t == 254:
-                    break
-                else:
-                    logmsg = "unknown tlv {0} at offset {0}"
-                    log.debug(logmsg.format(tlv_t, offset))
-
-                offset += tlv_l + 1 + (1 if tlv_l < 255 else 3)
+            skip_bytes = SkipRegions()
+            try:
+                offset, tlv_t, tlv_l, value_offset = find_ndef_tlv(
+                    tag_memory, 16, raw_capacity + 16, skip_bytes)
+                if tlv_t == 0x03:
+                    ndef = read_tlv_value(
+                        tag_memory, value_offset, tlv_l, skip_bytes)
+            except Type2TagCommandError:
+                return None
 
-            self._capacity = get_capacity(raw_capacity, offset, skip_bytes)
+            self._capacity = get_capacity(
+                offset, raw_capacity + 16, skip_bytes)
             self._ndef_tlv_offset = offset
             self._tag_memory = tag_memory
             self._skip_bytes = skip_bytes
+            if ndef is not None:
+                self._fingerprint = self._memory_fingerprint(tag_memory)
             return ndef
 
         def _write_ndef_data(self, data):
@@ -245,13 +180,11 @@ class Type2Tag(Tag):
             # ndef data into the memory image, but jump over skip
             # bytes. If space permits, write a terminator tlv.
             offset += 2 if len(data) < 255 else 4
-            for index, octet in enumerate(data):
-                while offset + index in skip_bytes:
-                    offset += 1
-                tag_memory[offset+index] = octet
-            offset = offset + index + 1
-            while offset in skip_bytes:
-                offset += 1
+            index = 0
+            for start, stop in skip_bytes.spans(offset, len(data)):
+                tag_memory[start:stop] = data[index:index+stop-start]
+                index += stop - start
+            offset = skip_bytes.next_free(skip_bytes.advance(offset, index))
             if offset < tag_memory[14] * 8 + 16:
                 tag_memory[offset] = 0xFE
             tag_memory.synchronize()
@@ -427,11 +360,12 @@ class Type2Tag(Tag):
         lock_control = []
         data_area_size = tag_memory[14] * 8
         while offset < data_area_size + 16:  # pragma: no branch
-            tlv_t, tlv_l, tlv_v = read_tlv(tag_memory, offset, set())
+            tlv_t, tlv_l, value_offset = read_tlv_header(tag_memory, offset)
             log.debug("tlv type {0} at offset {1}".format(tlv_t, offset))
-            if tlv_t in (0x03, 0xFE, None):
+            if tlv_t in (0x03, 0xFE):
                 break
             if tlv_t == 0x01:
+                tlv_v = tag_memory[value_offset:value_offset+3]
                 log.debug("lock control tlv {0}".format(hexlify(tlv_v)))
                 page_addr = tlv_v[0] >> 4
                 byte_offs = tlv_v[0] & 0x0F
@@ -439,7 +373,7 @@ class Type2Tag(Tag):
                 lock_byte_addr = page_addr * page_size + byte_offs
                 lock_bits_size = tlv_v[1] if tlv_v[1] > 0 else 256
                 lock_control.append((lock_byte_addr, lock_bits_size))
-            offset += tlv_l + 1 + (1 if tlv_l < 255 else 3)
+            offset = value_offset + max(tlv_l, 0)
 
         # If the tag has a dynamic memory layout and we did not find
         # any lock control tlv, then add default dynamic lock bits.
@@ -522,6 +456,14 @@ class Type2Tag(Tag):
 
         return True
 
+    def _read_pages(self, page):
+        # Return tag memory data starting at *page* for the memory
+        # reader. A plain Type 2 Tag uses the READ command and returns
+        # 16 bytes, subclasses may return more data if the tag
+        # supports a multi-page read command. The amount of data
+        # returned must always be a multiple of 16 byte.
+        return self.read(page)
+
     def sector_select(self, sector):
         """Send a SECTOR_SELECT command to switch the 1K address sector.
 
@@ -632,6 +574,7 @@ class Type2TagMemoryReader(object):
         assert isinstance(tag, Type2Tag)
         self._data_from_tag = bytearray()
         self._data_in_cache = bytearray()
+        self._dirty_pages = set()
         self._tag = tag
 
     def __len__(self):
@@ -654,6 +597,11 @@ class Type2TagMemoryReader(object):
                 raise ValueError(msg.format(cls=self.__class__.__name__))
         self._data_in_cache[key] = value
         del self._data_in_cache[len(self):]
+        if isinstance(key, slice):
+            indices = range(*key.indices(len(self)))
+        else:
+            indices = (key if key >= 0 else key + len(self),)
+        self._dirty_pages.update(index >> 2 for index in indices)
 
     def __delitem__(self, key):
         msg = "{cls} object does not support item deletion"
@@ -663,20 +611,28 @@ class Type2TagMemoryReader(object):
         index = (len(self) >> 4) << 4
         while index < stop:
             self._tag.sector_select(index >> 10)
-            data = self._tag.read(index >> 2)
+            data = self._tag._read_pages(index >> 2)
             self._data_from_tag[index:] = data
             self._data_in_cache[index:] = data
-            index += 16
+            index += len(data)
 
     def _write_to_tag(self, stop):
-        index = 0
-        while index < stop:
+        # Only pages marked dirty by __setitem__ are compared and, if
+        # modified, written. Pages in the currently selected sector
+        # are written first and all other pages ordered by sector, so
+        # that each sector needs to be selected only once.
+        current_sector = self._tag._current_sector
+        for page in sorted(self._dirty_pages, key=lambda page: (
+                page >> 8 != current_sector, page)):
+            index = page << 2
+            if index >= stop:
+                continue
             data = self._data_in_cache[index:index+4]
             if data != self._data_from_tag[index:index+4]:
-                self._tag.sector_select(index >> 10)
-                self._tag.write(index >> 2, data)
+                self._tag.sector_select(page >> 8)
+                self._tag.write(page, data)
                 self._data_from_tag[index:index+4] = data
-            index += 4
+            self._dirty_pages.discard(page)
 
     def synchronize(self):
         """Write pages that contain modified data back to tag memory."""
@@ -326,6 +326,10 @@ class NTAG21x(tt2.Type2Tag):
                 return True
             return False
 
+    def __init__(self, clf, target):
+        super(NTAG21x, self).__init__(clf, target)
+        self._fast_read = True
+
     @property
     def signature(self):
         """The 32-byte ECC tag signature programmed at chip production. The
@@ -474,6 +478,66 @@ class NTAG21x(tt2.Type2Tag):
         except tt2.Type2TagCommandError:
             return False
 
+    def fast_read(self, start_page, end_page):
+        """Send a FAST_READ command to retrieve multiple pages.
+
+        The FAST_READ command returns the content of all memory pages
+        from *start_page* to *end_page*, both inclusive, in a single
+        response. The number of pages that can be read at once is only
+        limited by the maximum frame size supported by the reader. The
+        data returned is a byte array of length (*end_page* -
+        *start_page* + 1) * 4.
+
+        Command execution errors raise
+        :exc:`~nfc.tag.tt2.Type2TagCommandError`.
+
+        """
+        log.debug("fast read pages {0} to {1}".format(start_page, end_page))
+
+        size = (end_page - start_page + 1) * 4
+        timeout = 0.005 + size * 0.0001
+        data = self.transceive(bytes([0x3A, start_page % 256, end_page % 256]),
+                               timeout=timeout, retries=0)
+
+        if len(data) == 1 and data[0] & 0xFA == 0x00:
+            log.debug("received nak response")
+            self.target.sel_req = self.target.sdd_res[:]
+            self._target = self.clf.sense(self.target)
+            raise tt2.Type2TagCommandError(
+                tt2.INVALID_PAGE_ERROR if self.target else
+                nfc.tag.RECEIVE_ERROR)
+
+        if len(data) != size:
+            log.debug("invalid response {0}".format(hexlify(data)))
+            raise tt2.Type2TagCommandError(tt2.INVALID_RESPONSE_ERROR)
+
+        return data
+
+    def _read_pages(self, page):
+        # Read as many pages as fit into one response frame with the
+        # FAST_READ command, up to the last configuration page. This
+        # falls back to the plain READ command if the maximum frame
+        # size is not known or too small, if less than four pages are
+        # left to read, or if FAST_READ failed once for this tag.
+        if self._fast_read:
+            try:
+                max_pages = (self.clf.max_recv_data_size // 16) * 4
+            except (IOError, NotImplementedError):
+                max_pages = 0
+            pages = (min(max_pages, self._cfgpage + 4 - page) // 4) * 4
+            if pages > 4:
+                try:
+                    return self.fast_read(page, page + pages - 1)
+                except tt2.Type2TagCommandError as error:
+                    log.debug("fast read failed ({0}), use read".format(error))
+                    self._fast_read = False
+                    if self.target and int(error) != tt2.INVALID_PAGE_ERROR:
+                        # A tag that does not understand the command
+                        # goes mute and must be activated again.
+                        self.target.sel_req = self.target.sdd_res[:]
+                        self._target = self.clf.sense(self.target)
+        return self.read(page)
+
     def _dump(self, stop, footer):
         lines = super(NTAG21x, self)._dump(stop)
         for i in sorted(footer.keys()):
@@ -633,6 +697,7 @@ class MifareUltralightEV1(NTAG21x):
 class MF0UL11(MifareUltralightEV1):
     def __init__(self, clf, target):
         super(MF0UL11, self).__init__(clf, target, "MF0UL11")
+        self._cfgpage = 16
 
     def dump(self):
         return self._dump_ul11()
@@ -641,6 +706,7 @@ class MF0UL11(MifareUltralightEV1):
 class MF0ULH11(MifareUltralightEV1):
     def __init__(self, clf, target):
         super(MF0ULH11, self).__init__(clf, target, "MF0ULH11")
+        self._cfgpage = 16
 
     def dump(self):
         return self._dump_ul11()
@@ -649,6 +715,7 @@ class MF0ULH11(MifareUltralightEV1):
 class MF0UL21(MifareUltralightEV1):
     def __init__(self, clf, target):
         super(MF0UL21, self).__init__(clf, target, "MF0UL21")
+        self._cfgpage = 37
 
     def dump(self):
         return self._dump_ul21()
@@ -657,6 +724,7 @@ class MF0UL21(MifareUltralightEV1):
 class MF0ULH21(MifareUltralightEV1):
     def __init__(self, clf, target):
         super(MF0ULH21, self).__init__(clf, target, "MF0ULH21")
+        self._cfgpage = 37
 
     def dump(self):
         return self._dump_ul21()
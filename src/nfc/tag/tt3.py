@@ -129,8 +129,9 @@ class BlockCode:
     def pack(self):
         """Pack the block code for transmission. Returns a 2-3 byte string."""
         bn, am, sx = self.number, self.access, self.service
-        return chr(bool(bn < 256) << 7 | (am & 0x7) << 4 | (sx & 0xf)) + \
-            (chr(bn) if bn < 256 else pack("<H", bn))
+        if bn < 256:
+            return pack("BB", 1 << 7 | (am & 0x7) << 4 | (sx & 0xf), bn)
+        return pack("<BH", (am & 0x7) << 4 | (sx & 0xf), bn)
 
 
 class Type3Tag(nfc.tag.Tag):
@@ -156,6 +157,9 @@ class Type3Tag(nfc.tag.Tag):
             except Type3TagCommandError:
                 return None
 
+            # The attribute information block is the NDEF fingerprint.
+            self._fingerprint = bytes(data)
+
             if sum(data[0:14]) != unpack(">H", data[14:16])[0]:
                 log.debug("ndef attribute data checksum error")
                 return None
@@ -185,13 +189,24 @@ class Type3Tag(nfc.tag.Tag):
             attribute_data[14:16] = pack('>H', sum(attribute_data[0:14]))
             self._tag.write_to_ndef_service(attribute_data, 0)
 
-        def _read_ndef_data(self):
+        def _select_ndef_system(self):
             if self.tag.sys != 0x12FC:
                 try:
                     self.tag.idm, self.tag.pmm = self._tag.polling(0x12FC)
                     self.tag.sys = 0x12FC
                 except Type3TagCommandError:
-                    return None
+                    return False
+            return True
+
+        def _read_fingerprint(self):
+            # The attribute information block contains the NDEF data
+            # length and a checksum, and is read with one command.
+            if self._select_ndef_system():
+                return bytes(self._tag.read_from_ndef_service(0))
+
+        def _read_ndef_data(self):
+            if not self._select_ndef_system():
+                return None
 
             attributes = self._read_attribute_data()
             if attributes is None:
@@ -201,18 +216,23 @@ class Type3Tag(nfc.tag.Tag):
                 log.debug("unsupported ndef mapping major version")
                 return None
 
+            # Read the NDEF data blocks with as many blocks per command
+            # as both the tag and the response frame size allow, the
+            # data is stored directly into a buffer of final size.
             last_block_number = 1 + (attributes['ln'] + 15) // 16
-            data = bytearray()
+            nbr = self._tag._max_read_blocks(attributes['nbr'])
+            data = bytearray((last_block_number - 1) * 16)
 
-            for i in range(1, last_block_number, attributes['nbr']):
-                last_block = min(i + attributes['nbr'], last_block_number)
+            for i in range(1, last_block_number, nbr):
+                last_block = min(i + nbr, last_block_number)
                 block_list = range(i, last_block)
                 try:
-                    data += self.tag.read_from_ndef_service(*block_list)
+                    block_data = self.tag.read_from_ndef_service(*block_list)
                 except Type3TagCommandError:
                     return None
+                data[(i-1)*16:(last_block-1)*16] = block_data
 
-            data = data[0:attributes['ln']]
+            del data[attributes['ln']:]
             log.debug("got {0} byte ndef data {1}{2}".format(
                 len(data), hexlify(data[0:32]), ('', '...')[len(data) > 32]))
 
@@ -545,17 +565,18 @@ class Type3Tag(nfc.tag.Tag):
         Command execution errors raise :exc:`~nfc.tag.TagCommandError`.
 
         """
-        a, b, e = self.pmm[5] & 7, self.pmm[5] >> 3 & 7, self.pmm[5] >> 6
-        timeout = 302.1E-6 * ((b + 1) * len(block_list) + a + 1) * 4**e
+        timeout = self._response_time(self.pmm[5], len(block_list))
 
-        data = (chr(len(service_list))
-                + ''.join([sc.pack() for sc in service_list])
-                + chr(len(block_list))
-                + ''.join([bc.pack() for bc in block_list]))
+        data = bytearray([len(service_list)])
+        for sc in service_list:
+            data += sc.pack()
+        data.append(len(block_list))
+        for bc in block_list:
+            data += bc.pack()
 
         log.debug("read w/o encryption service/block list: {0} / {1}".format(
-            ' '.join([hexlify(sc.pack()) for sc in service_list]),
-            ' '.join([hexlify(bc.pack()) for bc in block_list])))
+            ' '.join([hexlify(sc.pack()).decode() for sc in service_list]),
+            ' '.join([hexlify(bc.pack()).decode() for bc in block_list])))
 
         data = self.send_cmd_recv_rsp(0x06, data, timeout)
 
@@ -586,6 +607,94 @@ class Type3Tag(nfc.tag.Tag):
             bc_list = [BlockCode(n) for n in blocks]
             return self.read_without_encryption(sc_list, bc_list)
 
+    def read_blocks(self, service, blocks, max_blocks=15):
+        """Read a sequence of data blocks from a single service.
+
+        This method reads the data blocks with the block numbers in
+        the iterable *blocks* from the unencrypted service with
+        :class:`~nfc.tag.tt3.ServiceCode` *service*. It is a
+        generator that sends as few Read Without Encryption commands
+        as possible and yields the data of each response as soon as
+        it is received, the concatenation of all yielded bytearrays
+        is the data of all *blocks* in order. The following example
+        reads the first 20 blocks of a cyclic service::
+
+            sc = nfc.tag.tt3.ServiceCode(0x0F, 0x0F)
+            data = bytearray()
+            for block_data in tag.read_blocks(sc, range(20)):
+                data += block_data
+
+        The number of blocks per command is the smaller of
+        *max_blocks* and the number of blocks that fit into a single
+        response frame. If the tag rejects a command because it would
+        return too many blocks (status flag 2 is 0xA2), the number is
+        halved for this and all following commands.
+
+        Command execution errors raise :exc:`~nfc.tag.TagCommandError`.
+
+        """
+        blocks = list(blocks)
+        count = self._max_read_blocks(max_blocks)
+
+        # The command data buffer holds the service list and up to
+        # count 3-byte block list elements. The block list is written
+        # in place for each command and the used part of the buffer
+        # is passed on as a memoryview, so nothing is reallocated.
+        cmd_data = bytearray(4 + 3 * count)
+        cmd_data[0] = 1
+        cmd_data[1:3] = service.pack()
+        cmd_view = memoryview(cmd_data)
+
+        index = 0
+        while index < len(blocks):
+            block_list = blocks[index:index+count]
+            cmd_data[3] = len(block_list)
+            size = 4
+            for bn in block_list:
+                if bn < 256:
+                    cmd_data[size:size+2] = (0x80, bn)
+                    size += 2
+                else:
+                    cmd_data[size:size+3] = (0x00, bn & 0xFF, bn >> 8)
+                    size += 3
+
+            timeout = self._response_time(self.pmm[5], len(block_list))
+            try:
+                data = self.send_cmd_recv_rsp(
+                    0x06, cmd_view[0:size], timeout)
+            except Type3TagCommandError as error:
+                if error.errno & 0xFF == 0xA2 and len(block_list) > 1:
+                    count = len(block_list) // 2
+                    log.debug("reduce read to {0} blocks".format(count))
+                    continue
+                raise
+
+            if len(data) != 1 + len(block_list) * 16:
+                log.debug("insufficient data received from tag")
+                raise Type3TagCommandError(DATA_SIZE_ERROR)
+
+            index += len(block_list)
+            yield data[1:]
+
+    def _max_read_blocks(self, max_blocks):
+        # Return the number of blocks to read with one command. The
+        # maximum response time grows with the number of blocks by
+        # the same amount (PMm parameter B) per block, only the fixed
+        # part (PMm parameter A) is per command. Thus the most blocks
+        # per command is always fastest and the limit is the number
+        # of blocks the response frame (13 + 16 * n byte) can carry.
+        try:
+            max_frame_size = min(self.clf.max_recv_data_size, 255)
+        except (IOError, NotImplementedError):
+            max_frame_size = 255
+        return max(1, min(max_blocks, (max_frame_size - 13) // 16))
+
+    def _response_time(self, pmm_byte, blocks):
+        # Maximum response time for a command that processes a number
+        # of blocks, calculated from one of the PMm bytes.
+        a, b, e = pmm_byte & 7, pmm_byte >> 3 & 7, pmm_byte >> 6
+        return 302.1E-6 * ((b + 1) * blocks + a + 1) * 4**e
+
     def write_without_encryption(self, service_list, block_list, data):
         """Write data blocks to unencrypted services.
 
@@ -626,20 +735,21 @@ class Type3Tag(nfc.tag.Tag):
         Command execution errors raise :exc:`~nfc.tag.TagCommandError`.
 
         """
-        a, b, e = self.pmm[6] & 7, self.pmm[6] >> 3 & 7, self.pmm[6] >> 6
-        timeout = 302.1E-6 * ((b + 1) * len(block_list) + a + 1) * 4**e
+        timeout = self._response_time(self.pmm[6], len(block_list))
 
-        data = (chr(len(service_list))
-                + ''.join([sc.pack() for sc in service_list])
-                + chr(len(block_list))
-                + ''.join([bc.pack() for bc in block_list])
-                + data)
+        cmd_data = bytearray([len(service_list)])
+        for sc in service_list:
+            cmd_data += sc.pack()
+        cmd_data.append(len(block_list))
+        for bc in block_list:
+            cmd_data += bc.pack()
+        cmd_data += data
 
         log.debug("write w/o encryption service/block list: {0} / {1}".format(
-            ' '.join([hexlify(sc.pack()) for sc in service_list]),
-            ' '.join([hexlify(bc.pack()) for bc in block_list])))
+            ' '.join([hexlify(sc.pack()).decode() for sc in service_list]),
+            ' '.join([hexlify(bc.pack()).decode() for bc in block_list])))
 
-        self.send_cmd_recv_rsp(0x08, data, timeout)
+        self.send_cmd_recv_rsp(0x08, cmd_data, timeout)
 
     def write_to_ndef_service(self, data, *blocks):
         """Write block data to an NDEF compatible tag.
@@ -683,7 +793,11 @@ class Type3Tag(nfc.tag.Tag):
 
         """
         idm = self.idm if send_idm else bytearray()
-        cmd = chr(2+len(idm)+len(cmd_data)) + chr(cmd_code) + idm + cmd_data
+        cmd = bytearray(2 + len(idm) + len(cmd_data))
+        cmd[0] = len(cmd)
+        cmd[1] = cmd_code
+        cmd[2:2+len(idm)] = idm
+        cmd[2+len(idm):] = cmd_data
         log.debug(">> {0:02x} {1:02x} {2} {3} ({4}s)".format(
             cmd[0], cmd[1], hexlify(cmd[2:10]), hexlify(cmd[10:]), timeout))
 
@@ -710,14 +824,16 @@ class Type3Tag(nfc.tag.Tag):
             log.debug("incorrect response code {0:02x}".format(rsp[1]))
             raise Type3TagCommandError(RSP_CODE_ERROR)
         if send_idm and rsp[2:10] != self.idm:
-            log.debug("wrong tag or transaction id " + hexlify(rsp[2:10]))
+            log.debug("wrong tag or transaction id {0}".format(
+                hexlify(rsp[2:10])))
             raise Type3TagCommandError(TAG_IDM_ERROR)
         if not send_idm:
             log.debug("<< {0:02x} {1:02x} {2}".format(
                 rsp[0], rsp[1], hexlify(rsp[2:])))
             return rsp[2:]
         if check_status and rsp[10] != 0:
-            log.debug("tag returned error status " + hexlify(rsp[10:12]))
+            log.debug("tag returned error status {0}".format(
+                hexlify(rsp[10:12])))
             raise Type3TagCommandError(unpack(">H", rsp[10:12])[0])
         if not check_status:
             log.debug("<< {0:02x} {1:02x} {2} {3}".format(
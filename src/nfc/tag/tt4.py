@@ -65,31 +65,103 @@ class Type4TagCommandError(nfc.tag.TagCommandError):
         return Type4TagCommandError(unpack(">H", status)[0])
 
 
+def extended_length_support(historical_bytes):
+    """Return whether ISO/IEC 7816-4 card capabilities in the
+    *historical_bytes* of an answer to select announce support for
+    extended Lc and Le fields.
+
+    """
+    hb = bytearray(historical_bytes)
+    if len(hb) == 0 or hb[0] not in (0x00, 0x80):
+        return False
+
+    # With category indicator 00h the last three bytes are a status
+    # indicator, with 80h all remaining bytes are compact-TLV objects.
+    end = len(hb) - 3 if hb[0] == 0x00 else len(hb)
+    offset = 1
+    while offset < end:
+        tag, length = hb[offset] >> 4, hb[offset] & 0x0F
+        value = hb[offset+1:offset+1+length]
+        if tag == 7 and len(value) == 3:
+            # card capabilities, third software function table
+            return bool(value[2] & 0x40)
+        offset += 1 + length
+    return False
+
+
 class IsoDepInitiator(object):
-    def __init__(self, clf, fsc, fwt):
+    """ISO/IEC 14443-4 half-duplex block transmission protocol for the
+    reader/writer side.
+
+    Commands longer than the maximum information unit *fsc - 1* are
+    sent with I-block chaining and chained responses are received
+    with R(ACK) blocks. After a transmission or timeout error the last
+    block is recovered at most *n_retry_nak* times with R(NAK) while
+    sending, or *n_retry_ack* times with R(ACK) while receiving a
+    chained response. Both default to the number of frame waiting
+    times *fwt* within one second, but not more than 5.
+
+    The :attr:`statistics` dictionary counts the waiting time
+    extensions granted ('wtx'), the R(NAK) blocks sent for error
+    recovery ('nak'), the R(ACK) blocks sent to receive chained
+    responses ('ack') and the I-blocks retransmitted after an R(ACK)
+    from the tag ('retransmit').
+
+    """
+    def __init__(self, clf, fsc, fwt, n_retry_ack=None, n_retry_nak=None):
         self.clf = clf
         self.pni = 0
         self.miu = fsc-1
         self.fwt = fwt
         self.delta_fwt = 49152 / 13.56E6
-        self.n_retry_ack = min(int(1/self.fwt), 5)
-        self.n_retry_nak = self.n_retry_ack
+        n_retry = min(int(1/self.fwt), 5)
+        self.n_retry_ack = n_retry if n_retry_ack is None else n_retry_ack
+        self.n_retry_nak = n_retry if n_retry_nak is None else n_retry_nak
+        self.statistics = {'wtx': 0, 'nak': 0, 'ack': 0, 'retransmit': 0}
 
     def exchange(self, command, timeout=None):
-        if timeout is None:
-            timeout = self.fwt + self.delta_fwt
+        """Send a *command* and return the complete response.
 
+        With *command* set to :const:`None` an R(NAK) block is sent
+        as presence check and nothing is returned.
+
+        """
         if command is None:
             # presence check with R(NAK)
+            if timeout is None:
+                timeout = self.fwt + self.delta_fwt
             data = bytearray([0xB2 | self.pni])
             self.clf.exchange(data, timeout)
             return
 
+        response = bytearray()
+        for data in self.exchange_chunks(command, timeout):
+            response += data
+        return response
+
+    def exchange_chunks(self, command, timeout=None):
+        """Send a *command* and yield the response in parts.
+
+        This generator yields the information field of each received
+        I-block as a memoryview of the received frame, as soon as it
+        arrives. The next block of a chained response is requested
+        only when the generator is resumed, so it must be run to the
+        end before the next command can be sent.
+
+        """
+        if timeout is None:
+            timeout = self.fwt + self.delta_fwt
+
+        command = memoryview(command)
+
         for offset in range(0, len(command), self.miu):
             more = len(command) - offset > self.miu
-            pfb = pack('B', (0x02, 0x12)[more] | self.pni)
-            data = pfb + command[offset:offset+self.miu]
+            size = min(len(command) - offset, self.miu)
+            block = bytearray(1 + size)
+            block[0] = (0x02, 0x12)[more] | self.pni
+            block[1:] = command[offset:offset+size]
 
+            data = block
             for i in itertools.count(start=1):  # pragma: no branch
                 try:
                     data = self.clf.exchange(data, timeout)
@@ -97,12 +169,14 @@ class IsoDepInitiator(object):
                         raise nfc.clf.TransmissionError
                     if data[0] == 0xA2 | (~self.pni & 1):
                         log.debug("ISO-DEP retransmit after ack")
-                        data = pfb + command[offset:offset+self.miu]
+                        self.statistics['retransmit'] += 1
+                        data = block
                         continue
                     break
                 except nfc.clf.TransmissionError:
                     if i <= self.n_retry_nak:
                         log.warning("ISO-DEP transmission error (#%d)" % i)
+                        self.statistics['nak'] += 1
                         data = bytearray([0xB2 | self.pni])
                     else:
                         log.error("ISO-DEP unrecoverable transmission error")
@@ -110,6 +184,7 @@ class IsoDepInitiator(object):
                 except nfc.clf.TimeoutError:
                     if i <= self.n_retry_nak:
                         log.warning("ISO-DEP timeout error (#%d)" % i)
+                        self.statistics['nak'] += 1
                         data = bytearray([0xB2 | self.pni])
                     else:
                         log.error("ISO-DEP unrecoverable timeout error")
@@ -118,9 +193,7 @@ class IsoDepInitiator(object):
                     log.error("ISO-DEP unrecoverable protocol error")
                     raise Type4TagCommandError(nfc.tag.PROTOCOL_ERROR)
 
-            while data[0] & 0b11111110 == 0b11110010:  # WTX
-                log.debug("ISO-DEP waiting time extension")
-                data = self.clf.exchange(data, (data[1] & 0x3F) * self.fwt)
+            data = self._waiting_time_extension(data)
 
             if data[0] & 0x01 != self.pni:
                 log.warning("ISO-DEP protocol error: block number")
@@ -135,14 +208,18 @@ class IsoDepInitiator(object):
             else:
                 if data[0] & 0b11101110 == 0x02:  # INF
                     self.pni = (self.pni + 1) % 2
-                    response = data[1:]
                 else:
                     log.error("ISO-DEP protocol error: expected inf")
                     raise Type4TagCommandError(nfc.tag.PROTOCOL_ERROR)
 
-        while bool(data[0] & 0b00010000):
-            data = pack('B', 0xA2 | self.pni)  # ACK
+        chaining = bool(data[0] & 0b00010000)
+        yield memoryview(data)[1:]
+
+        while chaining:
+            ack = bytearray([0xA2 | self.pni])
+            self.statistics['ack'] += 1
 
+            data = ack
             for i in itertools.count(start=1):  # pragma: no branch
                 try:
                     data = self.clf.exchange(data, timeout)
@@ -151,15 +228,17 @@ class IsoDepInitiator(object):
                     break
                 except nfc.clf.TransmissionError:
                     if i <= self.n_retry_ack:
-                        log.warning("ISO-DEP transmission error  (#%d)" % i)
-                        data = bytearray([0xA2 | self.pni])
+                        log.warning("ISO-DEP transmission error (#%d)" % i)
+                        self.statistics['ack'] += 1
+                        data = ack
                     else:
                         log.error("ISO-DEP unrecoverable transmission error")
                         raise Type4TagCommandError(nfc.tag.RECEIVE_ERROR)
                 except nfc.clf.TimeoutError:
                     if i <= self.n_retry_ack:
                         log.warning("ISO-DEP timeout error (#%d)" % i)
-                        data = bytearray([0xA2 | self.pni])
+                        self.statistics['ack'] += 1
+                        data = ack
                     else:
                         log.error("ISO-DEP unrecoverable timeout error")
                         raise Type4TagCommandError(nfc.tag.TIMEOUT_ERROR)
@@ -167,14 +246,24 @@ class IsoDepInitiator(object):
                     log.error("ISO-DEP unrecoverable protocol error")
                     raise Type4TagCommandError(nfc.tag.PROTOCOL_ERROR)
 
+            data = self._waiting_time_extension(data)
+
             if data[0] & 0x01 != self.pni:
                 log.error("ISO-DEP protocol error: block number")
                 raise Type4TagCommandError(nfc.tag.PROTOCOL_ERROR)
 
-            response = response + data[1:]
             self.pni = (self.pni + 1) % 2
-
-        return response
+            chaining = bool(data[0] & 0b00010000)
+            yield memoryview(data)[1:]
+
+    def _waiting_time_extension(self, data):
+        # Answer S(WTX) requests with the same WTXM until the tag
+        # sends another block, which is then returned.
+        while data[0] & 0b11111110 == 0b11110010:  # WTX
+            log.debug("ISO-DEP waiting time extension")
+            self.statistics['wtx'] += 1
+            data = self.clf.exchange(data, (data[1] & 0x3F) * self.fwt)
+        return data
 
 
 class Type4Tag(nfc.tag.Tag):
@@ -272,8 +361,18 @@ class Type4Tag(nfc.tag.Tag):
             log.debug("ndef file read flag is %d", rf)
             log.debug("ndef file write flag is %d", wf)
 
-            self._max_le = mle
-            self._max_lc = mlc
+            # Use the largest response and command data length that
+            # the capability container permits and the APDU length
+            # fields can encode. Beyond 256/255 byte this requires
+            # extended length support announced by the tag, otherwise
+            # the ISO-DEP layer chains frames as needed.
+            if self.tag._extended_length_support:
+                self._max_le, self._max_lc = mle, mlc
+            else:
+                self._max_le, self._max_lc = min(mle, 256), min(mlc, 255)
+            log.debug("use max le %d and max lc %d",
+                      self._max_le, self._max_lc)
+
             self._capacity = mfs - tag + 2
             self._readable = bool(rf == 0)
             self._writeable = bool(wf == 0)
@@ -282,6 +381,22 @@ class Type4Tag(nfc.tag.Tag):
 
             return True
 
+        _cache_attributes = nfc.tag.Tag.NDEF._cache_attributes + (
+            '_aid', '_max_le', '_max_lc', '_nlen_size', '_ndef_file')
+
+        def _read_fingerprint(self):
+            # Select the known NDEF application and file, then read the
+            # NDEF length field and the first few message bytes.
+            self.tag.send_apdu(0, 0xA4, 0x04, 0x00, self._aid)
+            if self._select_fid(self._ndef_file):
+                size = self._fingerprint_size(len(self._data))
+                return bytes(self._read_binary(0, size))
+
+        def _fingerprint_size(self, nlen):
+            # Not more than one READ BINARY returns and not beyond the
+            # end of the NDEF message.
+            return min(16, self._max_le, self._nlen_size + nlen)
+
         def _read_ndef_data(self):
             log.debug("read ndef data")
 
@@ -297,21 +412,28 @@ class Type4Tag(nfc.tag.Tag):
 
                 log.debug("read ndef data file")
                 lfmt = ">I" if self._nlen_size == 4 else ">H"
-                nlen = self._read_binary(0, self._nlen_size)
-                if len(nlen) != self._nlen_size:
+                nlen_data = self._read_binary(0, self._nlen_size)
+                if len(nlen_data) != self._nlen_size:
                     return None
 
-                nlen = unpack(lfmt, nlen)[0]
+                nlen = unpack(lfmt, nlen_data)[0]
                 log.debug("ndef data length is {0}".format(nlen))
 
-                data = bytearray()
-                while len(data) < nlen:
-                    offset = self._nlen_size + len(data)
-                    data += self._read_binary(offset, nlen - len(data))
+                data = bytearray(nlen)
+                offset = 0
+                while offset < nlen:
+                    part = self._read_binary(
+                        self._nlen_size + offset, nlen - offset)
+                    if len(part) == 0:
+                        return None
+                    data[offset:offset+len(part)] = part
+                    offset += len(part)
 
             except Type4TagCommandError:
                 return None
             else:
+                size = self._fingerprint_size(nlen) - self._nlen_size
+                self._fingerprint = bytes(nlen_data + data[0:size])
                 return data
 
         def _write_ndef_data(self, data):
@@ -532,8 +654,15 @@ class Type4ATag(Type4Tag):
         log.debug("max command frame size is {0:d} byte".format(fsc))
         log.debug("max frame waiting time is {0:f}".format(fwt))
 
+        # The historical bytes follow the format byte T0 and the
+        # interface bytes TA, TB, TC that are indicated by T0.
+        hb_offset = 2 + bin(rats_res[1] & 0x70).count('1')
+        historical_bytes = rats_res[hb_offset:rats_res[0]]
+        log.debug("historical bytes {0}".format(hexlify(historical_bytes)))
+
         self._dep = IsoDepInitiator(clf, fsc, fwt)
-        self._extended_length_support = False
+        self._extended_length_support = \
+            extended_length_support(historical_bytes)
 
 
 class Type4BTag(Type4Tag):
@@ -94,6 +94,24 @@ class TestChipset(object):
         assert chipset.transport.read.mock_calls == [call(100)]
         assert chipset.transport.write.mock_calls == [call(cmd)]
 
+    def test_command_with_submillisecond_timeout(self, chipset):
+        rsp = HEX('0000ff 05fb d5 01 343536 8b 00')
+        chipset.transport.read.side_effect = [ACK(), rsp]
+        assert chipset.command(0, b'123', 0.0002) == b'456'
+        assert chipset.transport.read.mock_calls == [call(100), call(1)]
+
+    def test_command_latency_histogram(self, chipset):
+        rsp = HEX('0000ff 05fb d5 01 343536 8b 00')
+        chipset.transport.read.side_effect = [ACK(), rsp]
+        chipset.command(0, b'123', 1.0)
+        histogram = chipset.latency[chipset.CMD[0]]
+        assert len(histogram) == len(chipset.LATENCY_BUCKETS) + 1
+        assert sum(histogram) == 1
+        chipset._count_latency(0, 0.003)
+        chipset._count_latency(0, 3.0)
+        assert histogram[2] == 1 and histogram[-1] == 1
+        assert sum(histogram) == 3
+
     def test_command_with_too_much_data(self, chipset):
         with pytest.raises(AssertionError):
             cmd_data = bytearray(chipset.host_command_frame_max_size)
@@ -0,0 +1,140 @@
+# -*- coding: latin-1 -*-
+from __future__ import absolute_import, division
+
+import nfc
+import nfc.clf
+import nfc.aio
+
+import asyncio
+import threading
+import pytest
+from pytest_mock import mocker  # noqa: F401
+from mock import call
+
+import logging
+logging.basicConfig(level=logging.DEBUG)
+logging_level = logging.getLogger().getEffectiveLevel()
+logging.getLogger("nfc.aio").setLevel(logging_level)
+
+
+def HEX(s):
+    return bytearray.fromhex(s)
+
+
+@pytest.fixture()  # noqa: F811
+def clf(mocker):
+    clf = mocker.Mock(spec=nfc.clf.ContactlessFrontend)
+    clf.sense.return_value = None
+    return clf
+
+
+@pytest.fixture()
+def aio_clf(clf):
+    return nfc.aio.ContactlessFrontend(clf)
+
+
+def run(coroutine):
+    return asyncio.get_event_loop().run_until_complete(coroutine)
+
+
+class TestContactlessFrontend(object):
+    def test_init(self):
+        aio_clf = nfc.aio.ContactlessFrontend()
+        assert isinstance(aio_clf.clf, nfc.clf.ContactlessFrontend)
+        assert aio_clf.clf.device is None
+
+    def test_open_and_close(self, clf, aio_clf):
+        clf.open.return_value = True
+        assert run(aio_clf.open('usb')) is True
+        clf.open.assert_called_once_with('usb')
+        run(aio_clf.close())
+        clf.close.assert_called_once_with()
+
+    def test_async_with_statement(self, clf, aio_clf):
+        async def main():
+            async with aio_clf as contactless_frontend:
+                assert contactless_frontend is aio_clf
+        run(main())
+        clf.close.assert_called_once_with()
+
+    def test_sense_runs_in_executor(self, clf, aio_clf):
+        target = nfc.clf.RemoteTarget('106A')
+        threads = []
+
+        def sense(*targets):
+            threads.append(threading.current_thread())
+            return targets[0]
+
+        clf.sense.side_effect = sense
+        assert run(aio_clf.sense(target)) is target
+        assert threads[0] is not threading.current_thread()
+
+    def test_sense_iterations(self, clf, aio_clf):
+        target = nfc.clf.RemoteTarget('106A')
+        assert run(aio_clf.sense(target, iterations=3, interval=0)) is None
+        assert clf.sense.call_count == 3
+        clf.sense.side_effect = [None, target]
+        assert run(aio_clf.sense(target, iterations=3, interval=0)) is target
+
+    def test_sense_scheduler(self, clf, aio_clf):
+        target = nfc.clf.RemoteTarget('106A')
+        scheduler = nfc.clf.SenseScheduler()
+        assert run(aio_clf.sense(target, iterations=2, interval=0,
+                                 scheduler=scheduler)) is None
+        assert clf.sense.call_args_list == 2 * [
+            call(target, scheduler=scheduler)]
+
+    def test_listen(self, clf, aio_clf):
+        target = nfc.clf.LocalTarget('106A')
+        clf.listen.return_value = target
+        assert run(aio_clf.listen(target, 1.0)) is target
+        clf.listen.assert_called_once_with(target, 1.0)
+
+    def test_exchange(self, clf, aio_clf):
+        clf.exchange.return_value = HEX('0A')
+        assert run(aio_clf.exchange(HEX('3000'), 0.1)) == HEX('0A')
+        clf.exchange.assert_called_once_with(HEX('3000'), 0.1)
+
+    def test_exchange_error(self, clf, aio_clf):
+        clf.exchange.side_effect = nfc.clf.TimeoutError
+        with pytest.raises(nfc.clf.TimeoutError):
+            run(aio_clf.exchange(HEX('3000'), 0.1))
+
+    def test_connect(self, clf, aio_clf):
+        clf.connect.return_value = True
+        assert run(aio_clf.connect(rdwr={})) is True
+        terminate = clf.connect.call_args[1]['terminate']
+        assert terminate() is False
+
+    def test_connect_cancelled(self, clf, aio_clf):
+        def connect(**options):
+            while not options['terminate']():
+                started.set()
+            return None
+
+        started = threading.Event()
+        clf.connect.side_effect = connect
+
+        async def main():
+            task = asyncio.ensure_future(aio_clf.connect(rdwr={}))
+            while not started.is_set():
+                await asyncio.sleep(0.001)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            await aio_clf.close()
+
+        run(main())
+
+    def test_wait_for_removal(self, aio_clf):
+        class Tag(object):
+            presence_checks = 0
+
+            @property
+            def is_present(self):
+                self.presence_checks += 1
+                return self.presence_checks < 3
+
+        tag = Tag()
+        run(aio_clf.wait_for_removal(tag, interval=0))
+        assert tag.presence_checks == 3
@@ -117,6 +117,22 @@ class TestDevice(object):
     def test_check_crc_b(self, device):
         assert device.check_crc_b(HEX('0000470F')) is True
 
+    @pytest.mark.parametrize("reg", [0x6363, 0xFFFF])
+    def test_calculate_crc(self, reg):
+        def calculate_crc_bitwise(data, size, reg):
+            for octet in data[:size]:
+                for pos in range(8):
+                    bit = (reg ^ ((octet >> pos) & 1)) & 1
+                    reg = reg >> 1
+                    if bit:
+                        reg = reg ^ 0x8408
+            return reg
+
+        data = bytearray(range(256)) + bytearray(range(255, -1, -1))
+        for size in range(len(data) + 1):
+            assert nfc.clf.device.calculate_crc(data, size, reg) == \
+                calculate_crc_bitwise(data, size, reg)
+
 
 @pytest.mark.parametrize("found, instance_type", [  # noqa: F811
     (None, type(None)),
@@ -203,6 +219,70 @@ def test_connect_tty_driver_init_error(mocker):  # noqa: F811
     sys.platform = sys_platform
 
 
+@pytest.fixture()  # noqa: F811
+def discovery_cache(mocker):
+    mocker.patch('nfc.clf.device.use_discovery_cache', True)
+    mocker.patch('nfc.clf.device.discovery_cache', dict())
+    return nfc.clf.device.discovery_cache
+
+
+def test_connect_usb_cached(mocker, device, discovery_cache):  # noqa: F811
+    found = [(0x054c, 0x0193, 1, 2)]
+    sys_platform, sys.platform = sys.platform, 'testing'
+    usb = mocker.patch('nfc.clf.transport.USB')
+    usb.find.return_value = found
+    mocker.patch('nfc.clf.transport.TTY')
+    mocker.patch('nfc.clf.transport.TTY.find').return_value = None
+    mocker.patch('nfc.clf.pn531.init').return_value = device
+    assert nfc.clf.device.connect('usb') is device
+    assert discovery_cache == {'usb': ("USB", "pn531", (1, 2))}
+    assert usb.find.call_count == 1
+    assert nfc.clf.device.connect('usb') is device
+    assert device.path == "usb:001:002"
+    assert usb.find.call_count == 1
+    usb.assert_called_with(1, 2)
+    nfc.clf.device.invalidate_discovery_cache('usb')
+    assert discovery_cache == {}
+    assert nfc.clf.device.connect('usb') is device
+    assert usb.find.call_count == 2
+    sys.platform = sys_platform
+
+
+def test_connect_tty_cached(mocker, device, discovery_cache):  # noqa: F811
+    found = (['/dev/ttyS0', '/dev/ttyS1'], '', True)
+    sys_platform, sys.platform = sys.platform, 'testing'
+    mocker.patch('nfc.clf.transport.USB')
+    mocker.patch('nfc.clf.transport.USB.find').return_value = None
+    tty = mocker.patch('nfc.clf.transport.TTY')
+    tty.find.return_value = found
+    mocker.patch('nfc.clf.arygon.init').side_effect = IOError()
+    pn532_init = mocker.patch('nfc.clf.pn532.init')
+    pn532_init.side_effect = [IOError(), device, device]
+    assert nfc.clf.device.connect('tty') is device
+    assert discovery_cache == {'tty': ("TTY", "pn532", '/dev/ttyS1')}
+    assert nfc.clf.device.connect('tty') is device
+    assert tty.find.call_count == 1
+    tty.assert_called_with('/dev/ttyS1')
+    sys.platform = sys_platform
+
+
+def test_connect_cached_device_gone(mocker, device,  # noqa: F811
+                                    discovery_cache):
+    discovery_cache['usb'] = ("USB", "pn531", (1, 2))
+    discovery_cache['tty'] = ("TTY", "pn532", '/dev/ttyS1')
+    sys_platform, sys.platform = sys.platform, 'testing'
+    mocker.patch('nfc.clf.transport.USB')
+    mocker.patch('nfc.clf.transport.USB.find').return_value = None
+    mocker.patch('nfc.clf.transport.TTY')
+    mocker.patch('nfc.clf.transport.TTY.find').return_value = None
+    mocker.patch('nfc.clf.pn531.init').side_effect = IOError()
+    assert nfc.clf.device.connect('usb') is None
+    assert 'usb' not in discovery_cache
+    nfc.clf.device.invalidate_discovery_cache()
+    assert discovery_cache == {}
+    sys.platform = sys_platform
+
+
 def test_connect_udp(mocker, device):  # noqa: F811
     mocker.patch('nfc.clf.transport.USB')
     mocker.patch('nfc.clf.transport.USB.find').return_value = None
@@ -215,3 +295,27 @@ def test_connect_udp(mocker, device):  # noqa: F811
     device = nfc.clf.device.connect('udp:remotehost:12345')
     assert isinstance(device, nfc.clf.device.Device)
     assert device.path == "udp:remotehost:12345"
+
+
+@pytest.mark.parametrize("path, usb_found, tty_found, result", [  # noqa: F811
+    ('usb', None, None, []),
+    ('usb', [(0x0000, 0x0000, 1, 2), (0x054c, 0x06c3, 3, 4),
+             (0x04e6, 0x5591, 3, 15)], None, ['usb:003:004', 'usb:003:015']),
+    ('tty', None, ([], None, True), []),
+    ('tty', None, (['/dev/ttyUSB0', '/dev/ttyAMA1'], None, True),
+     ['tty:USB0', 'tty:AMA1']),
+    ('tty:S0:pn532', None, (['/dev/ttyS0'], 'pn532', False),
+     ['tty:S0:pn532']),
+    ('tty:usbserial', None, (['/dev/cu.usbserial-FTSI7O'], None, True),
+     ['tty:usbserial-FTSI7O']),
+    ('tty:serial0:pn532', None, (['/dev/serial0'], 'pn532', False),
+     ['tty:serial0:pn532']),
+    ('com', None, (['COM1', 'COM4'], 'arygon', True),
+     ['com:COM1:arygon', 'com:COM4:arygon']),
+    ('udp:remotehost', None, None, ['udp:remotehost']),
+    ('unknown', None, None, []),
+])
+def test_search(mocker, path, usb_found, tty_found, result):
+    mocker.patch('nfc.clf.transport.USB.find').return_value = usb_found
+    mocker.patch('nfc.clf.transport.TTY.find').return_value = tty_found
+    assert nfc.clf.device.search(path) == result
@@ -4,6 +4,8 @@ from __future__ import absolute_import, division
 import nfc
 import nfc.clf
 
+import mock
+import time
 import errno
 import pytest
 from pytest_mock import mocker  # noqa: F401
@@ -219,6 +221,31 @@ class TestContactlessFrontend(object):
         rdwr_options = {'iterations': 1}
         assert clf.connect(rdwr=rdwr_options, terminate=terminate) is True
 
+    @pytest.mark.parametrize("interval, sleeps", [
+        (0.2, [0.2, 0.2, 0.2]),
+        ((0.05, 0.15), [0.05, 0.1, 0.15]),
+    ])
+    def test_rdwr_wait_for_removal(self, clf, terminate, mocker,
+                                   interval, sleeps):
+        terminate.return_value = False
+        tag = mocker.Mock()
+        type(tag).is_present = mocker.PropertyMock(
+            side_effect=[True, True, True, False])
+        sleep = mocker.patch('nfc.clf.time.sleep')
+        options = {'presence-interval': interval}
+        clf._rdwr_wait_for_removal(options, terminate, tag)
+        assert sleep.mock_calls == [mock.call(t) for t in sleeps]
+        assert clf.removal_latency >= 0
+
+    def test_rdwr_wait_for_removal_terminated(self, clf, terminate, mocker):
+        terminate.side_effect = [False, True]
+        tag = mocker.Mock()
+        type(tag).is_present = mocker.PropertyMock(return_value=True)
+        mocker.patch('nfc.clf.time.sleep')
+        options = {'presence-interval': 0.1}
+        clf._rdwr_wait_for_removal(options, terminate, tag)
+        assert clf.removal_latency is None
+
     def test_connect_rdwr_on_connect_false(self, clf, terminate):
         terminate.side_effect = [False, False, True]
         target = nfc.clf.RemoteTarget('212F')
@@ -455,6 +482,114 @@ class TestContactlessFrontend(object):
         assert isinstance(res_target, nfc.clf.RemoteTarget)
         clf.device.sense_ttb.assert_called_once_with(req_target)
 
+    def test_sense_with_scheduler_order(self, clf):
+        res_target = nfc.clf.RemoteTarget('212F')
+        res_target.sensf_res = HEX('01 01010701260cca02 ffffffffffffffff')
+        clf.device.sense_tta.return_value = None
+        clf.device.sense_ttb.return_value = None
+        clf.device.sense_ttf.return_value = res_target
+        scheduler = nfc.clf.SenseScheduler()
+        targets = [nfc.clf.RemoteTarget(brty) for brty in
+                   ('106A', '106B', '212F')]
+        assert clf.sense(*targets, scheduler=scheduler) is res_target
+        assert clf.sense(*targets, scheduler=scheduler) is res_target
+        assert clf.device.sense_tta.call_count == 1
+        assert clf.device.sense_ttb.call_count == 1
+        assert clf.device.sense_ttf.call_count == 2
+        assert scheduler.statistics['106A']['polls'] == 1
+        assert scheduler.statistics['106A']['hits'] == 0
+        assert scheduler.statistics['212F']['polls'] == 2
+        assert scheduler.statistics['212F']['hits'] == 2
+        assert scheduler.statistics['212F']['hit-rate'] > 0
+
+    def test_sense_with_scheduler_skip(self, clf, mocker):
+        mocker.patch('nfc.clf.time.sleep')
+        res_target = nfc.clf.RemoteTarget('106B')
+        res_target.sensb_res = HEX('50E8253EEC00000011008185')
+        clf.device.sense_tta.return_value = None
+        clf.device.sense_ttb.return_value = res_target
+        scheduler = nfc.clf.SenseScheduler(skip_after=3)
+        targets = [nfc.clf.RemoteTarget(brty) for brty in ('106A', '106B')]
+        for i in range(6):
+            assert clf.sense(*targets, scheduler=scheduler) is res_target
+        # 106B is searched first after the first hit
+        assert clf.device.sense_tta.call_count == 1
+        # 106A is polled in iterations 7, 8, then skipped except for
+        # every third iteration (9 and 12)
+        clf.device.sense_ttb.return_value = None
+        assert clf.sense(*targets, iterations=6, scheduler=scheduler) is None
+        assert clf.device.sense_tta.call_count == 5
+        assert clf.device.sense_ttb.call_count == 12
+
+    def test_sense_with_scheduler_communication_error(self, clf):
+        clf.device.sense_tta.side_effect = nfc.clf.CommunicationError
+        scheduler = nfc.clf.SenseScheduler()
+        target = nfc.clf.RemoteTarget('106A')
+        assert clf.sense(target, scheduler=scheduler) is None
+        assert scheduler.statistics['106A']['polls'] == 1
+        assert scheduler.statistics['106A']['hits'] == 0
+
+    def test_sense_with_scheduler_fast_resense(self, clf, mocker):
+        sleep = mocker.patch('nfc.clf.time.sleep')
+        clf.device.sense_tta.return_value = None
+        scheduler = nfc.clf.SenseScheduler(fast_iterations=2,
+                                           fast_interval=0.05)
+        scheduler.removed()
+        target = nfc.clf.RemoteTarget('106A')
+        assert clf.sense(target, iterations=4, interval=0.5,
+                         scheduler=scheduler) is None
+        intervals = [round(c[1][0], 1) for c in sleep.mock_calls]
+        assert intervals == [0.0, 0.0, 0.5]
+
+    def test_sense_all_found_two_targets(self, clf):
+        res_targets = [nfc.clf.RemoteTarget('106A') for _ in range(2)]
+        for i, res_target in enumerate(res_targets):
+            res_target.sens_res = HEX('4400')
+            res_target.sel_res = HEX('00')
+            res_target.sdd_res = HEX('0416C6C2D7388%d' % i)
+            res_target._tg = i + 1
+        clf.device.sense_tta_all.return_value = res_targets
+        req_target = nfc.clf.RemoteTarget('106A')
+        assert clf.sense_all(req_target) == res_targets
+        assert clf.target is res_targets[0]
+        clf.device.sense_tta_all.assert_called_once_with(req_target)
+        clf.device.select_target.assert_called_once_with(res_targets[0])
+        clf.select(res_targets[1])
+        assert clf.target is res_targets[1]
+        clf.select(res_targets[1])
+        assert clf.device.select_target.mock_calls == [
+            mock.call(res_targets[0]), mock.call(res_targets[1])]
+
+    def test_sense_all_ignores_error_target(self, clf):
+        res_target = nfc.clf.RemoteTarget('106A')
+        res_target.sens_res = HEX('E000')
+        clf.device.sense_tta_all.return_value = [res_target]
+        assert clf.sense_all(nfc.clf.RemoteTarget('106A')) == []
+
+    def test_sense_all_not_found(self, clf, mocker):
+        mocker.patch('nfc.clf.time.sleep')
+        clf.device.sense_tta_all.return_value = []
+        target = nfc.clf.RemoteTarget('106A')
+        assert clf.sense_all(target, iterations=2) == []
+        assert clf.device.sense_tta_all.call_count == 2
+
+    def test_sense_all_other_technology(self, clf):
+        res_target = nfc.clf.RemoteTarget('106B')
+        res_target.sensb_res = HEX('50E8253EEC00000011008185')
+        clf.device.sense_ttb.return_value = res_target
+        assert clf.sense_all(nfc.clf.RemoteTarget('106B')) == [res_target]
+        clf.device.sense_ttb.return_value = None
+        assert clf.sense_all(nfc.clf.RemoteTarget('106B')) == []
+
+    def test_sense_all_without_device(self, clf):
+        clf.device = None
+        with pytest.raises(IOError) as excinfo:
+            clf.sense_all(nfc.clf.RemoteTarget('106A'))
+        assert excinfo.value.errno == errno.ENODEV
+        with pytest.raises(IOError) as excinfo:
+            clf.select(nfc.clf.RemoteTarget('106A'))
+        assert excinfo.value.errno == errno.ENODEV
+
     #
     # LISTEN
     #
@@ -537,6 +672,98 @@ class TestContactlessFrontend(object):
         assert device.close.call_count == 1
 
 
+class TestFrontendPool(object):
+    @pytest.fixture()  # noqa: F811
+    def device_search(self, mocker):
+        device_search = mocker.patch('nfc.clf.device.search')
+        device_search.return_value = ['usb:001:001', 'usb:001:002']
+        return device_search
+
+    @pytest.fixture()  # noqa: F811
+    def device_connect(self, mocker):
+        def connect(path):
+            device = mocker.Mock(spec=nfc.clf.device.Device)
+            device.path = path
+            device.vendor_name = "Vendor"
+            device.product_name = "Product"
+            device.connected = False
+            return device
+        return mocker.patch('nfc.clf.device.connect', side_effect=connect)
+
+    @pytest.fixture()  # noqa: F811
+    def clf_connect(self, mocker):
+        # The first connect activates a tag, the second connect fails
+        # as if the device was removed.
+        def connect(self, **options):
+            if self.device.connected:
+                return False
+            self.device.connected = True
+            tag = "tag at " + self.device.path
+            if options['rdwr']['on-connect'](tag):
+                return options['rdwr'].get('on-release', bool)(tag)
+            return tag
+        return mocker.patch.object(nfc.clf.ContactlessFrontend, 'connect',
+                                   autospec=True, side_effect=connect)
+
+    def test_events(self, mocker, device_search, device_connect,
+                    clf_connect):
+        pool = nfc.clf.FrontendPool('usb', rescan_interval=10)
+        with pool:
+            pool.start(rdwr={'targets': ['106A']})
+            events = sorted([pool.events.get(timeout=1) for _ in range(2)])
+        assert events == [
+            ('usb:001:001', "tag at usb:001:001"),
+            ('usb:001:002', "tag at usb:001:002"),
+        ]
+        assert pool.paths == []
+        device_search.assert_called_once_with('usb')
+        assert sorted(device_connect.call_args_list) == [
+            mocker.call('usb:001:001'), mocker.call('usb:001:002'),
+        ]
+        assert clf_connect.call_count == 4
+
+    def test_on_connect(self, mocker, device_search, device_connect,
+                        clf_connect):
+        on_connect = mocker.Mock(return_value=False)
+        pool = nfc.clf.FrontendPool('usb', on_connect, rescan_interval=10)
+        with pool:
+            pool.start(rdwr={})
+            for _ in range(100):
+                if on_connect.call_count == 2:
+                    break
+                time.sleep(0.01)
+        assert pool.events.empty()
+        assert sorted(on_connect.call_args_list) == [
+            mocker.call('usb:001:001', "tag at usb:001:001"),
+            mocker.call('usb:001:002', "tag at usb:001:002"),
+        ]
+
+    def test_device_not_found(self, device_search, device_connect,
+                              clf_connect):
+        connect = device_connect.side_effect
+        device_connect.side_effect = [None, connect('usb:001:001')]
+        device_search.return_value = ['usb:001:001']
+        pool = nfc.clf.FrontendPool('usb', rescan_interval=0.01)
+        with pool:
+            pool.start(rdwr={})
+            assert pool.events.get(timeout=1) == \
+                ('usb:001:001', "tag at usb:001:001")
+        assert device_search.call_count >= 2
+
+    def test_search_error(self, device_search):
+        device_search.side_effect = IOError(errno.EACCES, "denied")
+        pool = nfc.clf.FrontendPool('tty:USB0')
+        pool.scan()
+        assert pool.paths == []
+
+    def test_start_twice(self, device_search, device_connect, clf_connect):
+        with nfc.clf.FrontendPool('usb', rescan_interval=10) as pool:
+            pool.start(rdwr={})
+            with pytest.raises(RuntimeError) as excinfo:
+                pool.start(rdwr={})
+            assert str(excinfo.value) == "the frontend pool is already started"
+
+
 class TestRemoteTarget(object):
     @pytest.mark.parametrize("brty, send, recv, kwargs", [
         ('106A', '106A', '106A', {}),
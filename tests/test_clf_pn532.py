@@ -602,6 +602,55 @@ class TestDevice(base_clf_pn53x.TestDevice):
         ]]
         return target
 
+    def test_sense_tta_all_two_targets(self, device):
+        device.chipset.transport.read.side_effect = [
+            ACK(), RSP('4B 02 0144000004 01020304'
+                       '   02440000070416c6c2d73881'),    # InListPassiveTarget
+            ACK(), self.reg_rsp('FF'),                    # ReadRegister
+            ACK(), RSP('09 00'),                          # WriteRegister
+        ]
+        targets = device.sense_tta_all(nfc.clf.RemoteTarget('106A'))
+        assert len(targets) == 2
+        assert targets[0].sdd_res == HEX('01020304')
+        assert targets[1].sdd_res == HEX('0416C6C2D73881')
+        assert targets[0]._tg == 1 and targets[1]._tg == 2
+        assert device.chipset.transport.write.mock_calls == [call(_) for _ in [
+            CMD('4A 0200'),                               # InListPassiveTarget
+            CMD('06 6303'),                               # ReadRegister
+            CMD('08 63037f'),                             # WriteRegister
+        ]]
+        return targets
+
+    def test_sense_tta_all_no_target(self, device):
+        device.chipset.transport.read.side_effect = [
+            ACK(), RSP('4B 00'),                          # InListPassiveTarget
+            ACK(), self.reg_rsp('26'),                    # ReadRegister
+        ]
+        assert device.sense_tta_all(nfc.clf.RemoteTarget('106A')) == []
+
+    def test_select_target(self, device):
+        targets = self.test_sense_tta_all_two_targets(device)
+        device.chipset.transport.write.reset_mock()
+        device.chipset.transport.read.side_effect = [
+            ACK(), RSP('55 00'),                          # InSelect
+            ACK(), self.reg_rsp('7F'),                    # ReadRegister
+            ACK(), RSP('09 00'),                          # WriteRegister
+        ]
+        device.select_target(targets[0])
+        assert device.chipset.transport.write.mock_calls == [call(_) for _ in [
+            CMD('54 01'),                                 # InSelect
+            CMD('06 6303'),                               # ReadRegister
+            CMD('08 63037f'),                             # WriteRegister
+        ]]
+
+    def test_select_target_error(self, device):
+        targets = self.test_sense_tta_all_two_targets(device)
+        device.chipset.transport.read.side_effect = [
+            ACK(), RSP('55 01'),                          # InSelect
+        ]
+        with pytest.raises(nfc.clf.TimeoutError):
+            device.select_target(targets[1])
+
     def test_sense_ttb_target_found(self, device):
         base = super(TestDevice, self)
         base.test_sense_ttb_target_found(device, '42 CA 01')
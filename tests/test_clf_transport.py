@@ -207,47 +207,91 @@ class TestTTY(object):
         tty.baudrate = 9600
         assert tty.baudrate == 0
 
-    def test_read(self, serial, tty):
-        serial.return_value.read.side_effect = [
-            HEX('0000ff00ff00'),
-        ]
+    @pytest.fixture()  # noqa: F811
+    def fd_read(self, mocker, serial):
+        # Serve tty reads from a list of data chunks. Each chunk is
+        # returned by one os.read after select reported readability,
+        # an empty chunk makes select time out.
+        serial.return_value.fileno.return_value = 3
+        chunks = []
+
+        def select(rlist, wlist, xlist, timeout):
+            if chunks and chunks[0] == b'':
+                chunks.pop(0)
+                return [], [], []
+            return (rlist, [], []) if chunks else ([], [], [])
+
+        mocker.patch('nfc.clf.transport.select.select', side_effect=select)
+        os_read = mocker.patch('nfc.clf.transport.os.read')
+        os_read.side_effect = lambda fd, size: chunks.pop(0)
+        return chunks
+
+    def test_read(self, serial, fd_read):
+        tty = nfc.clf.transport.TTY('/dev/ttyUSB0')
+        fd_read.extend([HEX('0000ff00ff00')])
         assert tty.read(0) == b'\x00\x00\xff\x00\xff\x00'
-        assert serial.return_value.read.mock_calls == [call(6)]
-        assert tty.tty.timeout == 0.05
 
-        serial.return_value.read.reset_mock()
-        serial.return_value.read.side_effect = [
-            HEX('0000ff03fbd5'), HEX('01020000'),
-        ]
-        assert tty.read(51) == b'\x00\x00\xff\x03\xfb\xd5\x01\x02\x00\x00'
-        assert serial.return_value.read.mock_calls == [call(6), call(4)]
-        assert tty.tty.timeout == 0.051
+        fd_read.extend([HEX('0000ff03fb'), HEX('d5'), HEX('01020000')])
+        frame = tty.read(51)
+        assert frame == b'\x00\x00\xff\x03\xfb\xd5\x01\x02\x00\x00'
+        assert type(frame) is bytearray
+
+        fd_read.extend([HEX('0000ffffff0101fed5') + bytearray(256) +
+                        HEX('2b00')])
+        assert len(tty.read(100)) == 267
+
+        tty.tty = None
+        assert tty.read(1000) is None
+
+    def test_read_buffered(self, serial, fd_read):
+        tty = nfc.clf.transport.TTY('/dev/ttyUSB0')
+        fd_read.extend([HEX('0000ff00ff00 0000ff03fbd5010200')])
+        assert tty.read(0.5) == HEX('0000ff00ff00')
+        assert not fd_read
+        fd_read.extend([HEX('00')])
+        assert tty.read(0.5) == HEX('0000ff03fbd50102 0000')
+        assert nfc.clf.transport.os.read.call_count == 2
+
+    def test_read_timeout(self, serial, fd_read):
+        tty = nfc.clf.transport.TTY('/dev/ttyUSB0')
+        fd_read.extend([b''])
+        with pytest.raises(IOError) as excinfo:
+            tty.read(0.5)
+        assert excinfo.value.errno == errno.ETIMEDOUT
+
+        fd_read.extend([HEX('0000ff03fbd5'), b''])
+        assert tty.read(1100) == HEX('0000ff03fbd5')
 
-        serial.return_value.read.reset_mock()
+    def test_read_error(self, serial, fd_read):
+        tty = nfc.clf.transport.TTY('/dev/ttyUSB0')
+        fd_read.extend([b'\x00', b''])
+        nfc.clf.transport.select.select.side_effect = None
+        nfc.clf.transport.select.select.return_value = [3], [], []
+        nfc.clf.transport.os.read.side_effect = [b'\x00', b'']
+        with pytest.raises(IOError) as excinfo:
+            tty.read(100)
+        assert excinfo.value.errno == errno.EIO
+
+    def test_read_without_fileno(self, serial):
+        serial.return_value.fileno.side_effect = AttributeError
+        serial.return_value.in_waiting = 0
+        tty = nfc.clf.transport.TTY('/dev/ttyUSB0')
         serial.return_value.read.side_effect = [
-            HEX('0000ffffff01'), HEX('01fed5'), bytearray(256) + HEX('2b00'),
-        ]
-        tty.read(100)
-        assert serial.return_value.read.mock_calls == [
-            call(6), call(3), call(258),
+            HEX('0000ff03fbd5'), HEX('01020000'), HEX(''),
         ]
-        assert tty.tty.timeout == 0.1
-
-        serial.return_value.read.reset_mock()
-        serial.return_value.read.side_effect = [HEX('')]
+        assert tty.read(51) == HEX('0000ff03fbd5 01020000')
+        assert serial.return_value.read.mock_calls == [call(1), call(1)]
         with pytest.raises(IOError) as excinfo:
             tty.read(1100)
         assert excinfo.value.errno == errno.ETIMEDOUT
-        assert serial.return_value.read.mock_calls == [call(6)]
-        assert tty.tty.timeout == 1.1
-
-        tty.tty = None
-        assert tty.read(1000) is None
+        assert tty.tty.timeout <= 1.1
 
     def test_write(self, serial, tty):
         tty.write(b'12')
-        serial.return_value.flushInput.assert_called_with()
+        serial.return_value.flushInput.assert_called_once_with()
         serial.return_value.write.assert_called_with(b'12')
+        tty.write(b'12')
+        serial.return_value.flushInput.assert_called_once_with()
 
         serial.return_value.write.side_effect = [
             nfc.clf.transport.serial.SerialTimeoutException,
@@ -259,6 +303,15 @@ class TestTTY(object):
         tty.tty = None
         assert tty.write(b'12') is None
 
+    def test_write_after_timeout(self, serial, fd_read):
+        tty = nfc.clf.transport.TTY('/dev/ttyUSB0')
+        tty.write(b'12')
+        fd_read.extend([b''])
+        with pytest.raises(IOError):
+            tty.read(100)
+        tty.write(b'12')
+        assert serial.return_value.flushInput.call_count == 2
+
     def test_close(self, serial, tty):
         tty.close()
         serial.return_value.flushOutput.assert_called_with()
@@ -406,6 +459,9 @@ class TestUSB(object):
 
     @pytest.fixture()  # noqa: F811
     def usb(self, usb_context):
+        return self.open_usb(usb_context)
+
+    def open_usb(self, usb_context):
         usb_context.return_value.getDeviceList.return_value = [
             self.Device(0x1000, 0x2000, 1, 2, [
                 self.Settings([
@@ -459,10 +515,96 @@ class TestUSB(object):
         usb.usb_inp = None
         assert usb.read() is None
 
+    def test_read_returns_bytearray(self, usb):
+        usb.usb_dev.bulkRead.side_effect = [bytearray(b'12'), b'34']
+        frame = usb.read()
+        assert frame == b'12' and type(frame) is bytearray
+        frame = usb.read()
+        assert frame == b'34' and type(frame) is bytearray
+
+    @pytest.fixture()  # noqa: F811
+    def usb_async(self, usb_context, mocker):
+        mocker.patch.object(nfc.clf.transport.USB, 'async_transfers', True)
+        return self.open_usb(usb_context)
+
+    def complete(self, usb, *frames, **kwargs):
+        # Return a function that completes the posted read transfer
+        # with the given frames when libusb events are handled.
+        status = kwargs.get('status', nfc.clf.transport.libusb.
+                            TRANSFER_COMPLETED)
+        transfer = usb.usb_dev.getTransfer.return_value
+        callback = transfer.setBulk.call_args[0][2]
+
+        def handle_events(*args):
+            for frame in frames:
+                transfer.getStatus.return_value = status
+                transfer.getBuffer.return_value = bytearray(frame)
+                transfer.getActualLength.return_value = len(frame)
+                callback(transfer)
+        return handle_events
+
+    def test_read_async(self, usb_async):
+        usb = usb_async
+        transfer = usb.usb_dev.getTransfer.return_value
+        transfer.setBulk.assert_called_once_with(
+            0x84, bytearray(300), usb._read_transfer_callback)
+        assert transfer.submit.call_count == 1
+        handle_events = usb.context.handleEventsTimeout
+        handle_events.side_effect = self.complete(usb, b'12', b'34')
+        assert usb.read(100) == b'12'
+        assert transfer.submit.call_count == 3
+        handle_events.side_effect = None
+        assert usb.handle_events() == 1
+        assert usb.read(100) == b'34'
+        assert handle_events.call_count == 2
+        usb.context.handleEvents.side_effect = self.complete(usb, b'56')
+        assert usb.read() == b'56'
+
+    def test_read_async_timeout(self, usb_async):
+        with pytest.raises(IOError) as excinfo:
+            usb_async.read(10)
+        assert excinfo.value.errno == errno.ETIMEDOUT
+
+    @pytest.mark.parametrize("status, error", [
+        (nfc.clf.transport.libusb.TRANSFER_NO_DEVICE, errno.ENODEV),
+        (nfc.clf.transport.libusb.TRANSFER_ERROR, errno.EIO),
+    ])
+    def test_read_async_error(self, usb_async, status, error):
+        usb = usb_async
+        handle_events = usb.context.handleEventsTimeout
+        handle_events.side_effect = self.complete(usb, b'', status=status)
+        with pytest.raises(IOError) as excinfo:
+            usb.read(100)
+        assert excinfo.value.errno == error
+
+    def test_close_async(self, usb_async):
+        usb = usb_async
+        transfer = usb.usb_dev.getTransfer.return_value
+        transfer.isSubmitted.side_effect = [True, True, False]
+        usb_dev = usb.usb_dev
+        usb.close()
+        transfer.cancel.assert_called_once_with()
+        transfer.close.assert_called_once_with()
+        usb_dev.close.assert_called_once_with()
+        assert usb._read_transfer is None
+
+    def test_close_async_transfer_not_cancelled(self, usb_async):
+        usb = usb_async
+        transfer = usb.usb_dev.getTransfer.return_value
+        transfer.isSubmitted.return_value = True
+        usb.close()
+        assert usb.context.handleEventsTimeout.call_count == 10
+        transfer.close.assert_called_once_with()
+        assert usb._read_transfer is None
+
     def test_write(self, usb):
         usb.write(b'12')
         usb.usb_dev.bulkWrite.assert_called_with(0x04, b'12', 0)
 
+        frame = bytearray(b'12')
+        usb.write(frame)
+        assert usb.usb_dev.bulkWrite.call_args[0][1] is frame
+
         usb.write(b'12', 100)
         usb.usb_dev.bulkWrite.assert_called_with(0x04, b'12', 100)
 
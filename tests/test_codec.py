@@ -0,0 +1,85 @@
+# -*- coding: latin-1 -*-
+from __future__ import absolute_import, division
+
+import nfc.codec
+
+import ndef
+import threading
+import pytest
+
+import logging
+logging.basicConfig(level=logging.DEBUG)
+logging_level = logging.getLogger().getEffectiveLevel()
+logging.getLogger("nfc.codec").setLevel(logging_level)
+
+
+def HEX(s):
+    return bytearray.fromhex(s)
+
+
+@pytest.fixture()
+def codec():
+    codec = nfc.codec.NdefCodecPool(max_workers=1, max_pending=2)
+    yield codec
+    codec.shutdown()
+
+
+class TestNdefCodecPool(object):
+    def test_decode(self, codec):
+        future = codec.decode(HEX('D101085402656E 48656C6C6F'))
+        assert future.result(1) == [ndef.TextRecord('Hello')]
+
+    def test_decode_with_strict_errors(self, codec):
+        octets = HEX('D1010954026465 48656C6C6F')
+        future = codec.decode(octets, errors='strict')
+        with pytest.raises(ndef.DecodeError):
+            future.result(1)
+
+    def test_decode_copies_octets(self, codec):
+        octets = HEX('D101085402656E 48656C6C6F')
+        future = codec.decode(octets)
+        octets[:] = HEX('D00000')
+        assert future.result(1) == [ndef.TextRecord('Hello')]
+
+    def test_encode(self, codec):
+        future = codec.encode([ndef.TextRecord('Hello')])
+        assert future.result(1) == bytes(HEX('D101085402656E 48656C6C6F'))
+
+    def test_callback_is_called_with_future(self, codec):
+        done = threading.Event()
+        result = []
+
+        def callback(future):
+            result.append(future.result())
+            done.set()
+
+        codec.decode(HEX('D00000'), callback=callback)
+        assert done.wait(1)
+        assert result == [[ndef.Record()]]
+
+    def test_pending_limit(self, codec):
+        release = threading.Event()
+        codec._decode = lambda octets, errors: release.wait(1)
+        futures = [codec.decode(b''), codec.decode(b'')]
+        assert codec.decode(b'', timeout=0) is None
+        assert codec.encode([], timeout=0.01) is None
+        release.set()
+        assert all(future.result(1) for future in futures)
+        assert codec.encode([]).result(1) == b''
+
+    def test_pending_limit_waits_without_timeout(self, codec):
+        release = threading.Event()
+        codec._decode = lambda octets, errors: release.wait(1)
+        futures = [codec.decode(b''), codec.decode(b'')]
+        threading.Timer(0.05, release.set).start()
+        future = codec.encode([])
+        assert release.is_set()
+        assert future.result(1) == b''
+        assert all(future.result(1) for future in futures)
+
+    def test_shutdown_with_context_manager(self):
+        with nfc.codec.NdefCodecPool() as codec:
+            future = codec.encode([])
+        assert future.done()
+        with pytest.raises(RuntimeError):
+            codec.encode([])
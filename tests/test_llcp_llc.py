@@ -844,6 +844,68 @@ class TestLogicalLinkController:
             ]
 
 
+# =============================================================================
+# Collect
+# =============================================================================
+class TestCollect:
+    @pytest.fixture
+    def llc(self):
+        # The link parameters that activation would set from the
+        # remote parameters, without an NFC-DEP activation.
+        llc = nfc.llcp.llc.LogicalLinkController()
+        llc.cfg['send-miu'] = 248
+        llc.cfg['recv-lto'] = 500
+        return llc
+
+    @pytest.fixture
+    def raw(self, llc):
+        return llc.socket(nfc.llcp.llc.RAW_ACCESS_POINT)
+
+    @pytest.fixture
+    def ldl(self, llc):
+        return llc.socket(nfc.llcp.LOGICAL_DATA_LINK)
+
+    def test_collect_returns_queued_pdu_without_delay(self, llc, ldl):
+        llc.sendto(ldl, b'123', 16, nfc.llcp.MSG_DONTWAIT)
+        started = time.time()
+        pdu = llc.collect(delay=1.0)
+        assert time.time() - started < 0.1
+        assert pdu == nfc.llcp.pdu.UnnumberedInformation(16, 32, b'123')
+
+    def test_collect_wakes_up_on_socket_send(self, llc, ldl):
+        args = (ldl, b'123', 16, nfc.llcp.MSG_DONTWAIT)
+        threading.Timer(0.01, llc.sendto, args).start()
+        started = time.time()
+        pdu = llc.collect(delay=0.2)
+        assert time.time() - started < 0.1
+        assert pdu == nfc.llcp.pdu.UnnumberedInformation(16, 32, b'123')
+
+    def test_collect_delay_is_limited_by_link_timeout(self, llc):
+        llc.cfg['send-lto'] = 20
+        started = time.time()
+        assert llc.collect(delay=1.0) is None
+        assert time.time() - started < 0.1
+
+    def test_collect_round_robin(self, llc):
+        ldl = [llc.socket(nfc.llcp.LOGICAL_DATA_LINK) for i in range(2)]
+        for i in range(2):
+            for sock in ldl:
+                llc.sendto(sock, 200 * b'1', 16, nfc.llcp.MSG_DONTWAIT)
+        for ssap in (32, 33, 32, 33):
+            assert llc.collect() == \
+                nfc.llcp.pdu.UnnumberedInformation(16, ssap, 200 * b'1')
+        assert llc.collect() is None
+        assert len(llc.ready) == 0
+
+    def test_collect_raw_socket_first(self, llc, ldl, raw):
+        llc.sendto(ldl, b'1', 16, nfc.llcp.MSG_DONTWAIT)
+        pdu = nfc.llcp.pdu.UnnumberedInformation(16, 33, b'2')
+        llc.sendto(raw, pdu, 16, nfc.llcp.MSG_DONTWAIT)
+        assert llc.collect() == nfc.llcp.pdu.AggregatedFrame(0, 0, [
+            pdu, nfc.llcp.pdu.UnnumberedInformation(16, 32, b'1'),
+        ])
+
+
 # =============================================================================
 # Service Access Point
 # =============================================================================
@@ -73,6 +73,17 @@ class TestParameter:
         with pytest.raises(nfc.llcp.pdu.DecodeError):
             nfc.llcp.pdu.Parameter.decode(octets, 0)
 
+    @pytest.mark.parametrize("octets, T, L, V", [
+        ("0202FC5A", 2, 2, 0x045A),        # MIUX
+        ("0802A541", 8, 2, (0xA5, b'A')),  # SDREQ
+        ("0A02A55A", 10, 2, b'\xA5\x5A'),  # ECPK
+    ])
+    def test_decode_from_buffer(self, octets, T, L, V):
+        octets = HEX('FF' + octets)
+        assert nfc.llcp.pdu.Parameter.decode(octets, 1) == (T, L, V)
+        octets = memoryview(octets)
+        assert nfc.llcp.pdu.Parameter.decode(octets, 1) == (T, L, V)
+
     @pytest.mark.parametrize("T, V", [
         (0, 0), (255, 0), (1, b'ab'),
         (6, 256 * b'a'),       # SN
@@ -375,6 +386,16 @@ class TestAggregatedFrame:
         pdu = self.pdu_class(*args)
         assert nfc.llcp.pdu.encode(pdu) == HEX(octets)
 
+    def test_encode_into(self):
+        pdu = self.pdu_class(0, 0, [
+            nfc.llcp.pdu.UnnumberedInformation(32, 1, b'ABC'),
+            nfc.llcp.pdu.Information(32, 1, 1, 2, b'DE'),
+            nfc.llcp.pdu.ReceiveReady(32, 1, 3)])
+        buffer = bytearray(len(pdu))
+        assert nfc.llcp.pdu.encode_into(pdu, buffer) == len(pdu)
+        assert buffer == HEX(
+            "0080 0005 80C1414243 0005 8301124445 0003 834103")
+
     @pytest.mark.parametrize("octets", [
         "008000",
         "108000",
@@ -420,11 +441,25 @@ class TestUnnumberedInformation:
     @pytest.mark.parametrize("args, octets", [
         ((0, 0), "00C0"),
         ((0, 0, b'ABC'), "00C0414243"),
+        ((0, 0, memoryview(b'ABC')), "00C0414243"),
     ])
     def test_encode_pass(self, args, octets):
         pdu = self.pdu_class(*args)
         assert nfc.llcp.pdu.encode(pdu) == HEX(octets)
 
+    def test_decode_references_frame(self):
+        frame = HEX("80C1414243")
+        pdu = nfc.llcp.pdu.decode(frame)
+        assert isinstance(pdu.data, memoryview)
+        frame[2:5] = b'XYZ'
+        assert pdu.data == b'XYZ'
+
+    def test_encode_into(self):
+        pdu = self.pdu_class(0, 0, b'ABC')
+        buffer = bytearray(7)
+        assert nfc.llcp.pdu.encode_into(pdu, buffer, 2) == 5
+        assert buffer == HEX("0000 00C0414243")
+
 
 # ----------------------------------------------------------------------------
 # CONNECT PDU
@@ -778,6 +813,19 @@ class TestInformation:
         pdu = self.pdu_class(*args)
         assert nfc.llcp.pdu.encode(pdu) == HEX(octets)
 
+    def test_decode_references_frame(self):
+        frame = HEX("830100414243")
+        pdu = nfc.llcp.pdu.decode(frame)
+        assert isinstance(pdu.data, memoryview)
+        frame[3:6] = b'XYZ'
+        assert pdu.data == b'XYZ'
+
+    def test_encode_into(self):
+        pdu = self.pdu_class(0, 0, 1, 2, memoryview(b'xABCx')[1:4])
+        buffer = bytearray(8)
+        assert nfc.llcp.pdu.encode_into(pdu, buffer, 1) == 6
+        assert buffer == HEX("00 030012414243 00")
+
     @pytest.mark.parametrize("octets", [
         "8301",
     ])
@@ -936,3 +984,21 @@ class TestUnknownProtocolDataUnit:
     def test_encode_fail(self, args):
         with pytest.raises(nfc.llcp.pdu.EncodeError):
             self.pdu_class(*args).encode()
+
+
+# =============================================================================
+# Decode and Encode Round Trip
+# =============================================================================
+class TestDecodeEncode:
+    @pytest.mark.parametrize("octets", [
+        "0000",                                      # SYMM
+        "0080 0003 8341 01 0004 8301 1041",          # AGF
+        "80C1" + 128 * "41",                         # UI
+        "8301 10" + 128 * "41",                      # I
+        "8341 01",                                   # RR
+    ])
+    def test_decode_encode(self, octets):
+        octets = bytes(HEX(octets))
+        decode, encode = nfc.llcp.pdu.decode, nfc.llcp.pdu.encode
+        assert encode(decode(octets)) == octets
+        assert type(encode(decode(octets))) is bytes
@@ -174,6 +174,13 @@ class TestRawAccessPoint:
             tco.recv()
         assert excinfo.value.errno == errno.ESHUTDOWN
 
+    def test_recv_copies_data_from_frame(self, tco):
+        frame = HEX('04C1') + b'123'
+        assert tco.enqueue(nfc.llcp.pdu.decode(frame)) is True
+        rcvd_pdu = tco.recv()
+        frame[2:5] = b'456'
+        assert isinstance(rcvd_pdu.data, bytes) and rcvd_pdu.data == b'123'
+
 
 # =============================================================================
 # Logical Data Link
@@ -309,6 +316,12 @@ class TestDataLinkConnection:
             tco.setsockopt(nfc.llcp.SO_SNDBUF, 2)
         assert str(excinfo.value) == "SO_SNDBUF can not be set"
 
+    @pytest.mark.parametrize("value, result", [(0, 0), (4, 4), (20, 15)])
+    def test_sockopt_rcvack(self, tco, value, result):
+        assert tco.getsockopt(nfc.llcp.SO_RCVACK) == 1
+        assert tco.setsockopt(nfc.llcp.SO_RCVACK, value) is None
+        assert tco.getsockopt(nfc.llcp.SO_RCVACK) == result
+
     def test_listen(self, tco):
         tco.listen(backlog=1)
         assert tco.state.LISTEN is True
@@ -345,6 +358,15 @@ class TestDataLinkConnection:
             tco.accept()
         assert excinfo.value.errno == errno.ESHUTDOWN
 
+    def test_accept_inherits_ack_frequency(self, tco):
+        tco.setsockopt(nfc.llcp.SO_RCVACK, 0)
+        tco.listen(backlog=1)
+        tco.enqueue(nfc.llcp.pdu.Connect(tco.addr, 17, 500, 15))
+        dlc = tco.accept()
+        assert dlc.getsockopt(nfc.llcp.SO_RCVACK) == 0
+        assert tco.dequeue(128, 4) == \
+            nfc.llcp.pdu.ConnectionComplete(17, tco.addr, 128, 1)
+
     @pytest.mark.parametrize("dest, dsap", [(17, 17), (b'name', 1)])
     def test_connect_by_addr_or_name(self, tco, dest, dsap):
         pdu = nfc.llcp.pdu.ConnectionComplete(tco.addr, dsap, 1000, 2)
@@ -460,6 +482,13 @@ class TestDataLinkConnection:
         assert dlc.dequeue(128, 0) == \
             nfc.llcp.pdu.ReceiveReady(dlc.peer, dlc.addr, nr=2)
 
+    def test_recv_copies_data_from_frame(self, dlc):
+        frame = HEX('431100') + b'123'
+        dlc.enqueue(nfc.llcp.pdu.decode(frame))
+        data = dlc.recv()
+        frame[3:6] = b'456'
+        assert isinstance(data, bytes) and data == b'123'
+
     def test_recv_peer_disconnect(self, dlc):
         dlc.enqueue(nfc.llcp.pdu.Information(dlc.addr, dlc.peer, 0, 0, b'123'))
         assert dlc.recv() == b'123'
@@ -693,5 +722,67 @@ class TestDataLinkConnection:
     def test_sendack_none_to_send(self, dlc):
         assert dlc.sendack() is None
 
+    @pytest.fixture
+    def dlc_rw4(self, tco):
+        tco.setsockopt(nfc.llcp.SO_RCVBUF, 4)
+        pdu = nfc.llcp.pdu.ConnectionComplete(tco.addr, 17, 128, 1)
+        threading.Timer(0.01, tco.enqueue, (pdu,)).start()
+        tco.connect(17)
+        assert tco.dequeue(128, 4) == nfc.llcp.pdu.Connect(17, 16, 128, 4)
+        return tco
+
+    @pytest.mark.parametrize("value, threshold", [
+        (0, 2), (1, 1), (3, 3), (8, 4),
+    ])
+    def test_recv_ack_threshold(self, dlc_rw4, value, threshold):
+        dlc_rw4.setsockopt(nfc.llcp.SO_RCVACK, value)
+        assert dlc_rw4.recv_ack_threshold == threshold
+
+    def test_sendack_delayed_until_threshold(self, dlc_rw4):
+        dlc = dlc_rw4
+        dlc.setsockopt(nfc.llcp.SO_RCVACK, 2)
+        dlc.recv_interval = 0.05
+        dlc.enqueue(nfc.llcp.pdu.Information(dlc.addr, dlc.peer, 0, 0, b'1'))
+        assert dlc.recv() == b'1'
+        assert dlc.sendack() is None
+        assert dlc.pending() is True
+        dlc.enqueue(nfc.llcp.pdu.Information(dlc.addr, dlc.peer, 1, 0, b'2'))
+        assert dlc.recv() == b'2'
+        assert dlc.sendack() == \
+            nfc.llcp.pdu.ReceiveReady(dlc.peer, dlc.addr, nr=2)
+
+    def test_sendack_delayed_until_timeout(self, dlc_rw4):
+        dlc = dlc_rw4
+        dlc.setsockopt(nfc.llcp.SO_RCVACK, 4)
+        dlc.recv_interval = 0.005
+        dlc.enqueue(nfc.llcp.pdu.Information(dlc.addr, dlc.peer, 0, 0, b'1'))
+        assert dlc.recv() == b'1'
+        assert dlc.sendack() is None
+        time.sleep(0.02)
+        assert dlc.sendack() == \
+            nfc.llcp.pdu.ReceiveReady(dlc.peer, dlc.addr, nr=1)
+
+    def test_sendack_delay_is_bounded(self, dlc_rw4):
+        dlc_rw4.setsockopt(nfc.llcp.SO_RCVACK, 0)
+        assert dlc_rw4.recv_ack_delay == 0.0
+        dlc_rw4._update_recv_interval(1.00)
+        dlc_rw4._update_recv_interval(1.08)
+        assert dlc_rw4.recv_interval == pytest.approx(0.08)
+        assert dlc_rw4.recv_ack_delay == dlc_rw4.ACK_DELAY_MAX
+        dlc_rw4._update_recv_interval(2.08)
+        assert dlc_rw4.recv_interval == pytest.approx(0.08)
+        dlc_rw4._update_recv_interval(2.10)
+        assert dlc_rw4.recv_interval == pytest.approx(0.0725)
+
+    def test_counters(self, dlc):
+        dlc.send(b'123', nfc.llcp.MSG_DONTWAIT)
+        assert dlc.dequeue(128, 0).name == "I"
+        dlc.enqueue(nfc.llcp.pdu.Information(dlc.addr, dlc.peer, 0, 1, b'45'))
+        counters = dlc.getsockopt(nfc.llcp.SO_COUNTERS)
+        assert (counters.sent_count, counters.sent_bytes) == (1, 3)
+        assert (counters.rcvd_count, counters.rcvd_bytes) == (1, 2)
+        assert counters.sent_rate > 0 and counters.rcvd_rate > 0
+        assert str(counters).startswith("sent 1 I PDU 3 byte ")
+
     def test_sendack_not_established(self, tco):
         assert tco.sendack() is None
@@ -103,6 +103,97 @@ def test_write_ndef(mocker, tag):  # noqa: F811
     assert tag.ndef.octets == HEX('D00000')
 
 
+@pytest.fixture()  # noqa: F811
+def ndef_cache(mocker, tag):
+    ndef_cache = nfc.tag.NdefCache(maxsize=2, ttl=60)
+    mocker.patch.object(nfc.tag.Tag, 'ndef_cache', ndef_cache)
+    mocker.patch("nfc.tag.Tag.NDEF._read_fingerprint").return_value = b'1'
+    tag._product, tag._nfcid = "Tag", HEX('01020304')
+    return ndef_cache
+
+
+@pytest.fixture()  # noqa: F811
+def read_ndef_data(mocker, ndef_cache):
+    # Like the tag type implementations, save the fingerprint while
+    # the NDEF data is read.
+    def fingerprint(ndef):
+        ndef._fingerprint = ndef._read_fingerprint()
+        return mocker.DEFAULT
+    return mocker.patch("nfc.tag.Tag.NDEF._read_ndef_data",
+                        autospec=True, side_effect=fingerprint)
+
+
+def test_ndef_cache_hit(mocker, tag, ndef_cache,  # noqa: F811
+                        read_ndef_data):
+    read_ndef_data.return_value = HEX('D00000')
+    assert tag.ndef.octets == HEX('D00000')
+    assert len(ndef_cache) == 1
+
+    tag._ndef = None
+    read_ndef_data.return_value = HEX('D50000')
+    assert tag.ndef.octets == HEX('D00000')
+    assert read_ndef_data.call_count == 1
+
+    tag._ndef = None
+    nfc.tag.Tag.NDEF._read_fingerprint.return_value = b'2'
+    assert tag.ndef.octets == HEX('D50000')
+    assert read_ndef_data.call_count == 2
+    assert len(ndef_cache) == 1
+
+
+def test_ndef_cache_expiry(mocker, tag, ndef_cache,  # noqa: F811
+                           read_ndef_data):
+    read_ndef_data.return_value = HEX('D00000')
+    time = mocker.patch("nfc.tag.time.time")
+    time.return_value = 1000.0
+    assert tag.ndef.octets == HEX('D00000')
+
+    tag._ndef = None
+    time.return_value = 1059.0
+    assert tag.ndef is not None
+    assert read_ndef_data.call_count == 1
+
+    tag._ndef = None
+    time.return_value = 1061.0
+    assert tag.ndef is not None
+    assert read_ndef_data.call_count == 2
+
+
+def test_ndef_cache_eviction(mocker, tag, ndef_cache,  # noqa: F811
+                             read_ndef_data):
+    read_ndef_data.return_value = HEX('D00000')
+    for nfcid in ('01', '02', '01', '03'):
+        tag._nfcid, tag._ndef = HEX(nfcid), None
+        assert tag.ndef is not None
+    assert read_ndef_data.call_count == 3
+
+    tag._nfcid, tag._ndef = HEX('01'), None
+    assert tag.ndef is not None
+    assert read_ndef_data.call_count == 3
+
+    tag._nfcid, tag._ndef = HEX('02'), None
+    assert tag.ndef is not None
+    assert read_ndef_data.call_count == 4
+
+
+def test_ndef_cache_discard_on_write(mocker, tag, ndef_cache,  # noqa: F811
+                                     read_ndef_data):
+    read_ndef_data.return_value = HEX('')
+    mocker.patch("nfc.tag.Tag.NDEF._write_ndef_data")
+    tag.ndef._writeable, tag.ndef._capacity = True, 3
+    assert len(ndef_cache) == 1
+    tag.ndef.octets = HEX('D00000')
+    assert len(ndef_cache) == 0
+
+
+def test_ndef_cache_without_fingerprint(mocker, tag, ndef_cache,  # noqa: F811
+                                        read_ndef_data):
+    nfc.tag.Tag.NDEF._read_fingerprint.return_value = None
+    read_ndef_data.return_value = HEX('')
+    assert tag.ndef is not None
+    assert len(ndef_cache) == 0
+
+
 def test_tag_dump(tag):
     assert tag.dump() == []
 
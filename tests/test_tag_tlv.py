@@ -0,0 +1,131 @@
+# -*- coding: latin-1 -*-
+from __future__ import absolute_import, division
+
+import copy
+
+import nfc.tag.tlv
+from nfc.tag.tlv import SkipRegions
+
+import pytest
+
+
+def HEX(s):
+    return bytearray.fromhex(s)
+
+
+class TestSkipRegions:
+    def test_init_and_iter(self):
+        skip = SkipRegions((20, 24), (4, 8))
+        assert list(skip) == [(4, 8), (20, 24)]
+        assert len(skip) == 8
+        assert repr(skip) == "SkipRegions((4, 8), (20, 24))"
+
+    @pytest.mark.parametrize("start, stop, regions", [
+        (0, 0, [(4, 8), (20, 24)]),
+        (0, 2, [(0, 2), (4, 8), (20, 24)]),
+        (0, 4, [(0, 8), (20, 24)]),
+        (6, 10, [(4, 10), (20, 24)]),
+        (8, 20, [(4, 24)]),
+        (2, 30, [(2, 30)]),
+        (24, 26, [(4, 8), (20, 26)]),
+        (30, 32, [(4, 8), (20, 24), (30, 32)]),
+    ])
+    def test_add_merges_ranges(self, start, stop, regions):
+        skip = SkipRegions((4, 8), (20, 24))
+        skip.add(start, stop)
+        assert list(skip) == regions
+
+    def test_contains(self):
+        skip = SkipRegions((4, 8))
+        assert [i for i in range(12) if i in skip] == [4, 5, 6, 7]
+
+    def test_copy_and_compare(self):
+        skip = SkipRegions((4, 8))
+        other = copy.copy(skip)
+        assert other == skip
+        other.add(10, 12)
+        assert other != skip
+
+    @pytest.mark.parametrize("index, result", [
+        (0, 0), (3, 3), (4, 12), (7, 12), (8, 12), (12, 12),
+    ])
+    def test_next_free(self, index, result):
+        assert SkipRegions((4, 8), (8, 12)).next_free(index) == result
+
+    @pytest.mark.parametrize("start, stop, result", [
+        (0, 4, 0), (0, 5, 1), (5, 22, 5), (6, 7, 1), (0, 100, 8),
+    ])
+    def test_count(self, start, stop, result):
+        assert SkipRegions((4, 8), (20, 24)).count(start, stop) == result
+
+    @pytest.mark.parametrize("index, length, spans", [
+        (0, 0, []),
+        (0, 4, [(0, 4)]),
+        (0, 5, [(0, 4), (8, 9)]),
+        (5, 2, [(8, 10)]),
+        (2, 20, [(2, 4), (8, 20), (24, 30)]),
+    ])
+    def test_spans(self, index, length, spans):
+        skip = SkipRegions((4, 8), (20, 24))
+        assert list(skip.spans(index, length)) == spans
+        stop = spans[-1][1] if spans else index
+        assert skip.advance(index, length) == stop
+
+
+class TestTlvScanner:
+    def test_read_tlv_header(self):
+        memory = HEX("00 FE 03 10 03 FF 01 00")
+        assert nfc.tag.tlv.read_tlv_header(memory, 0) == (0x00, -1, 1)
+        assert nfc.tag.tlv.read_tlv_header(memory, 1) == (0xFE, -1, 2)
+        assert nfc.tag.tlv.read_tlv_header(memory, 2) == (0x03, 16, 4)
+        assert nfc.tag.tlv.read_tlv_header(memory, 4) == (0x03, 256, 8)
+
+    def test_read_tlv_value_jumps_over_skip_bytes(self):
+        memory = bytearray(range(16))
+        skip = SkipRegions((4, 8))
+        value = nfc.tag.tlv.read_tlv_value(memory, 2, 6, skip)
+        assert value == HEX("02 03 08 09 0A 0B")
+
+    def test_find_ndef_tlv_after_control_tlvs(self):
+        memory = HEX("0103502002 02030F0200 00 FD02AAAA 0000 0305")
+        memory += bytearray(32)
+        skip = SkipRegions()
+        result = nfc.tag.tlv.find_ndef_tlv(memory, 0, len(memory), skip)
+        assert result == (17, 0x03, 5, 19)
+        assert list(skip) == [(15, 17), (20, 24)]
+
+    def test_find_ndef_tlv_stops_at_terminator(self):
+        memory = HEX("00 00 FE 03 00")
+        skip = SkipRegions()
+        result = nfc.tag.tlv.find_ndef_tlv(memory, 0, len(memory), skip)
+        assert result == (2, 0xFE, -1, 3)
+
+    def test_find_ndef_tlv_stops_at_end_of_area(self):
+        memory = HEX("00 00 00 00")
+        skip = SkipRegions()
+        result = nfc.tag.tlv.find_ndef_tlv(memory, 0, len(memory), skip)
+        assert result == (4, None, None, None)
+
+    def test_find_ndef_tlv_does_not_read_other_values(self):
+        class Memory(bytearray):
+            def __getitem__(self, key):
+                if isinstance(key, slice):
+                    assert key.start < 4
+                else:
+                    assert key < 4 or key >= 260
+                return bytearray.__getitem__(self, key)
+        memory = Memory(HEX("FD FF 0100") + bytearray(256) + HEX("FE"))
+        skip = SkipRegions()
+        result = nfc.tag.tlv.find_ndef_tlv(memory, 0, len(memory), skip)
+        assert result == (260, 0xFE, -1, 261)
+
+    @pytest.mark.parametrize("offset, stop, skip, capacity", [
+        (16, 64, [], 46),
+        (16, 64, [(40, 44)], 42),
+        (16, 400, [], 380),
+        (16, 400, [(100, 200)], 280),
+        (80, 64, [], -2),
+    ])
+    def test_get_capacity(self, offset, stop, skip, capacity):
+        skip = SkipRegions(*skip)
+        assert nfc.tag.tlv.get_capacity(offset, stop, skip) == capacity
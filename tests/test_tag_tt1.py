@@ -82,6 +82,41 @@ class TestStaticMemoryTagNdef:
         assert tag.ndef.length == 42
         assert tag.ndef.octets == ndef_octets
 
+    def test_read_with_ndef_cache_hit(self, mocker,  # noqa: F811
+                                      tag, mmap, ndef_octets):
+        mocker.patch.object(nfc.tag.Tag, 'ndef_cache', nfc.tag.NdefCache())
+        tag.clf.exchange.side_effect = 2 * [
+            tag.target.rid_res[:2] + mmap[:120],
+        ]
+        assert tag.ndef.octets == ndef_octets
+        assert tag.clf.exchange.call_count == 1
+
+        tag._ndef = None
+        assert tag.ndef.octets == ndef_octets
+        assert tag.ndef.capacity == 90
+        assert tag.ndef.is_writeable is True
+        assert tag.clf.exchange.mock_calls == 2 * [
+            mock.call(HEX("00 00 00 01020304"), 0.1),  # RALL
+        ]
+
+    def test_read_with_ndef_cache_miss(self, mocker,  # noqa: F811
+                                       tag, mmap, ndef_octets):
+        mocker.patch.object(nfc.tag.Tag, 'ndef_cache', nfc.tag.NdefCache())
+        changed_mmap = mmap[:19] + b'A' + mmap[20:120]
+        tag.clf.exchange.side_effect = [
+            tag.target.rid_res[:2] + mmap[:120],
+            tag.target.rid_res[:2] + changed_mmap,
+            tag.target.rid_res[:2] + changed_mmap,
+        ]
+        assert tag.ndef.octets == ndef_octets
+        assert tag.clf.exchange.call_count == 1
+
+        tag._ndef = None
+        assert tag.ndef.octets == ndef_octets[:5] + b'A' + ndef_octets[6:]
+        assert tag.clf.exchange.mock_calls == 3 * [
+            mock.call(HEX("00 00 00 01020304"), 0.1),  # RALL
+        ]
+
     def test_read_proprietary_memory(self, tag, mmap):
         tag.clf.exchange.side_effect = [HEX("0000") + mmap]
         assert tag.ndef is None
@@ -167,7 +202,7 @@ class TestStaticMemoryTagNdef:
             mock.call(HEX('53 0f 00 01020304'), 0.1),
             mock.call(HEX('53 10 00 01020304'), 0.1),
             mock.call(HEX('53 11 fe 01020304'), 0.1),
-            mock.call(HEX('53 0d 03 01020304'), 0.1),
+            mock.call(HEX('1a 0d 03 01020304'), 0.1),
         ]
         assert tag.ndef.octets == HEX("D00000")
 
@@ -190,7 +225,7 @@ class TestStaticMemoryTagNdef:
             mock.call(HEX('53 0d 00 01020304'), 0.1),
             mock.call(HEX('53 10 06 01020304'), 0.1),
             mock.call(HEX('53 17 63 01020304'), 0.1),
-            mock.call(HEX('53 0d 0a 01020304'), 0.1),
+            mock.call(HEX('1a 0d 0a 01020304'), 0.1),
         ]
 
 
@@ -282,14 +317,14 @@ class TestDynamicMemoryTagNdef:
     def test_write_to_dynamic_memory(self, tag, mmap, ndef_octets):
         tag.clf.exchange.side_effect = [
             tag.target.rid_res[:2] + mmap[:23] + bytearray(489),
-            HEX("54 0000c101000001c6"),  # WRITE-E8
+            HEX("1B 0000c101000001c6"),  # WRITE-NE8
         ] + [
-            HEX("54") + mmap[i*8:i*8+8] for i in range(4, 13)
+            HEX("1B") + mmap[i*8:i*8+8] for i in range(4, 13)
         ] + [
-            HEX("54") + mmap[i*8:i*8+8] for i in range(16, 64)
+            HEX("1B") + mmap[i*8:i*8+8] for i in range(16, 64)
         ] + [
-            HEX("54 330203f0020303ff"),  # WRITE-E8
-            HEX("54 01cdc101000001c6"),  # WRITE-E8
+            HEX("1B 330203f0020303ff"),  # WRITE-NE8
+            HEX("1B 01cdc101000001c6"),  # WRITE-NE8
         ]
         assert tag.ndef is not None
         assert tag.ndef.is_readable is True
@@ -300,16 +335,16 @@ class TestDynamicMemoryTagNdef:
         tag.ndef.octets = ndef_octets
         assert tag.clf.exchange.mock_calls == [
             mock.call(HEX('00 00 00 01020304'), 0.1),
-            mock.call(HEX('54 03 0000c101000001c6 01020304'), 0.1),
+            mock.call(HEX('1B 03 0000c101000001c6 01020304'), 0.1),
         ] + [
-            mock.call(bytearray([84, i]) + mmap[i*8:i*8+8] + b'\1\2\3\4', 0.1)
+            mock.call(bytearray([27, i]) + mmap[i*8:i*8+8] + b'\1\2\3\4', 0.1)
             for i in range(4, 13)
         ] + [
-            mock.call(bytearray([84, i]) + mmap[i*8:i*8+8] + b'\1\2\3\4', 0.1)
+            mock.call(bytearray([27, i]) + mmap[i*8:i*8+8] + b'\1\2\3\4', 0.1)
             for i in range(16, 64)
         ] + [
-            mock.call(HEX('54 02 330203f0020303ff 01020304'), 0.1),
-            mock.call(HEX('54 03 01cdc101000001c6 01020304'), 0.1),
+            mock.call(HEX('1B 02 330203f0020303ff 01020304'), 0.1),
+            mock.call(HEX('1B 03 01cdc101000001c6 01020304'), 0.1),
         ]
 
     def test_write_terminator_after_skip(self, tag):
@@ -328,7 +363,7 @@ class TestDynamicMemoryTagNdef:
             HEX("54 0000000000000000"),  # WRITE-E8(11)
             HEX("54 0000000000000000"),  # WRITE-E8(12)
             HEX("54 fe7475767778797a"),  # WRITE-E8(16)
-            HEX("54 330203f002030350"),  # WRITE-E8(2)
+            HEX("1B 330203f002030350"),  # WRITE-NE8(2)
         ]
         tag.ndef.octets = HEX('D5 00 4D') + bytearray(5+9*8)
         assert tag.clf.exchange.mock_calls == [
@@ -344,7 +379,7 @@ class TestDynamicMemoryTagNdef:
             mock.call(HEX('54 0b 0000000000000000 01020304'), 0.1),
             mock.call(HEX('54 0c 0000000000000000 01020304'), 0.1),
             mock.call(HEX('54 10 fe7475767778797a 01020304'), 0.1),
-            mock.call(HEX('54 02 330203f002030350 01020304'), 0.1),
+            mock.call(HEX('1B 02 330203f002030350 01020304'), 0.1),
         ]
 
 
@@ -744,7 +779,7 @@ class TestMemoryReader:
     def test_synchronize_with_small_tag(self, tag):
         tag.clf.exchange.side_effect = [
             b"\x11\x00" + self.mmap[:120],  # RALL
-            b"\x00" + b'\xA5',              # WRITE-E
+            b"\x00" + b'\xA5',              # WRITE-NE
             b"\x0F" + b'\x5A',              # WRITE-E
         ]
         tag_memory = nfc.tag.tt1.Type1TagMemoryReader(tag)
@@ -754,7 +789,7 @@ class TestMemoryReader:
         assert tag.clf.exchange.mock_calls[0] == \
             mock.call(HEX('00 00 00 01020304'), 0.1)
         assert tag.clf.exchange.mock_calls[1] == \
-            mock.call(HEX('53 00 A5 01020304'), 0.1)
+            mock.call(HEX('1A 00 A5 01020304'), 0.1)
         assert tag.clf.exchange.mock_calls[2] == \
             mock.call(HEX('53 0F 5A 01020304'), 0.1)
 
@@ -763,8 +798,8 @@ class TestMemoryReader:
             b"\x12\x00" + self.mmap[:120],           # RALL
             b"\x0F" + self.mmap[120:128],            # READ8(15)
             b"\x10" + self.mmap[128:256],            # RSEG(1)
-            b"\x54" + b'\xFF' + self.mmap[1:8],      # WRITE-E8
-            b"\x54" + b'\xFF' + self.mmap[129:136],  # WRITE-E8
+            b"\x1B" + b'\xFF' + self.mmap[1:8],      # WRITE-NE8
+            b"\x1B" + b'\xFF' + self.mmap[129:136],  # WRITE-NE8
         ]
         tag_memory = nfc.tag.tt1.Type1TagMemoryReader(tag)
         assert tag_memory[0:256] == self.mmap  # force read all memory
@@ -775,10 +810,31 @@ class TestMemoryReader:
             mock.call(HEX('00 00 00 01020304'), 0.1),
             mock.call(HEX('02 0f 00000000 00000000 01020304'), 0.1),
             mock.call(HEX('10 10 00000000 00000000 01020304'), 0.1),
-            mock.call(HEX('54 00 FF020304 05060700 01020304'), 0.1),
-            mock.call(HEX('54 10 FF000000 00000000 01020304'), 0.1),
+            mock.call(HEX('1B 00 FF020304 05060700 01020304'), 0.1),
+            mock.call(HEX('1B 10 FF000000 00000000 01020304'), 0.1),
         ])
 
+    def test_synchronize_erases_only_if_bits_cleared(self, tag):
+        tag.clf.exchange.side_effect = [
+            b"\x12\x00" + self.mmap[:120],           # RALL
+            b"\x54" + HEX("0102030405000700"),       # WRITE-E8
+            b"\x1B" + HEX("E1111F0003FAD101"),       # WRITE-NE8
+        ]
+        tag_memory = nfc.tag.tt1.Type1TagMemoryReader(tag)
+        tag_memory[0:8] = self.mmap[0:8]
+        tag_memory[16] = self.mmap[16]
+        tag_memory.synchronize()
+        assert tag.clf.exchange.call_count == 1
+        tag_memory[5] = 0x00
+        tag_memory[9] = 0x11
+        tag_memory[13] = 0xFA
+        tag_memory.synchronize()
+        assert tag.clf.exchange.mock_calls == [
+            mock.call(HEX('00 00 00 01020304'), 0.1),
+            mock.call(HEX('54 00 01020304 05000700 01020304'), 0.1),
+            mock.call(HEX('1B 01 E1111F00 03FAD101 01020304'), 0.1),
+        ]
+
     def test_byte_delete_raises_error(self, tag):
         tag.clf.exchange.return_value = b"\x11\x00" + self.mmap[:120]  # RALL
         tag_memory = nfc.tag.tt1.Type1TagMemoryReader(tag)
@@ -86,13 +86,13 @@ class TestTopaz:
     def test_format_with_version_one_dot_two(self, tag):
         tag.clf.exchange.side_effect = [
             tag.target.rid_res[:2] + self.mmap[:120],  # RALL
-            HEX("09 12"),  # WRITE-E
+            HEX("09 12"),  # WRITE-NE
             HEX("0d 00"),  # WRITE-E
         ]
         assert tag.format(version=0x12) is True
         assert tag.clf.exchange.mock_calls == [
             mock.call(HEX("00 00 00 01020304"), 0.1),
-            mock.call(HEX("53 09 12 01020304"), 0.1),
+            mock.call(HEX("1a 09 12 01020304"), 0.1),
             mock.call(HEX("53 0d 00 01020304"), 0.1),
         ]
 
@@ -237,7 +237,7 @@ class TestTopaz512:
     def test_format_with_version_one_dot_two(self, tag):
         tag.clf.exchange.side_effect = [
             tag.target.rid_res[:2] + self.mmap[:120],
-            HEX("54 e1123f000103f230"),
+            HEX("1b e1123f000103f230"),
             HEX("54 330203f002030300"),
             nfc.clf.TimeoutError, nfc.clf.TimeoutError, nfc.clf.TimeoutError
         ]
@@ -245,7 +245,7 @@ class TestTopaz512:
         print(tag.clf.exchange.mock_calls)
         assert tag.clf.exchange.mock_calls == [
             mock.call(HEX("00 00 00 01020304"), 0.1),
-            mock.call(HEX("54 01 e1123f000103f230 01020304"), 0.1),
+            mock.call(HEX("1b 01 e1123f000103f230 01020304"), 0.1),
             mock.call(HEX("54 02 330203f002030300 01020304"), 0.1),
         ]
 
@@ -643,6 +643,46 @@ class TestNdef:
         assert tag.ndef.is_writeable is False
         assert tag.clf.exchange.mock_calls == [mock.call(*_) for _ in commands]
 
+    def test_read_with_ndef_cache_hit(self, mocker, tag):  # noqa: F811
+        mocker.patch.object(nfc.tag.Tag, 'ndef_cache', nfc.tag.NdefCache())
+        commands = 2 * [
+            (HEX('30 00'), 0.005),
+            (HEX('30 04'), 0.005),
+        ]
+        responses = 2 * [
+            HEX("01020304 05060708 00000000 E1100100"),
+            HEX("0304d500 0141fe00 00000000 00000000"),
+        ]
+        tag.clf.exchange.side_effect = responses
+        assert tag.ndef.octets == HEX('d5000141')
+        assert tag.clf.exchange.call_count == 2
+
+        tag._ndef = None
+        assert tag.ndef.octets == HEX('d5000141')
+        assert tag.ndef.is_writeable is True
+        assert tag.clf.exchange.mock_calls == [mock.call(*_) for _ in commands]
+
+    def test_read_with_ndef_cache_miss(self, mocker, tag):  # noqa: F811
+        mocker.patch.object(nfc.tag.Tag, 'ndef_cache', nfc.tag.NdefCache())
+        commands = 3 * [
+            (HEX('30 00'), 0.005),
+            (HEX('30 04'), 0.005),
+        ]
+        responses = [
+            HEX("01020304 05060708 00000000 E1100100"),
+            HEX("0304d500 0141fe00 00000000 00000000"),
+        ] + 2 * [
+            HEX("01020304 05060708 00000000 E1100100"),
+            HEX("0305d500 024142fe 00000000 00000000"),
+        ]
+        tag.clf.exchange.side_effect = responses
+        assert tag.ndef.octets == HEX('d5000141')
+        assert tag.clf.exchange.call_count == 2
+
+        tag._ndef = None
+        assert tag.ndef.octets == HEX('d500024142')
+        assert tag.clf.exchange.mock_calls == [mock.call(*_) for _ in commands]
+
     def test_write_with_all_tlv_types(self, tag):
         commands = [
             (HEX('30 00'), 0.005),
@@ -797,6 +837,33 @@ class TestMemoryReader:
             "Type2TagMemoryReader requires item assignment of identical length"
         assert tag.clf.exchange.mock_calls == [mock.call(*_) for _ in commands]
 
+    def test_synchronize_dirty_pages(self, mocker, tag):  # noqa: F811
+        mocker.patch.object(tag, 'read', autospec=True)
+        mocker.patch.object(tag, 'write', autospec=True)
+        mocker.patch.object(tag, 'sector_select', autospec=True)
+        tag.read.return_value = bytearray(16)
+        tag_memory = nfc.tag.tt2.Type2TagMemoryReader(tag)
+        tag_memory[0x404:0x406] = HEX('0102')
+        tag_memory[0x010] = 0x03
+        tag_memory[0x014] = 0x00
+        tag_memory[-1] = 0xfe
+        tag_memory[0x400] = 0x04
+        tag._current_sector = 1
+        tag.sector_select.reset_mock()
+        tag_memory.synchronize()
+        assert tag.write.mock_calls == [
+            mock.call(0x100, HEX('04000000')),
+            mock.call(0x101, HEX('01020000')),
+            mock.call(0x103, HEX('000000fe')),
+            mock.call(0x004, HEX('03000000')),
+        ]
+        assert tag.sector_select.mock_calls == [
+            mock.call(1), mock.call(1), mock.call(1), mock.call(0),
+        ]
+        tag.write.reset_mock()
+        tag_memory.synchronize()
+        assert tag.write.mock_calls == []
+
     def test_delitem(self, tag):
         tag_memory = nfc.tag.tt2.Type2TagMemoryReader(tag)
         with pytest.raises(TypeError) as excinfo:
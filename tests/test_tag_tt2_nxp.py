@@ -476,6 +476,27 @@ class TestUltralightEV1:
             ]
         }.get(product[-2:])
 
+    @pytest.mark.parametrize("version_response, end_page", [  # noqa: F811
+        ('0004030101000B03', 0x13),
+        ("0004030101000E03", 0x27),
+    ])
+    def test_read_ndef_with_fast_read(self, mocker, clf, target,
+                                      version_response, end_page):
+        mocker.patch.object(nfc.ContactlessFrontend, 'max_recv_data_size',
+                            new_callable=mock.PropertyMock, return_value=254)
+        size = (end_page + 1) * 4
+        clf.exchange.side_effect = [
+            HEX('00'), HEX(version_response),
+            HEX("04517CA1 E1ED2580 A9480000 E1100600 0300FE00")
+            + bytearray(size - 20),
+        ]
+        tag = nfc.tag.activate(clf, target)
+        assert tag.ndef is not None
+        assert tag.ndef.octets == b""
+        assert clf.exchange.mock_calls[2:] == [
+            mock.call(HEX('3a 00 %02x' % end_page), 0.005 + size * 0.0001),
+        ]
+
 
 ###############################################################################
 #
@@ -876,6 +897,43 @@ class BaseNTAG21x:
         assert tag.ndef is None
         assert tag.clf.exchange.mock_calls == [mock.call(*_) for _ in commands]
 
+    def test_read_ndef_with_fast_read(self, mocker, tag):  # noqa: F811
+        mocker.patch.object(nfc.ContactlessFrontend, 'max_recv_data_size',
+                            new_callable=mock.PropertyMock, return_value=64)
+        commands = [
+            (HEX('3a 00 0f'), 0.005 + 64 * 0.0001),
+        ]
+        responses = [
+            HEX("04517CA1 E1ED2580 A9480000 E1100600 0303D000 00FE0000")
+            + bytearray(40),
+        ]
+        tag.clf.exchange.side_effect = responses
+        assert tag.ndef is not None
+        assert tag.ndef.octets == HEX("D00000")
+        assert tag.clf.exchange.mock_calls == [mock.call(*_) for _ in commands]
+
+    @pytest.mark.parametrize("fast_read_response", [  # noqa: F811
+        nfc.clf.TimeoutError, HEX('00'), HEX('0300FE00'),
+    ])
+    def test_read_ndef_fast_read_fallback(self, mocker, tag,
+                                          fast_read_response):
+        mocker.patch.object(nfc.ContactlessFrontend, 'max_recv_data_size',
+                            new_callable=mock.PropertyMock, return_value=64)
+        commands = [
+            (HEX('3a 00 0f'), 0.005 + 64 * 0.0001),
+            (HEX('30 00'), 0.005),
+            (HEX('30 04'), 0.005),
+        ]
+        responses = [
+            fast_read_response,
+            HEX("04517CA1 E1ED2580 A9480000 E1100600"),
+            HEX("0300FE00 00000000 00000000 00000000"),
+        ]
+        tag.clf.exchange.side_effect = responses
+        assert tag.ndef is not None
+        assert tag.ndef.octets == b""
+        assert tag.clf.exchange.mock_calls == [mock.call(*_) for _ in commands]
+
 
 ###############################################################################
 #
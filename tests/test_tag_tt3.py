@@ -362,6 +362,64 @@ class TestType3Tag:
         assert tag.read_from_ndef_service(0, 1) is None
         assert tag.clf.exchange.called is False
 
+    def test_read_blocks(self, tag):
+        def rsp(n):
+            return HEX('%02x 07 0102030405060708 0000 %02x' % (13+16*n, n)) \
+                + bytearray(range(16*n))
+
+        sc = nfc.tag.tt3.ServiceCode(0, 0x0F)
+        tag.clf.exchange.side_effect = [rsp(15), rsp(5)]
+        data = list(tag.read_blocks(sc, range(20)))
+        assert data == [bytearray(range(240)), bytearray(range(80))]
+        assert tag.clf.exchange.mock_calls == [
+            mock.call(HEX('2C 06 0102030405060708 010f00 0f') + HEX(
+                ''.join(['80%02x' % i for i in range(15)])), 2.4748032),
+            mock.call(HEX('18 06 0102030405060708 010f00 05') + HEX(
+                ''.join(['80%02x' % i for i in range(15, 20)])),
+                0.9280512000000001),
+        ]
+
+        tag.clf.exchange.reset_mock()
+        tag.clf.exchange.side_effect = [rsp(2)]
+        assert list(tag.read_blocks(sc, [255, 256])) == [bytearray(range(32))]
+        tag.clf.exchange.assert_called_once_with(
+            HEX('13 06 0102030405060708 010f00 02 80ff 000001'),
+            0.46402560000000004)
+
+    def test_read_blocks_with_too_many_blocks_error(self, tag):
+        sc = nfc.tag.tt3.ServiceCode(0, 11)
+        tag.clf.exchange.side_effect = [
+            HEX('0c 07 0102030405060708 FFA2'),
+            HEX('4d 07 0102030405060708 0000 04') + bytearray(64),
+            HEX('4d 07 0102030405060708 0000 04') + bytearray(64),
+        ]
+        assert list(tag.read_blocks(sc, range(8))) == [
+            bytearray(64), bytearray(64)]
+        assert [c[1][0][13] for c in tag.clf.exchange.mock_calls] == [8, 4, 4]
+
+        tag.clf.exchange.reset_mock()
+        tag.clf.exchange.side_effect = [HEX('0c 07 0102030405060708 01A2')]
+        with pytest.raises(nfc.tag.tt3.Type3TagCommandError) as excinfo:
+            list(tag.read_blocks(sc, range(1)))
+        assert excinfo.value.errno == 0x01A2
+
+        tag.clf.exchange.reset_mock()
+        tag.clf.exchange.side_effect = [HEX('0d 07 0102030405060708 0000 01')]
+        with pytest.raises(nfc.tag.tt3.Type3TagCommandError) as excinfo:
+            list(tag.read_blocks(sc, range(1)))
+        assert excinfo.value.errno == nfc.tag.tt3.DATA_SIZE_ERROR
+
+    def test_read_blocks_limited_by_frame_size(self, tag, mocker):  # noqa
+        mocker.patch('nfc.ContactlessFrontend.max_recv_data_size',
+                     new_callable=mock.PropertyMock, return_value=64)
+        sc = nfc.tag.tt3.ServiceCode(0, 11)
+        tag.clf.exchange.side_effect = 21 * [
+            HEX('3d 07 0102030405060708 0000 03') + bytearray(48)] + [
+            HEX('1d 07 0102030405060708 0000 01') + bytearray(16)]
+        data = bytearray().join(tag.read_blocks(sc, range(64)))
+        assert data == bytearray(1024)
+        assert tag.clf.exchange.call_count == 22
+
     def test_write_without_encryption(self, tag):
         data = HEX(
             "10 01 01 00  01 00 00 00  00 00 00 00  00 10 00 23"
@@ -721,6 +779,36 @@ class TestType3Tag:
         tag.clf.exchange.assert_called_with(HEX(
             '10 06 0102030405060708 010b00 018000'), 0.3093504)
 
+    def test_ndef_read_with_cache(self, mocker, tag):  # noqa: F811
+        mocker.patch.object(nfc.tag.Tag, 'ndef_cache', nfc.tag.NdefCache())
+        data = HEX(
+            "10 02 02 00  03 00 00 00  00 00 01 00  00 27 00 3f"
+            "d1 02 22 53  70 91 01 0e  55 03 6e 66  63 2d 66 6f"
+            "72 75 6d 2e  6f 72 67 51  01 0c 54 02  65 6e 4e 46"
+            "43 20 46 6f  72 75 6d 00  00 00 00 00  00 00 00 00"
+        )
+        tag.clf.exchange.side_effect = [
+            HEX('1d 07 0102030405060708 0000 01') + data[:16],
+            HEX('2d 07 0102030405060708 0000 02') + data[16:48],
+            HEX('1d 07 0102030405060708 0000 01') + data[48:64],
+            HEX('1d 07 0102030405060708 0000 01') + data[:16],
+            HEX('1d 07 0102030405060708 0000 01') + data[:15] + b'\0',
+            HEX('1d 07 0102030405060708 0000 01') + data[:15] + b'\0',
+        ]
+        assert tag.ndef.octets == data[16:55]
+        assert tag.clf.exchange.call_count == 3
+
+        tag._ndef = None
+        assert tag.ndef.octets == data[16:55]
+        assert tag.ndef.capacity == 48
+        assert tag.ndef.is_writeable is True
+        assert tag.clf.exchange.call_count == 4
+
+        tag._ndef = None
+        assert tag.ndef is None
+        assert tag.clf.exchange.call_count == 6
+        assert len(nfc.tag.Tag.ndef_cache) == 0
+
     def test_ndef_write(self, tag):
         tag.clf.exchange.side_effect = [
             HEX('1d 07 0102030405060708 0000 01') +
@@ -100,6 +100,46 @@ def test_init_T4B(mocker, sensb_res, max_send, max_recv, result):
     assert str(tag) == result
 
 
+@pytest.mark.parametrize("rats_response, result", [  # noqa: F811
+    ('067577810280', False),
+    ('0A757781028073000040', True),
+    ('0A757781028073000000', False),
+    ('0D7577810200730000408000900000', True),
+    ('05770280', False),
+])
+def test_init_T4A_extended_length_support(mocker, rats_response, result):
+    clf = nfc.ContactlessFrontend()
+    mocker.patch.object(clf, 'exchange', autospec=True)
+    mocker.patch('nfc.ContactlessFrontend.max_send_data_size',
+                 new_callable=mock.PropertyMock).return_value = 256
+    mocker.patch('nfc.ContactlessFrontend.max_recv_data_size',
+                 new_callable=mock.PropertyMock).return_value = 256
+
+    target = nfc.clf.RemoteTarget("106A")
+    target.sens_res = HEX("4403")
+    target.sel_res = HEX("20")
+    target.sdd_res = HEX("04832F9A272D80")
+
+    clf.exchange.return_value = HEX(rats_response)
+    tag = nfc.tag.activate(clf, target)
+    assert tag._extended_length_support is result
+
+
+@pytest.mark.parametrize("historical_bytes, result", [
+    ('', False),
+    ('80', False),
+    ('8073000040', True),
+    ('80730000BF', False),
+    ('80310073000040', True),
+    ('00730000409000', True),
+    ('00730000', False),
+    ('1073000040', False),
+])
+def test_extended_length_support(historical_bytes, result):
+    hb = HEX(historical_bytes)
+    assert nfc.tag.tt4.extended_length_support(hb) is result
+
+
 def test_init_wrong_technology():
     clf = nfc.ContactlessFrontend()
     target = nfc.clf.RemoteTarget('212F')
@@ -484,6 +524,144 @@ class TestType4Tag:
         assert tag.ndef is None
         assert tag.clf.exchange.mock_calls == [mock.call(*_) for _ in commands]
 
+    def test_read_ndef_data_capped_to_short_apdu(self, tag):
+        commands = [
+            (HEX('02 00a4040007d2760000850101'), 0.08095339233038348),
+            (HEX('03 00a4000c02e103'), 0.08095339233038348),
+            (HEX('02 00b0000002'), 0.08095339233038348),
+            (HEX('03 00b000020d'), 0.08095339233038348),
+            (HEX('02 00a4000c02e104'), 0.08095339233038348),
+            (HEX('03 00b0000002'), 0.08095339233038348),
+            (HEX('02 00b0000200'), 0.08095339233038348),
+            (HEX('03 00b0010200'), 0.08095339233038348),
+        ]
+        responses = [
+            HEX('02 9000'),
+            HEX('03 9000'),
+            HEX('02 000f 9000'),
+            HEX('03 20 0400 0400 04 06 e104 0400 00 00 9000'),
+            HEX('02 9000'),
+            HEX('03 0200 9000'),
+            HEX('02') + bytearray(256) + HEX('9000'),
+            HEX('03') + bytearray(256) + HEX('9000'),
+        ]
+        tag.clf.exchange.side_effect = responses
+        assert tag.ndef.octets == bytearray(512)
+        assert tag.ndef._max_le == 256
+        assert tag.ndef._max_lc == 255
+        assert tag.clf.exchange.mock_calls == [mock.call(*_) for _ in commands]
+
+    def test_read_ndef_data_with_extended_length(self, tag):
+        commands = [
+            (HEX('02 00a40400000007d2760000850101'), 0.08095339233038348),
+            (HEX('03 00a4000c000002e103'), 0.08095339233038348),
+            (HEX('02 00b00000000002'), 0.08095339233038348),
+            (HEX('03 00b0000200000d'), 0.08095339233038348),
+            (HEX('02 00a4000c000002e104'), 0.08095339233038348),
+            (HEX('03 00b00000000002'), 0.08095339233038348),
+            (HEX('02 00b00002000200'), 0.08095339233038348),
+        ]
+        responses = [
+            HEX('02 9000'),
+            HEX('03 9000'),
+            HEX('02 000f 9000'),
+            HEX('03 20 0400 0400 04 06 e104 0400 00 00 9000'),
+            HEX('02 9000'),
+            HEX('03 0200 9000'),
+            HEX('02') + bytearray(512) + HEX('9000'),
+        ]
+        tag._extended_length_support = True
+        tag.clf.exchange.side_effect = responses
+        assert tag.ndef.octets == bytearray(512)
+        assert tag.ndef._max_le == 1024
+        assert tag.ndef._max_lc == 1024
+        assert tag.clf.exchange.mock_calls == [mock.call(*_) for _ in commands]
+
+    def test_read_ndef_data_with_ndef_cache_hit(self, mocker,  # noqa: F811
+                                                tag):
+        mocker.patch.object(nfc.tag.Tag, 'ndef_cache', nfc.tag.NdefCache())
+        commands = [
+            (HEX('02 00a4040007d2760000850101'), 0.08095339233038348),
+            (HEX('03 00a4000c02e103'), 0.08095339233038348),
+            (HEX('02 00b0000002'), 0.08095339233038348),
+            (HEX('03 00b000020d'), 0.08095339233038348),
+            (HEX('02 00a4000c02e104'), 0.08095339233038348),
+            (HEX('03 00b0000002'), 0.08095339233038348),
+            (HEX('02 00b000020d'), 0.08095339233038348),
+            (HEX('03 00a4040007d2760000850101'), 0.08095339233038348),
+            (HEX('02 00a4000c02e104'), 0.08095339233038348),
+            (HEX('03 00b000000f'), 0.08095339233038348),
+        ]
+        responses = [
+            HEX('02 9000'),
+            HEX('03 9000'),
+            HEX('02 000f 9000'),
+            HEX('03 20 003b 0034 04 06 e104 0040 00 00 9000'),
+            HEX('02 9000'),
+            HEX('03 000d 9000'),
+            HEX('02 d1010a55 036e6663 70792e6f 72 9000'),
+            HEX('03 9000'),
+            HEX('02 9000'),
+            HEX('03 000d d1010a55 036e6663 70792e6f 72 9000'),
+        ]
+        tag.clf.exchange.side_effect = responses
+        assert tag.ndef.octets == HEX('d1010a55 036e6663 70792e6f 72')
+        assert tag.clf.exchange.call_count == 7
+
+        tag._ndef = None
+        assert tag.ndef.octets == HEX('d1010a55 036e6663 70792e6f 72')
+        assert tag.ndef.capacity == 62
+        assert tag.clf.exchange.mock_calls == [mock.call(*_) for _ in commands]
+
+    def test_read_ndef_data_with_ndef_cache_miss(self, mocker,  # noqa: F811
+                                                 tag):
+        mocker.patch.object(nfc.tag.Tag, 'ndef_cache', nfc.tag.NdefCache())
+        commands = [
+            (HEX('02 00a4040007d2760000850101'), 0.08095339233038348),
+            (HEX('03 00a4000c02e103'), 0.08095339233038348),
+            (HEX('02 00b0000002'), 0.08095339233038348),
+            (HEX('03 00b000020d'), 0.08095339233038348),
+            (HEX('02 00a4000c02e104'), 0.08095339233038348),
+            (HEX('03 00b0000002'), 0.08095339233038348),
+            (HEX('02 00b000020d'), 0.08095339233038348),
+            (HEX('03 00a4040007d2760000850101'), 0.08095339233038348),
+            (HEX('02 00a4000c02e104'), 0.08095339233038348),
+            (HEX('03 00b000000f'), 0.08095339233038348),
+            (HEX('02 00a4040007d2760000850101'), 0.08095339233038348),
+            (HEX('03 00a4000c02e103'), 0.08095339233038348),
+            (HEX('02 00b0000002'), 0.08095339233038348),
+            (HEX('03 00b000020d'), 0.08095339233038348),
+            (HEX('02 00a4000c02e104'), 0.08095339233038348),
+            (HEX('03 00b0000002'), 0.08095339233038348),
+            (HEX('02 00b000020d'), 0.08095339233038348),
+        ]
+        responses = [
+            HEX('02 9000'),
+            HEX('03 9000'),
+            HEX('02 000f 9000'),
+            HEX('03 20 003b 0034 04 06 e104 0040 00 00 9000'),
+            HEX('02 9000'),
+            HEX('03 000d 9000'),
+            HEX('02 d1010a55 036e6663 70792e6f 72 9000'),
+            HEX('03 9000'),
+            HEX('02 9000'),
+            HEX('03 000d d1010a55 036e6663 70792e6f 67 9000'),
+            HEX('02 9000'),
+            HEX('03 9000'),
+            HEX('02 000f 9000'),
+            HEX('03 20 003b 0034 04 06 e104 0040 00 00 9000'),
+            HEX('02 9000'),
+            HEX('03 000d 9000'),
+            HEX('02 d1010a55 036e6663 70792e6f 67 9000'),
+        ]
+        tag.clf.exchange.side_effect = responses
+        assert tag.ndef.octets == HEX('d1010a55 036e6663 70792e6f 72')
+        assert tag.clf.exchange.call_count == 7
+
+        tag._ndef = None
+        assert tag.ndef.octets == HEX('d1010a55 036e6663 70792e6f 67')
+        assert tag.clf.exchange.mock_calls == [mock.call(*_) for _ in commands]
+
     def test_write_ndef_data_short(self, tag):
         commands = [
             (HEX('02 00a4040007 d2760000850101'), 0.08095339233038348),
@@ -904,3 +1082,62 @@ class TestIsoDepInitiator:
             dep.exchange(HEX('0102'), 1.0)
         assert excinfo.value.errno == nfc.tag.PROTOCOL_ERROR
         assert dep.clf.exchange.mock_calls == [mock.call(*_) for _ in commands]
+
+    def test_recv_more_as_chunks(self, dep):
+        commands = [
+            (HEX('02 0102'), 1.0),
+            (HEX('A3'), 1.0),
+            (HEX('A2'), 1.0),
+        ]
+        responses = [
+            HEX('12 0102'),
+            HEX('13 0304'),
+            HEX('02 0506'),
+        ]
+        dep.clf.exchange.side_effect = responses
+        chunks = dep.exchange_chunks(HEX('0102'), 1.0)
+        assert bytearray(next(chunks)) == HEX('0102')
+        assert dep.clf.exchange.call_count == 1
+        assert bytearray(next(chunks)) == HEX('0304')
+        assert bytearray(next(chunks)) == HEX('0506')
+        with pytest.raises(StopIteration):
+            next(chunks)
+        assert dep.clf.exchange.mock_calls == [mock.call(*_) for _ in commands]
+        assert dep.statistics['ack'] == 2
+
+    def test_recv_long_chained_response(self, dep):
+        responses = [HEX('12') + bytearray(7 * [i]) for i in range(100)]
+        responses = [bytearray([r[0] | i % 2]) + r[1:]
+                     for i, r in enumerate(responses)]
+        responses[-1][0] &= 0xEF
+        dep.clf.exchange.side_effect = responses
+        response = dep.exchange(HEX('0102'), 1.0)
+        assert response == bytearray().join(r[1:] for r in responses)
+        assert dep.statistics == {
+            'wtx': 0, 'nak': 0, 'ack': 99, 'retransmit': 0}
+
+    def test_statistics(self, clf):
+        dep = nfc.tag.tt4.IsoDepInitiator(clf, 8, 1.0, n_retry_nak=2)
+        responses = [
+            HEX('A3'),
+            nfc.clf.TimeoutError,
+            HEX('F2 02'),
+            HEX('12 0102'),
+            HEX('F2 01'),
+            HEX('03 0304'),
+        ]
+        clf.exchange.side_effect = responses
+        assert dep.exchange(HEX('0102'), 1.0) == HEX('01020304')
+        assert dep.statistics == {
+            'wtx': 2, 'nak': 1, 'ack': 1, 'retransmit': 1}
+
+    def test_retry_policy(self, clf):
+        dep = nfc.tag.tt4.IsoDepInitiator(clf, 8, 1.0, 0, 3)
+        assert dep.n_retry_ack == 0 and dep.n_retry_nak == 3
+        clf.exchange.side_effect = 3 * [nfc.clf.TimeoutError] + [
+            HEX('12 0102'), nfc.clf.TimeoutError]
+        with pytest.raises(nfc.tag.tt4.Type4TagCommandError) as excinfo:
+            dep.exchange(HEX('0102'), 1.0)
+        assert excinfo.value.errno == nfc.tag.TIMEOUT_ERROR
+        assert clf.exchange.call_count == 5
+        assert dep.statistics['nak'] == 3